@@ -0,0 +1,240 @@
+"""Benchmarks of the clock's hot paths
+
+Times the expectancy lookup, death date calculation, every countdown format,
+the statistics text building and the full per-second tick of the GUI, plus
+batch throughput, serial and over a BatchPool. The GUI parts run on a DeathClockGUI whose widgets are
+recording stand-ins, so no display is needed; Tkinter must still be
+importable. Batch benchmarks need NumPy and are skipped without it.
+
+    python benchmarks/bench_clock.py -o before.json
+    python benchmarks/bench_clock.py -o after.json --compare before.json
+    python benchmarks/bench_clock.py -k batch --sizes 1000 1000000
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from harness import Runner, add_arguments, measure  # noqa: E402
+
+from deathclock import calculate_death_date, estimate_death_date, metrics  # noqa: E402
+from deathclock.dates import parse_date  # noqa: E402
+from deathclock.expectancy import get_life_expectancy  # noqa: E402
+from deathclock.render import WidgetRenderer  # noqa: E402
+from deathclock.tiers import TieredEvaluator  # noqa: E402
+from deathclock.timefmt import FORMATTERS, get_formatter  # noqa: E402
+
+BIRTH_DATE = datetime(1990, 1, 1)
+COUNTRY = "Japan"
+GENDER = "Female"
+# A fixed "now" so runs compare like for like
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+DEFAULT_SIZES = (1_000, 1_000_000, 10_000_000)
+DEFAULT_CHUNK = 1_000_000
+
+# Widgets the tick path writes to
+GUI_WIDGETS = (
+    "countdown_label", "death_date_label", "status_label", "time_stats_label",
+    "vital_stats_label", "analysis_label", "demographic_label", "milestones_label",
+    "life_quality_label", "perspective_label", "fun_facts_label", "insights_label",
+    "life_progress_label", "life_progress_bar",
+)
+
+
+class _Widget:
+    """Stands in for a Tk widget; keeps the last options it was given"""
+
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+
+class _Ticker:
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def headless_gui(birth_date=BIRTH_DATE, country=COUNTRY, gender=GENDER, now=NOW):
+    """A DeathClockGUI with a calculated death date and stand-in widgets"""
+    from dethclock import DeathClockGUI
+
+    gui = DeathClockGUI.__new__(DeathClockGUI)
+    gui.renderer = WidgetRenderer()
+    gui.ticker = _Ticker()
+    gui.stats = TieredEvaluator()
+    gui.register_statistics()
+    gui.time_formatter = get_formatter("detailed")
+    gui.last_heartbeats = gui.last_breaths = 0
+    gui.heartbeat_animation_offset = gui.breath_animation_offset = 0
+    for name in GUI_WIDGETS:
+        setattr(gui, name, _Widget())
+    gui.panels_built = True
+    gui.birth_date = birth_date
+    gui.country = country
+    gui.gender = gender
+    gui.custom_lifespan = None
+    gui.death_date, gui.lifespan_years = estimate_death_date(birth_date, country, gender, now=now)
+    gui.is_running = True
+    return gui
+
+
+def _stepper(start, step):
+    """Return a function giving start, start + step, start + 2 * step, ..."""
+    state = [start - step]
+
+    def advance():
+        state[0] += step
+        return state[0]
+    return advance
+
+
+def bench_core(runner):
+    runner.run("expectancy.get_life_expectancy", lambda: get_life_expectancy(COUNTRY, GENDER))
+    runner.run("expectancy.get_life_expectancy[unknown]",
+               lambda: get_life_expectancy("Atlantis", GENDER))
+    runner.run("dates.parse_date[dmy]", lambda: parse_date("24/12/1990"))
+    runner.run("core.calculate_death_date", lambda: calculate_death_date(BIRTH_DATE, 84.3))
+    runner.run("core.estimate_death_date",
+               lambda: estimate_death_date(BIRTH_DATE, COUNTRY, GENDER, now=NOW))
+    runner.run("core.estimate_death_date[actuarial]",
+               lambda: estimate_death_date(BIRTH_DATE, COUNTRY, GENDER, actuarial=True, now=NOW))
+    seconds_left = 1_600_000_000
+    runner.run("metrics.evaluate[all]", lambda: metrics.evaluate(seconds_left))
+
+
+def bench_gui(runner):
+    try:
+        gui = headless_gui()
+    except ImportError as e:
+        print(f"Skipping GUI benchmarks: {e}", file=sys.stderr)
+        return
+    time_left = gui.death_date - NOW
+    for name, formatter in FORMATTERS.items():
+        gui.time_formatter = formatter
+        runner.run(f"gui.format_time_display[{name}]",
+                   lambda: gui.format_time_display(time_left, NOW))
+    gui.time_formatter = get_formatter("detailed")
+
+    def cold():
+        gui.stats.invalidate()
+        gui.update_statistics_and_analysis(time_left)
+    runner.run("gui.update_statistics_and_analysis[cold]", cold)
+
+    one_second = timedelta(seconds=1)
+    left = _stepper(time_left, -one_second)
+    runner.run("gui.update_statistics_and_analysis[tick]",
+               lambda: gui.update_statistics_and_analysis(left()))
+
+    timestamp = _stepper(NOW.timestamp(), 1.0)
+    runner.run("gui.tick", lambda: gui.tick(timestamp()))
+
+
+def _inputs(n, seed=0):
+    """n random (birth dates as DD/MM/YYYY, genders, countries) columns"""
+    import numpy as np
+
+    from deathclock.expectancy import get_country_list
+
+    rng = np.random.default_rng(seed)
+    days = rng.integers(np.datetime64("1930-01-01").astype(int),
+                        np.datetime64("2020-12-31").astype(int), n)
+    iso = np.datetime_as_string(days.astype("M8[D]")).astype("U10")
+    chars = iso.view("U1").reshape(n, 10)
+    chars[:, [4, 7]] = "/"
+    dmy = np.ascontiguousarray(chars[:, [8, 9, 7, 5, 6, 4, 0, 1, 2, 3]]).view("U10").reshape(n)
+    genders = np.where(rng.random(n) < 0.5, "Male", "Female")
+    countries = rng.choice(np.array(get_country_list()), n)
+    return dmy, genders, countries
+
+
+def _batch_runner(calculate, chunk, n, chunk_size):
+    """A function running n rows through calculate as chunks of one reused input"""
+    parts = [(chunk_size, n // chunk_size)] if n >= chunk_size else []
+    if n % chunk_size:
+        parts.append((n % chunk_size, 1))
+
+    def run():
+        for rows, times in parts:
+            columns = [column[:rows] for column in chunk]
+            for _ in range(times):
+                calculate(*columns, now=NOW)
+    return run
+
+
+def bench_batch(runner, sizes, chunk_size, repeat=3):
+    names = {n: f"batch.calculate_batch[{n:_}]" for n in sizes}
+    sizes = [n for n in sizes if runner.wanted(names[n])]
+    if not sizes:
+        return
+    try:
+        from deathclock.batch import calculate_batch
+    except ImportError as e:
+        print(f"Skipping batch benchmarks: {e}", file=sys.stderr)
+        return
+    # Large batches run as chunks of one reused input, so memory stays bounded
+    chunk = _inputs(min(max(sizes), chunk_size))
+    for n in sizes:
+        run = _batch_runner(calculate_batch, chunk, n, chunk_size)
+        entry = measure(run, repeat=repeat if n < 10 * chunk_size else 1, number=1)
+        entry["rows"] = n
+        runner.add(names[n], entry)
+
+
+def bench_parallel(runner, sizes, chunk_size, workers, repeat=3):
+    """BatchPool.calculate on the same batches as bench_batch, with its speedup
+
+    Only sizes that give every worker a shard are run; the pool is started
+    once, outside the timings.
+    """
+    try:
+        from deathclock.parallel import BatchPool, default_workers
+    except ImportError as e:
+        print(f"Skipping parallel benchmarks: {e}", file=sys.stderr)
+        return
+    workers = workers or default_workers()
+    names = {n: f"batch.parallel[{n:_}x{workers}]" for n in sizes}
+    with BatchPool(workers) as pool:
+        chunk_size = max(chunk_size, pool.batch_rows)
+        sizes = [n for n in sizes if runner.wanted(names[n]) and n >= pool.batch_rows]
+        if not sizes:
+            return
+        chunk = _inputs(min(max(sizes), chunk_size))
+        for n in sizes:
+            run = _batch_runner(pool.calculate, chunk, n, chunk_size)
+            entry = measure(run, repeat=repeat if n < 10 * chunk_size else 1, number=1)
+            entry["rows"] = n
+            runner.add(names[n], entry)
+            serial = runner.results.get(f"batch.calculate_batch[{n:_}]")
+            if serial is not None:
+                print(f"{'':<40} x{serial['seconds'] / entry['seconds']:.2f} speedup over "
+                      f"calculate_batch", file=runner.out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the death clock's hot paths.")
+    add_arguments(parser)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="batch sizes in rows (default: 1K 1M 10M)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK,
+                        help="rows per calculate_batch call in large batches")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="processes for the parallel batch benchmarks (default: all CPUs)")
+    args = parser.parse_args(argv)
+
+    runner = Runner(args.filter)
+    bench_core(runner)
+    bench_gui(runner)
+    bench_batch(runner, args.sizes, args.chunk_size)
+    bench_parallel(runner, args.sizes, args.chunk_size, args.workers)
+    return runner.finish(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
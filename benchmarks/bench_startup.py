@@ -0,0 +1,170 @@
+"""Startup benchmark: time from launch to the clock's first frame
+
+Every run starts a fresh interpreter (so imports are cold for Python, not
+for the OS file cache) which builds the GUI and reports, on stdout, when
+each startup milestone is reached; the time is taken by this process from
+just before the child was spawned:
+
+    imported     dethclock imported
+    constructed  DeathClockGUI.__init__ returned
+    first_frame  the first Expose event was handled, i.e. the window is drawn
+    panels       the countdown and statistics panels exist
+
+``cold`` runs start without a saved session, ``warm`` ones restore a saved
+profile (see deathclock.session): the first frame shows the filled-in form
+and the countdown resumes with the panels. Needs a display; without one the
+benchmark is skipped.
+
+    python benchmarks/bench_startup.py -o startup.json
+    python benchmarks/bench_startup.py --compare startup.json --target-ms 400
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def child():
+    """Build the GUI, print each milestone as it is reached, then exit"""
+    import tkinter as tk
+
+    def report(milestone):
+        print(milestone, flush=True)
+
+    from dethclock import DeathClockGUI
+    report("imported")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"error {e}", flush=True)
+        return 1
+    app = DeathClockGUI(root)
+    report("constructed")
+
+    def first_frame(event):
+        root.unbind("<Expose>")
+        # The window is drawn in the idle pass after the Expose event
+        root.after_idle(lambda: report("first_frame"))
+        root.after_idle(wait_for_panels)
+
+    def wait_for_panels():
+        if app.panels_built:
+            report("panels")
+            root.after_idle(root.destroy)
+        else:
+            root.after(1, wait_for_panels)
+
+    root.bind("<Expose>", first_frame)
+    root.mainloop()
+    return 0
+
+
+# The child imports nothing else, so its milestones are not delayed by the harness
+if __name__ == "__main__" and sys.argv[1:] == ["--child"]:
+    sys.exit(child())
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import tempfile  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+from harness import REPO_ROOT, Runner, add_arguments  # noqa: E402
+
+MILESTONES = ("imported", "constructed", "first_frame", "panels")
+DEFAULT_REPEAT = 5
+# Launch to first frame, median of the cold runs
+DEFAULT_TARGET_MS = 500
+CHILD_TIMEOUT = 30
+
+
+def launch(env):
+    """Run one child; returns {milestone: seconds since spawn}, or raises RuntimeError"""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, __file__, "--child"], cwd=REPO_ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    times = {}
+    try:
+        for line in process.stdout:
+            if line.startswith("error "):
+                raise RuntimeError(line[len("error "):].strip())
+            times[line.strip()] = time.perf_counter() - started
+        process.wait(CHILD_TIMEOUT)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    missing = [milestone for milestone in MILESTONES if milestone not in times]
+    if missing:
+        raise RuntimeError(f"child exited before {', '.join(missing)}")
+    return times
+
+
+def saved_session(path):
+    """Write a database holding one calculated profile"""
+    from deathclock import DISPLAY_DATETIME_FORMAT, estimate_death_date
+    from deathclock.session import Session, SessionStore
+
+    birth = datetime(1990, 1, 1)
+    death, years = estimate_death_date(birth, "Japan", "Male")
+    store = SessionStore(path)
+    store.save(Session("01/01/1990", "Male", "Japan", "", False, "detailed", birth, death, years,
+                       death.strftime(DISPLAY_DATETIME_FORMAT), "", "✅ Japan | Male"))
+    store.close()
+
+
+def entry(samples):
+    return {"seconds": min(samples), "median": statistics.median(samples), "number": 1,
+            "repeat": len(samples)}
+
+
+def bench_startup(runner, repeat, session_dir):
+    """Returns the cold first-frame entry, or None when there is no display"""
+    warm_db = os.path.join(session_dir, "warm.sqlite3")
+    saved_session(warm_db)
+    cold_entry = None
+    for mode, db in (("cold", ""), ("warm", warm_db)):
+        if not any(runner.wanted(f"startup.{mode}.{milestone}") for milestone in MILESTONES):
+            continue
+        env = dict(os.environ, DEATHCLOCK_SESSION_DB=db)
+        try:
+            runs = [launch(env) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"startup benchmarks skipped: {e}", file=runner.out)
+            return None
+        for milestone in MILESTONES:
+            name = f"startup.{mode}.{milestone}"
+            if runner.wanted(name):
+                runner.add(name, entry([times[milestone] for times in runs]))
+        if mode == "cold":
+            cold_entry = entry([times["first_frame"] for times in runs])
+    return cold_entry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the death clock's startup time.")
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="launches per mode (default: %(default)s)")
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS,
+                        help="fail when the median cold time to first frame is above this "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    runner = Runner(args.filter)
+    with tempfile.TemporaryDirectory() as session_dir:
+        first_frame = bench_startup(runner, args.repeat, session_dir)
+    status = runner.finish(args)
+    if first_frame is not None:
+        median_ms = first_frame["median"] * 1000
+        verdict = "within" if median_ms <= args.target_ms else "over"
+        print(f"\nCold time to first frame: {median_ms:.0f} ms median, {verdict} the "
+              f"{args.target_ms:.0f} ms target", file=runner.out)
+        if median_ms > args.target_ms:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Timing, result files and run-to-run comparison shared by the benchmarks
+
+A result file is JSON:
+
+    {"version": 1,
+     "meta": {"python": ..., "platform": ..., "numpy": ..., "commit": ..., "created": ...},
+     "results": {name: {"seconds": best time per op, "median": ..., "number": ...,
+                        "repeat": ..., "rows": rows per op (throughput benchmarks)}}}
+
+``seconds`` is the fastest repeat, the least noisy figure, and is what
+``compare`` uses.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+RESULT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(func, repeat=5, min_time=0.2, number=None):
+    """Time func() and return a result entry
+
+    Without number, calls per repeat are picked so one repeat takes at least
+    min_time seconds.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        # 1, 2, 5, 10, 20, 50, ... as timeit.Timer.autorange does
+        scale = 1
+        while True:
+            for number in (scale, 2 * scale, 5 * scale):
+                if timer.timeit(number) >= min_time:
+                    break
+            else:
+                scale *= 10
+                continue
+            break
+    per_op = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return {"seconds": min(per_op), "median": statistics.median(per_op),
+            "number": number, "repeat": repeat}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy_version,
+        "commit": _commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def write_results(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": RESULT_VERSION, "meta": metadata(), "results": results}, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RESULT_VERSION:
+        raise ValueError(f"{path}: unsupported result file version {data.get('version')!r}")
+    return data["results"]
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_entry(name, entry):
+    line = f"{name:<40} {format_time(entry['seconds']):>10}"
+    if entry.get("rows"):
+        line += f"  {entry['rows'] / entry['seconds']:>14,.0f} rows/s"
+    return line
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (report lines, names slower than baseline by more than threshold)"""
+    lines = []
+    regressions = []
+    for name, entry in results.items():
+        old = baseline.get(name)
+        if old is None:
+            lines.append(f"{name:<40} {format_time(entry['seconds']):>10}  (new)")
+            continue
+        ratio = entry["seconds"] / old["seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  SLOWER"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        lines.append(f"{name:<40} {format_time(old['seconds']):>10} -> "
+                     f"{format_time(entry['seconds']):>10}  x{ratio:.2f}{flag}")
+    for name in sorted(baseline.keys() - results.keys()):
+        lines.append(f"{name:<40} (not run)")
+    return lines, regressions
+
+
+def add_arguments(parser):
+    """The output and comparison options every benchmark script takes"""
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare with an earlier result file; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown counted as a regression (default: 0.10)")
+    parser.add_argument("-k", "--filter", default="",
+                        help="only run benchmarks whose name contains this text")
+
+
+class Runner:
+    """Runs named benchmarks, printing each result as it completes"""
+
+    def __init__(self, name_filter="", out=None):
+        self.name_filter = name_filter
+        self.out = out or sys.stdout
+        self.results = {}
+
+    def wanted(self, name):
+        return self.name_filter in name
+
+    def add(self, name, entry):
+        self.results[name] = entry
+        print(format_entry(name, entry), file=self.out, flush=True)
+
+    def run(self, name, func, **options):
+        if self.wanted(name):
+            self.add(name, measure(func, **options))
+
+    def finish(self, args):
+        """Write and compare the results as asked by the command line; returns the exit code"""
+        if args.output:
+            write_results(args.output, self.results)
+        if not args.compare:
+            return 0
+        lines, regressions = compare(self.results, load_results(args.compare), args.threshold)
+        print(f"\nCompared with {args.compare}:", file=self.out)
+        for line in lines:
+            print(line, file=self.out)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=self.out)
+            return 1
+        return 0
@@ -0,0 +1,19 @@
+"""Headless death clock calculations
+
+The Tk application in ``dethclock.py`` is a thin front end over this package;
+``python -m deathclock`` is the command-line one (see ``deathclock.cli``).
+Importing the package needs neither Tkinter nor NumPy.
+The vectorized batch engine lives in ``deathclock.batch`` and needs NumPy.
+"""
+from .core import (
+    DATE_FORMAT,
+    DAYS_PER_YEAR,
+    DISPLAY_DATETIME_FORMAT,
+    SECONDS_PER_YEAR,
+    calculate_death_date,
+    estimate_death_date,
+    life_progress,
+    parse_birth_date,
+    resolve_lifespan,
+)
+from .expectancy import DEFAULT_COUNTRY, get_country_list, get_life_expectancy
@@ -0,0 +1,6 @@
+"""Run the command-line death clock: ``python -m deathclock --help``"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
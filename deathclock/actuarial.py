@@ -0,0 +1,197 @@
+"""Age-conditioned (actuarial) remaining life expectancy
+
+The plain death date assumes everyone lives exactly the average lifespan,
+however old they already are. Here the expected remaining life at a given age
+comes from a survival curve l(x): someone who has survived to 60 has already
+avoided every death before 60, so their expected age at death is higher.
+
+Survival curves are built from the loaded external life table when it covers
+the country, otherwise from a Gompertz-Makeham mortality curve calibrated to
+the expectancy table (or to a custom lifespan). Curves are cached per
+(country, sex, lifespan), so repeated queries are a lookup plus interpolation;
+custom lifespans are rounded to LIFESPAN_DECIMALS for the cache key. A custom
+lifespan the curve cannot reach (see lifespan_range) raises ValueError.
+Deaths are assumed uniformly distributed within each year of age.
+"""
+import functools
+import math
+from datetime import datetime, timedelta
+
+from .core import DAYS_PER_YEAR, SECONDS_PER_YEAR
+from .expectancy import get_life_expectancy, sex_index
+from .profiling import stage
+
+MAX_AGE = 120
+CURVE_CACHE_SIZE = 256
+# Custom lifespans sharing a cached curve differ by less than half of 0.01 years
+LIFESPAN_DECIMALS = 2
+
+# Gompertz-Makeham hazard mu(x) = A + B * exp(C * x); B is fitted per curve
+_MAKEHAM_A = 0.0005
+_GOMPERTZ_C = 0.085
+
+
+class SurvivalCurve:
+    """Cumulative survival l(x) and person-years remaining T(x) at whole ages
+
+    survivors[x] is the share of a birth cohort alive at exact age x and
+    remaining[x] the person-years that cohort still lives after age x, for
+    x = 0 .. max_age + 1 (both are zero at the end).
+    """
+
+    __slots__ = ("survivors", "remaining")
+
+    def __init__(self, qx):
+        survivors = [1.0]
+        for q in qx[:-1]:
+            survivors.append(survivors[-1] * (1.0 - q))
+        survivors.append(0.0)
+        remaining = [0.0] * len(survivors)
+        for x in range(len(survivors) - 2, -1, -1):
+            remaining[x] = remaining[x + 1] + (survivors[x] + survivors[x + 1]) / 2
+        self.survivors = tuple(survivors)
+        self.remaining = tuple(remaining)
+
+    @property
+    def max_age(self):
+        return len(self.survivors) - 2
+
+    @property
+    def life_expectancy(self):
+        """Expected lifespan at birth"""
+        return self.remaining[0]
+
+    def survival(self, age):
+        """Probability of surviving from birth to a (fractional) age"""
+        if age <= 0:
+            return 1.0
+        x = int(age)
+        if x > self.max_age:
+            return 0.0
+        l = self.survivors
+        return l[x] - (age - x) * (l[x] - l[x + 1])
+
+    def remaining_life(self, age):
+        """Expected remaining years of life for someone alive at age"""
+        age = max(age, 0.0)
+        x = int(age)
+        if x > self.max_age:
+            return 0.0
+        alive = self.survival(age)
+        if alive <= 0:
+            return 0.0
+        l_next = self.survivors[x + 1]
+        return (self.remaining[x + 1] + (x + 1 - age) * (alive + l_next) / 2) / alive
+
+
+def _makeham_qx(b):
+    """Death probabilities by age for hazard A + b * exp(C * x)"""
+    qx = []
+    for x in range(MAX_AGE + 1):
+        growth = math.exp(_GOMPERTZ_C * (x + 1)) - math.exp(_GOMPERTZ_C * x)
+        qx.append(1.0 - math.exp(-(_MAKEHAM_A + b / _GOMPERTZ_C * growth)))
+    qx[-1] = 1.0
+    return qx
+
+
+# Bisection bounds for log(b)
+_LOG_B_RANGE = (math.log(1e-12), math.log(1.0))
+
+
+@functools.lru_cache(maxsize=None)
+def lifespan_range():
+    """(lowest, highest) life expectancy at birth a Gompertz-Makeham curve can be fitted to"""
+    low, high = (SurvivalCurve(_makeham_qx(math.exp(log_b))).life_expectancy
+                 for log_b in reversed(_LOG_B_RANGE))
+    return low, high
+
+
+def check_lifespan(lifespan_years):
+    """Raise ValueError unless fit_makeham can reach lifespan_years"""
+    low, high = lifespan_range()
+    if not low <= lifespan_years <= high:
+        raise ValueError(f"Actuarial mode supports lifespans between {math.ceil(low)} "
+                         f"and {math.floor(high)} years")
+
+
+def fit_makeham(life_expectancy):
+    """Return a SurvivalCurve whose life expectancy at birth matches the target
+
+    Raises ValueError when the target is outside lifespan_range().
+    """
+    check_lifespan(life_expectancy)
+    low, high = _LOG_B_RANGE
+    curve = None
+    # Life expectancy falls as b grows; bisect on log(b)
+    for _ in range(60):
+        mid = (low + high) / 2
+        curve = SurvivalCurve(_makeham_qx(math.exp(mid)))
+        if abs(curve.life_expectancy - life_expectancy) < 1e-6:
+            break
+        if curve.life_expectancy > life_expectancy:
+            low = mid
+        else:
+            high = mid
+    return curve
+
+
+def _life_table_qx(country, sex):
+    """Return the loaded life table's latest qx for a country, if available"""
+    from . import lifetable
+
+    table = lifetable.loaded_life_table()
+    if table is None or country not in table.codes:
+        return None
+    try:
+        qx = table.qx(country, sex)
+    except KeyError:
+        return None
+    qx = [float(q) for q in qx]
+    if not all(math.isfinite(q) for q in qx):
+        return None
+    qx[-1] = 1.0
+    return qx
+
+
+def survival_curve(country, gender, lifespan_years=None):
+    """Return the cached SurvivalCurve for a demographic
+
+    With a custom lifespan_years the Gompertz-Makeham curve is calibrated to
+    it (rounded to LIFESPAN_DECIMALS); otherwise the external life table is
+    used when it covers the country. Raises ValueError for custom lifespans
+    outside lifespan_range().
+    """
+    if lifespan_years is not None:
+        lifespan_years = round(float(lifespan_years), LIFESPAN_DECIMALS)
+        check_lifespan(lifespan_years)
+    return _survival_curve(country, gender, lifespan_years)
+
+
+@functools.lru_cache(maxsize=CURVE_CACHE_SIZE)
+def _survival_curve(country, gender, lifespan_years):
+    if lifespan_years is None:
+        qx = _life_table_qx(country, sex_index(gender))
+        if qx is not None:
+            return SurvivalCurve(qx)
+        lifespan_years = get_life_expectancy(country, gender)
+    return fit_makeham(lifespan_years)
+
+
+def clear_cache():
+    """Drop cached survival curves (call after changing the expectancy data)"""
+    _survival_curve.cache_clear()
+
+
+def remaining_life_expectancy(age_years, country, gender, lifespan_years=None):
+    """Expected remaining years of life at a given age"""
+    return survival_curve(country, gender, lifespan_years).remaining_life(age_years)
+
+
+@stage("death_date")
+def actuarial_death_date(birth_date, country, gender, lifespan_years=None, now=None):
+    """Return (death date, expected age at death) conditioned on current age"""
+    now = now or datetime.now()
+    age_years = max((now - birth_date).total_seconds() / SECONDS_PER_YEAR, 0.0)
+    remaining = remaining_life_expectancy(age_years, country, gender, lifespan_years)
+    death_date = max(now, birth_date) + timedelta(days=remaining * DAYS_PER_YEAR)
+    return death_date, age_years + remaining
@@ -0,0 +1,263 @@
+"""Vectorized death date calculation over columns of people
+
+Requires NumPy. Every input is a column (sequence or array) of equal length
+and the whole batch is computed in a handful of array operations. Rows that
+cannot be computed get a non-zero code in ``BatchResult.errors`` instead of
+raising, so one bad row never aborts a batch.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from . import actuarial as actuarial_model
+from . import metrics as metric_registry
+from .core import INVALID_LIFESPAN, NONPOSITIVE_LIFESPAN, SECONDS_PER_YEAR
+from .dates import parse_column
+from .expectancy import DEFAULT_CODE, active_table
+from .profiling import stage
+
+# Per-row error codes
+ERR_OK = 0
+ERR_MISSING_DATE = 1
+ERR_BAD_DATE = 2
+ERR_BAD_LIFESPAN = 3
+ERR_NONPOSITIVE_LIFESPAN = 4
+ERR_BAD_GENDER = 5
+ERR_OUT_OF_RANGE = 6
+ERR_ACTUARIAL_LIFESPAN = 7
+
+ERROR_MESSAGES = {
+    ERR_OK: "",
+    ERR_MISSING_DATE: "Please enter your date of birth",
+    ERR_BAD_DATE: "Invalid date format. Please use DD/MM/YYYY",
+    ERR_BAD_LIFESPAN: INVALID_LIFESPAN,
+    ERR_NONPOSITIVE_LIFESPAN: NONPOSITIVE_LIFESPAN,
+    ERR_BAD_GENDER: "Gender must be Male or Female",
+    ERR_OUT_OF_RANGE: "Death date is out of range",
+    ERR_ACTUARIAL_LIFESPAN: "Lifespan is outside the range actuarial mode supports",
+}
+
+_US_PER_SECOND = 1_000_000
+# datetime.max, the latest date the GUI can display
+_MAX_US = np.datetime64("9999-12-31T23:59:59.999999", "us").astype(np.int64)
+_BLANK = ("", "None", "nan", "NaT")
+GENDERS = ("Male", "Female")
+
+
+class BatchResult:
+    """Columnar output of calculate_batch
+
+    death_dates are datetime64[us], lifespan_years / seconds_remaining /
+    progress_percentage are float64 (NaN on error rows) and errors holds one
+    ERR_* code per row.
+    """
+
+    __slots__ = ("death_dates", "lifespan_years", "seconds_remaining",
+                 "progress_percentage", "errors")
+
+    def __init__(self, death_dates, lifespan_years, seconds_remaining,
+                 progress_percentage, errors):
+        self.death_dates = death_dates
+        self.lifespan_years = lifespan_years
+        self.seconds_remaining = seconds_remaining
+        self.progress_percentage = progress_percentage
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.errors)
+
+    @property
+    def ok(self):
+        """Boolean mask of rows computed without error"""
+        return self.errors == ERR_OK
+
+    @property
+    def expired(self):
+        """Boolean mask of valid rows whose death date has already passed"""
+        return self.ok & (self.seconds_remaining <= 0)
+
+    def metrics(self, names=None):
+        """Evaluate registry metrics (see deathclock.metrics) for every row
+
+        Returns {name: float64 array}; error rows are NaN and expired rows 0.
+        """
+        with np.errstate(invalid="ignore"):
+            return metric_registry.evaluate(np.floor(self.seconds_remaining), names)
+
+    def error_messages(self):
+        """Return the error message of every row ("" for valid rows)"""
+        messages = np.array([ERROR_MESSAGES[code] for code in range(len(ERROR_MESSAGES))],
+                            dtype=object)
+        return messages[self.errors]
+
+
+def _as_text(values):
+    """Return a stripped unicode array and a mask of blank entries"""
+    text = np.char.strip(np.asarray(values).astype(str))
+    blank = np.isin(text, _BLANK)
+    return text, blank
+
+
+def _birth_dates(values):
+    """Return (datetime64[us] birth dates, missing mask, invalid mask)"""
+    arr = np.asarray(values)
+    if arr.dtype.kind == "M":
+        dates = arr.astype("M8[us]")
+        missing = np.isnat(dates)
+        return dates, missing, np.zeros(len(dates), dtype=bool)
+    text, blank = _as_text(arr)
+    days, error_positions = parse_column(text)
+    dates = days.astype("M8[D]").astype("M8[us]")
+    invalid = error_positions >= 0
+    dates[invalid] = np.datetime64("NaT")
+    return dates, blank, invalid & ~blank
+
+
+def _custom_lifespans(values, n):
+    """Return (lifespans with NaN where not given, provided mask, unparsable mask)"""
+    if values is None:
+        return np.full(n, np.nan), np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiub":
+        lifespans = arr.astype(np.float64)
+        provided = ~np.isnan(lifespans)
+        return lifespans, provided, np.zeros(n, dtype=bool)
+
+    text, blank = _as_text(arr)
+    lifespans = np.full(n, np.nan)
+    bad = np.zeros(n, dtype=bool)
+    provided = ~blank
+    try:
+        lifespans[provided] = text[provided].astype(np.float64)
+    except ValueError:
+        values, inverse = np.unique(text[provided], return_inverse=True)
+        parsed = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                parsed[i] = np.nan
+        lifespans[provided] = parsed[inverse]
+        bad[provided] = np.isnan(lifespans[provided])
+    return lifespans, provided, bad
+
+
+def expectancy_array(table=None):
+    """Return a zero-copy (countries, 2) view of an expectancy table's values"""
+    table = table or active_table()
+    return np.frombuffer(table.values, dtype=np.float64).reshape(-1, 2)
+
+
+def encode_countries(countries, table=None):
+    """Map country names to expectancy table codes (unknown names use the global average)"""
+    codes_by_name = (table or active_table()).codes
+    names, inverse = np.unique(np.asarray(countries).astype(str), return_inverse=True)
+    codes = np.array([codes_by_name.get(name, DEFAULT_CODE) for name in names], dtype=np.int32)
+    return codes[inverse.reshape(-1)]
+
+
+def _actuarial_lifespans(ages, codes, is_male, custom, provided, table):
+    """Expected age at death for every row, conditioned on the age reached
+
+    Rows sharing a (country, sex, custom lifespan) share one cached survival
+    curve; the curves are stacked so interpolation is one fancy-indexing pass.
+    """
+    custom = np.round(custom, actuarial_model.LIFESPAN_DECIMALS)
+    keys = np.where(provided, custom, -(codes * 2 + np.where(is_male, 0, 1) + 1.0))
+    unique_keys, group = np.unique(keys, return_inverse=True)
+    curves = []
+    for key in unique_keys:
+        if key > 0:
+            curves.append(actuarial_model.survival_curve(None, None, float(key)))
+        else:
+            code, sex = divmod(int(-key) - 1, 2)
+            curves.append(actuarial_model.survival_curve(table.countries[code], GENDERS[sex]))
+    width = max(len(curve.survivors) for curve in curves) if curves else 2
+    survivors = np.zeros((len(curves), width))
+    remaining = np.zeros((len(curves), width))
+    for i, curve in enumerate(curves):
+        survivors[i, :len(curve.survivors)] = curve.survivors
+        remaining[i, :len(curve.remaining)] = curve.remaining
+
+    group = group.reshape(-1)
+    x = np.clip(np.floor(ages).astype(np.int64), 0, width - 2)
+    fraction = ages - x
+    l_x = survivors[group, x]
+    l_next = survivors[group, x + 1]
+    alive = l_x - fraction * (l_x - l_next)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = (remaining[group, x + 1] + (1 - fraction) * (alive + l_next) / 2) / alive
+    return ages + np.where(alive > 0, expected, 0.0)
+
+
+@stage("batch")
+def calculate_batch(birth_dates, genders, countries, lifespans=None, now=None, actuarial=False):
+    """Compute death dates, seconds remaining and life progress for many people
+
+    birth_dates may be DD/MM/YYYY or YYYY-MM-DD strings or datetime64 values, genders
+    "Male"/"Female" strings and countries names from the expectancy table
+    (unknown countries use the global average, as in the GUI). lifespans is
+    an optional column of custom lifespans in years; NaN or blank entries
+    fall back to the demographic expectancy, and infinite or non-positive
+    ones get ERR_NONPOSITIVE_LIFESPAN, as resolve_lifespan rejects them.
+
+    With actuarial=True the lifespan of each row is its expected age at death
+    given the age already reached (see deathclock.actuarial); custom
+    lifespans the survival curves cannot reach get ERR_ACTUARIAL_LIFESPAN.
+    """
+    births, missing, bad_dates = _birth_dates(birth_dates)
+    n = len(births)
+    gender_arr = np.asarray(genders).astype(str)
+    country_arr = np.asarray(countries)
+    if len(gender_arr) != n or len(country_arr) != n:
+        raise ValueError("All input columns must have the same length")
+
+    is_male = gender_arr == "Male"
+    bad_gender = ~is_male & (gender_arr != "Female")
+
+    custom, provided, bad_custom = _custom_lifespans(lifespans, n)
+    if len(custom) != n:
+        raise ValueError("All input columns must have the same length")
+    table = active_table()
+    codes = encode_countries(country_arr, table)
+    expectancy = expectancy_array(table)[codes, np.where(is_male, 0, 1)]
+    lifespan_years = np.where(provided, custom, expectancy)
+    # As in resolve_lifespan, infinite values are not positive numbers
+    nonpositive = provided & ~bad_custom & ~(np.isfinite(custom) & (custom > 0))
+
+    errors = np.zeros(n, dtype=np.int8)
+    # Later assignments win, so apply in reverse order of precedence
+    errors[bad_gender] = ERR_BAD_GENDER
+    errors[nonpositive] = ERR_NONPOSITIVE_LIFESPAN
+    errors[bad_custom] = ERR_BAD_LIFESPAN
+    errors[bad_dates] = ERR_BAD_DATE
+    errors[missing] = ERR_MISSING_DATE
+
+    valid = errors == ERR_OK
+    birth_us = np.where(valid, births.astype(np.int64), 0)
+    now_us = np.datetime64(now or datetime.now(), "us").astype(np.int64)
+    if actuarial:
+        low, high = actuarial_model.lifespan_range()
+        rounded = np.round(custom, actuarial_model.LIFESPAN_DECIMALS)
+        unreachable = valid & provided & ~((rounded >= low) & (rounded <= high))
+        errors[unreachable] = ERR_ACTUARIAL_LIFESPAN
+        valid &= ~unreachable
+        ages = np.maximum((now_us - birth_us) / (SECONDS_PER_YEAR * _US_PER_SECOND), 0.0)
+        lifespan_years = np.where(valid, lifespan_years, np.nan)
+        lifespan_years[valid] = _actuarial_lifespans(ages[valid], codes[valid], is_male[valid],
+                                                     custom[valid], provided[valid], table)
+    life_us = np.where(valid, lifespan_years, 0.0) * (SECONDS_PER_YEAR * _US_PER_SECOND)
+    out_of_range = valid & (life_us > (_MAX_US - birth_us))
+    errors[out_of_range] = ERR_OUT_OF_RANGE
+    valid &= ~out_of_range
+
+    death_us = birth_us + np.rint(np.where(valid, life_us, 0.0)).astype(np.int64)
+    death_dates = death_us.astype("M8[us]")
+    death_dates[~valid] = np.datetime64("NaT")
+
+    seconds_remaining = np.where(valid, (death_us - now_us) / _US_PER_SECOND, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        progress = np.where(valid, (now_us - birth_us) / life_us * 100, np.nan)
+    lifespan_years = np.where(valid, lifespan_years, np.nan)
+
+    return BatchResult(death_dates, lifespan_years, seconds_remaining, progress, errors)
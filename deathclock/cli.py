@@ -0,0 +1,140 @@
+"""Command-line death clock, usable from scripts without Tkinter
+
+Mirrors the C++ port: birth date, gender and country in, estimated death date,
+time remaining and insights out. Values not given as flags are prompted for
+on a terminal, or read one per line from stdin when it is piped:
+
+    python -m deathclock --birth-date 01/01/1990 --gender Female --country Japan
+    printf '01/01/1990\\nMale\\nJapan\\n' | python -m deathclock --json
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from . import metrics
+from .core import (
+    DATE_FORMAT,
+    DISPLAY_DATETIME_FORMAT,
+    estimate_death_date,
+    life_progress,
+    parse_birth_date,
+)
+from .dates import DateParseError
+from .expectancy import DEFAULT_COUNTRY, get_country_list
+from .lifetable import load_configured
+from .timefmt import DEFAULT_FORMAT, FORMATTERS, format_duration
+
+GENDERS = ("Male", "Female")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m deathclock",
+        description="Estimate your death date and remaining time.",
+    )
+    parser.add_argument("--birth-date", help="date of birth as DD/MM/YYYY")
+    parser.add_argument("--gender", type=str.capitalize, choices=GENDERS)
+    parser.add_argument("--country", help=f"country or region (default: {DEFAULT_COUNTRY})")
+    parser.add_argument("--lifespan", type=float, help="custom lifespan in years")
+    parser.add_argument("--actuarial", action="store_true",
+                        help="condition the estimate on the age already reached")
+    parser.add_argument("--format", default=DEFAULT_FORMAT, choices=sorted(FORMATTERS),
+                        help="countdown display format")
+    parser.add_argument("--metrics", nargs="+", choices=list(metrics.METRICS), default=None,
+                        metavar="NAME", help="metrics to report (default: the insights)")
+    parser.add_argument("--json", action="store_true", help="print one JSON object")
+    parser.add_argument("--list-countries", action="store_true",
+                        help="print the known countries and exit")
+    return parser
+
+
+def _ask(prompt, interactive, stdin):
+    """Prompt on a terminal, or take the next line from piped stdin"""
+    if interactive:
+        return input(prompt).strip()
+    return stdin.readline().strip()
+
+
+def read_missing(args, stdin=None):
+    """Fill birth date, gender and country from stdin, in the C++ port's order"""
+    stdin = stdin or sys.stdin
+    interactive = stdin.isatty()
+    if args.birth_date is None:
+        args.birth_date = _ask("Enter birth date (DD/MM/YYYY): ", interactive, stdin)
+    if args.gender is None:
+        args.gender = _ask("Gender (Male/Female): ", interactive, stdin).capitalize() or "Male"
+    if args.country is None:
+        args.country = _ask("Country: ", interactive, stdin) or DEFAULT_COUNTRY
+
+
+def report(args, now=None):
+    """Compute the estimate described by parsed arguments as a JSON-ready dict"""
+    now = now or datetime.now()
+    birth_date = parse_birth_date(args.birth_date)
+    death_date, lifespan_years = estimate_death_date(
+        birth_date, args.country, args.gender, args.lifespan, args.actuarial, now)
+    seconds_left = int((death_date - now).total_seconds())
+    progress = life_progress(birth_date, lifespan_years, now)
+    return {
+        "birth_date": birth_date.strftime(DATE_FORMAT),
+        "gender": args.gender,
+        "country": args.country,
+        "lifespan_years": round(lifespan_years, 3),
+        "death_date": death_date.strftime(DISPLAY_DATETIME_FORMAT),
+        "seconds_remaining": max(seconds_left, 0),
+        "expired": seconds_left <= 0,
+        "progress_percentage": round(progress[0], 3) if progress else None,
+        "countdown": format_duration(max(seconds_left, 0), args.format, now),
+        "metrics": {name: int(value) for name, value in
+                    metrics.evaluate(seconds_left, args.metrics or metrics.INSIGHTS).items()},
+    }
+
+
+def print_report(result, out=None):
+    """Print a report in the C++ port's layout"""
+    out = out or sys.stdout
+    out.write(f"Estimated death date: {result['death_date']}\n")
+    if result["expired"]:
+        out.write("Your time has already expired!\n")
+        return
+    days_left = result["seconds_remaining"] / 86400
+    out.write(f"Time remaining: {days_left / 365.25:.1f} years ({days_left:.1f} days)\n")
+    out.write(f"Countdown: {result['countdown']}\n")
+    out.write("Insights:\n")
+    for name, value in result["metrics"].items():
+        metric = metrics.METRICS[name]
+        out.write(f"  ~{metric.format(value)} {metric.label}\n")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.list_countries:
+        print("\n".join(get_country_list()))
+        return 0
+
+    read_missing(args)
+    if not args.birth_date:
+        print("Please enter your date of birth", file=sys.stderr)
+        return 2
+    if args.gender not in GENDERS:
+        print("Gender must be Male or Female", file=sys.stderr)
+        return 2
+    load_configured(lambda message: print(message, file=sys.stderr))
+    try:
+        result = report(args)
+    except DateParseError as e:
+        print(f"Invalid date format. Please use DD/MM/YYYY ({e})", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except OverflowError:
+        print("Death date is out of range", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        print_report(result)
+    return 0
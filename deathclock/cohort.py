@@ -0,0 +1,332 @@
+"""Remaining-life statistics of a population, grouped by country and gender
+
+Every person falls in one group per (country, sex) of the expectancy table,
+with the same country and gender inputs that get_life_expectancy uses.
+People from countries the table does not know are counted under the global
+average, as in the GUI. The group is the integer ``code * 2 + sex``, so
+CohortStats keeps its totals in arrays preallocated for every group. Each
+chunk of people is added with a few ``np.bincount`` calls, and no Python
+object is made per person. Memory use depends on the table size and the
+chunk size, not on the population.
+
+Per group, CohortStats tracks:
+
+    people            rows aggregated
+    expired           people whose estimated death date has already passed
+    remaining_years   total years left (expired people count as 0)
+    progress_total    total percentage of life lived, to give the mean
+    deaths            expected deaths per calendar year, from now.year on; the
+                      last column counts ``horizon`` years ahead and later
+    progress_counts   people per ``bin_width`` percent of life lived; the last
+                      bin is 100% and over
+
+Input is a CSV or JSONL population file streamed through calculate_batch
+(see deathclock.stream), or a ``.dcol`` file written by deathclock.stream,
+which is read straight from its memory map without recalculating:
+
+    python -m deathclock.cohort people.csv -o cohorts.csv --bin-width 5
+    python -m deathclock.cohort results.dcol -o cohorts.json
+
+Requires NumPy.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from . import columnar, stream
+from .batch import ERROR_MESSAGES, GENDERS, calculate_batch, encode_countries
+from .core import SECONDS_PER_YEAR
+from .expectancy import FEMALE, active_table
+
+DEFAULT_HORIZON = 120
+DEFAULT_BIN_WIDTH = 10
+# Rows per slice when aggregating a mapped columnar file
+COLUMNAR_CHUNK_SIZE = 1 << 20
+TOTAL = "All"
+JSON_SUFFIX = ".json"
+
+
+def _years(death_dates):
+    """Calendar year of each datetime64 value"""
+    return death_dates.astype("M8[Y]").astype(np.int64) + 1970
+
+
+class CohortStats:
+    """Accumulated statistics for every (country, sex) group of an expectancy table"""
+
+    def __init__(self, now=None, table=None, horizon=DEFAULT_HORIZON, bin_width=DEFAULT_BIN_WIDTH):
+        if horizon < 1:
+            raise ValueError("horizon must be at least one year")
+        if not 0 < bin_width <= 100:
+            raise ValueError("bin_width must be between 0 and 100")
+        self.now = now or datetime.now()
+        self.table = table or active_table()
+        self.horizon = horizon
+        self.bin_width = bin_width
+        self.bins = math.ceil(100 / bin_width)
+        groups = len(self.table.countries) * 2
+        self.people = np.zeros(groups, dtype=np.int64)
+        self.expired = np.zeros(groups, dtype=np.int64)
+        self.remaining_years = np.zeros(groups, dtype=np.float64)
+        self.progress_total = np.zeros(groups, dtype=np.float64)
+        self.deaths = np.zeros((groups, horizon + 1), dtype=np.int64)
+        self.progress_counts = np.zeros((groups, self.bins + 1), dtype=np.int64)
+
+    @property
+    def first_year(self):
+        return self.now.year
+
+    def groups(self, codes, sexes):
+        """Group index of country codes and sex indexes (MALE or FEMALE)"""
+        return np.asarray(codes, dtype=np.intp) * 2 + np.asarray(sexes, dtype=np.intp)
+
+    def _count(self, groups, weights=None, width=1, columns=None):
+        size = len(self.people) * width
+        if columns is not None:
+            groups = groups * width + columns
+        return np.bincount(groups, weights, minlength=size)
+
+    def add(self, groups, death_years, seconds_remaining, progress):
+        """Add people given as parallel arrays of group, death year, seconds left and progress"""
+        groups = np.asarray(groups, dtype=np.intp)
+        seconds_remaining = np.asarray(seconds_remaining, dtype=np.float64)
+        progress = np.asarray(progress, dtype=np.float64)
+        alive = seconds_remaining > 0
+        self.people += self._count(groups)
+        self.expired += self._count(groups[~alive])
+        self.remaining_years += self._count(groups, np.where(alive, seconds_remaining, 0.0)
+                                            / SECONDS_PER_YEAR)
+        self.progress_total += self._count(groups, progress)
+
+        width = self.horizon + 1
+        year = np.clip(np.asarray(death_years, dtype=np.intp)[alive] - self.first_year, 0, self.horizon)
+        self.deaths += self._count(groups[alive], width=width, columns=year).reshape(-1, width)
+        width = self.bins + 1
+        bins = np.where(progress >= 100, self.bins,
+                        np.clip(progress // self.bin_width, 0, self.bins - 1)).astype(np.intp)
+        self.progress_counts += self._count(groups, width=width, columns=bins).reshape(-1, width)
+
+    def add_batch(self, result, genders, countries):
+        """Add the valid rows of a BatchResult computed from the given input columns"""
+        ok = result.ok
+        if not ok.any():
+            return
+        sexes = np.asarray(genders).astype(str)[ok] != "Male"
+        codes = encode_countries(np.asarray(countries)[ok], self.table)
+        self.add(self.groups(codes, sexes), _years(result.death_dates[ok]),
+                 result.seconds_remaining[ok], result.progress_percentage[ok])
+
+    def add_columns(self, columns, start=0, stop=None):
+        """Add rows start:stop of a columnar file written by deathclock.stream
+
+        Country codes are translated from the file's labels to this table's.
+        """
+        labels = columns.meta["labels"]
+        codes = encode_countries(labels["country"], self.table)
+        female = np.asarray(labels["gender"]) == GENDERS[FEMALE]
+        rows = slice(start, stop)
+        groups = self.groups(codes[columns["country"][rows]], female[columns["gender"][rows]])
+        deaths = columns.datetimes("death_date")[rows]
+        self.add(groups, _years(deaths), columns["seconds_remaining"][rows],
+                 columns["progress_percentage"][rows])
+
+    def _summary(self, country, gender, people, expired, remaining, progress_total, deaths,
+                 progress_counts):
+        last = self.first_year + self.horizon
+        return {
+            "country": country,
+            "gender": gender,
+            "people": int(people),
+            "expired": int(expired),
+            "total_remaining_years": round(float(remaining), 3),
+            "mean_remaining_years": round(float(remaining / people), 3) if people else None,
+            "mean_progress_percentage": round(float(progress_total / people), 3) if people else None,
+            "deaths_per_year": {(str(year) if year < last else f"{last}+"): int(count)
+                                for year, count in zip(range(self.first_year, last + 1),
+                                                       deaths.tolist()) if count},
+            "progress_distribution": dict(zip(self.bin_labels(), progress_counts.tolist())),
+        }
+
+    def bin_labels(self):
+        """Names of the progress_counts bins, e.g. "0-10" ... "90-100", "100+" """
+        edges = [min(i * self.bin_width, 100) for i in range(self.bins + 1)]
+        return [f"{low:g}-{high:g}" for low, high in zip(edges, edges[1:])] + ["100+"]
+
+    def summaries(self):
+        """Yield a summary dict for every group with people in it"""
+        for group in np.flatnonzero(self.people).tolist():
+            code, sex = divmod(group, 2)
+            yield self._summary(self.table.countries[code], GENDERS[sex], self.people[group],
+                                self.expired[group], self.remaining_years[group],
+                                self.progress_total[group], self.deaths[group],
+                                self.progress_counts[group])
+
+    def total(self):
+        """Summary of the whole population, with country and gender set to TOTAL"""
+        return self._summary(TOTAL, TOTAL, self.people.sum(), self.expired.sum(),
+                             self.remaining_years.sum(), self.progress_total.sum(),
+                             self.deaths.sum(axis=0), self.progress_counts.sum(axis=0))
+
+
+def aggregate_stream(source, input_format="csv", reject=None, chunk_size=None, actuarial=False,
+                     now=None, progress=None, workers=1, **options):
+    """Aggregate an open CSV or JSONL file of people; returns (CohortStats, StreamStats)
+
+    reject, chunk_size, progress and workers are as for
+    deathclock.stream.process_stream;
+    other options are passed to CohortStats.
+    """
+    now = now or datetime.now()
+    cohorts = CohortStats(now, **options)
+    stats = stream.StreamStats()
+    write_reject = stream.reject_writer(reject, stats)
+
+    pool = None
+    calculate = calculate_batch
+    if workers != 1:
+        from .parallel import BatchPool
+
+        pool = BatchPool(workers)
+        calculate = pool.calculate
+    try:
+        chunk_size = chunk_size or (pool.batch_rows if pool is not None
+                                    else stream.DEFAULT_CHUNK_SIZE)
+        records = stream.read_records(source, input_format)
+        for chunk in stream.read_chunks(records, chunk_size, write_reject):
+            result = stream.calculate_chunk(chunk, now, actuarial, calculate)
+            for i in np.flatnonzero(~result.ok).tolist():
+                write_reject(chunk[i][0], ERROR_MESSAGES[int(result.errors[i])], chunk[i][1])
+            cohorts.add_batch(result, stream.column(chunk, stream.GENDER, "Male"),
+                              stream.column(chunk, stream.COUNTRY))
+            valid = int(result.ok.sum())
+            stats.rows += valid
+            stats.written += valid
+            stats.chunks += 1
+            stats.tick()
+            if progress is not None:
+                progress(stats)
+    finally:
+        if pool is not None:
+            pool.close()
+    stats.tick()
+    return cohorts, stats
+
+
+def aggregate_columnar(path, chunk_size=COLUMNAR_CHUNK_SIZE, progress=None, **options):
+    """Aggregate a columnar file written by deathclock.stream; returns (CohortStats, StreamStats)
+
+    Remaining time and progress are as of the run that wrote the file, so
+    its meta["now"] is used as now.
+    """
+    with columnar.open_columns(path) as columns:
+        if "labels" not in columns.meta or "seconds_remaining" not in columns:
+            raise columnar.ColumnarError(f"{path}: not a deathclock.stream results file")
+        cohorts = CohortStats(datetime.fromisoformat(columns.meta["now"]), **options)
+        stats = stream.StreamStats()
+        chunk_size = chunk_size or COLUMNAR_CHUNK_SIZE
+        for start in range(0, len(columns), chunk_size):
+            stop = min(start + chunk_size, len(columns))
+            cohorts.add_columns(columns, start, stop)
+            stats.rows += stop - start
+            stats.written += stop - start
+            stats.chunks += 1
+            stats.tick()
+            if progress is not None:
+                progress(stats)
+    stats.tick()
+    return cohorts, stats
+
+
+def aggregate_file(path, reject_path=None, **options):
+    """Aggregate a population file, detecting its format from the name
+
+    Options that only apply to calculating (actuarial, now, workers) are
+    ignored for columnar files, whose results are already calculated.
+    """
+    input_format = stream.detect_format(path)
+    if input_format == stream.COLUMNAR:
+        for name in ("actuarial", "now", "workers"):
+            options.pop(name, None)
+        return aggregate_columnar(path, **options)
+    with open(path, newline="", encoding="utf-8") as source:
+        if reject_path is None:
+            return aggregate_stream(source, input_format, **options)
+        with open(reject_path, "w", encoding="utf-8") as reject:
+            return aggregate_stream(source, input_format, reject=reject, **options)
+
+
+def write_csv(f, cohorts):
+    """One row per group and a TOTAL row, with a column per death year and progress bin"""
+    summaries = list(cohorts.summaries()) + [cohorts.total()]
+    years = sorted({year for summary in summaries for year in summary["deaths_per_year"]})
+    labels = cohorts.bin_labels()
+    fields = ["country", "gender", "people", "expired", "total_remaining_years",
+              "mean_remaining_years", "mean_progress_percentage"]
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(fields + [f"deaths_{year}" for year in years]
+                    + [f"lived_{label}" for label in labels])
+    for summary in summaries:
+        writer.writerow([summary[name] for name in fields]
+                        + [summary["deaths_per_year"].get(year, 0) for year in years]
+                        + [summary["progress_distribution"][label] for label in labels])
+
+
+def write_json(f, cohorts):
+    json.dump({"now": cohorts.now.isoformat(timespec="seconds"),
+               "groups": list(cohorts.summaries()),
+               "total": cohorts.total()}, f, ensure_ascii=False, indent=2)
+    f.write("\n")
+
+
+def main(argv=None):
+    from .parallel import MIN_SHARD_ROWS
+
+    parser = argparse.ArgumentParser(prog="python -m deathclock.cohort",
+                                     description="Remaining-life statistics by country and gender "
+                                                 "for a CSV, JSONL or columnar file of people.")
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", help=f"CSV file, or JSON when named *{JSON_SUFFIX} "
+                                               "(default: CSV on stdout)")
+    parser.add_argument("--reject", help="JSONL file receiving rows that could not be processed")
+    parser.add_argument("--bin-width", type=float, default=DEFAULT_BIN_WIDTH,
+                        help="percent of life lived per distribution bin (default: %(default)s)")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON,
+                        help="years of expected deaths listed one by one (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int,
+                        help=f"rows per chunk (default: {stream.DEFAULT_CHUNK_SIZE:,}, or "
+                             f"{MIN_SHARD_ROWS:,} per worker with --workers)")
+    parser.add_argument("--actuarial", action="store_true")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes per chunk (0: all CPUs)")
+    parser.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    def report(stats):
+        print(f"\r{stats}", end="", file=sys.stderr, flush=True)
+
+    try:
+        cohorts, stats = aggregate_file(args.input, args.reject, horizon=args.horizon,
+                                        bin_width=args.bin_width, chunk_size=args.chunk_size,
+                                        actuarial=args.actuarial, workers=args.workers,
+                                        progress=None if args.quiet else report)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.quiet:
+        print(f"\r{stats}", file=sys.stderr)
+
+    write = write_json if args.output and args.output.lower().endswith(JSON_SUFFIX) else write_csv
+    if args.output is None:
+        write(sys.stdout, cohorts)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write(f, cohorts)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Single-file columnar storage of NumPy columns
+
+Bulk outputs (time series, batch results) are written as one fixed-width
+array per column, so a reader maps the file and slices any column without
+parsing a byte of it.
+
+Binary layout (little-endian, columns aligned to 64 bytes):
+
+    header     magic, version, rows, columns, directory offset and length
+    columns    rows * itemsize bytes each, in directory order
+    directory  UTF-8 JSON: {"columns": [{"name", "dtype", "offset"}], "meta": {...}}
+
+``dtype`` is the NumPy type string (``<i8``, ``<f4``, ``<M8[s]``, ...), so
+other tools only need the header and the JSON directory to find a column.
+The directory comes last so columns can be sized before anything is
+written: ``create`` preallocates a file whose row count is known, while
+``ColumnWriter`` takes chunks of unknown total length, spilling each column to
+a temporary file and assembling the result in one sequential pass. Requires
+NumPy.
+"""
+import json
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b"DCOL"
+VERSION = 1
+SUFFIX = ".dcol"
+
+_HEADER = struct.Struct("<4sIQIQQ")
+_ALIGN = 64
+
+
+class ColumnarError(ValueError):
+    """Raised for unsupported column types and malformed columnar files"""
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _file_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype.hasobject or dtype.fields is not None or dtype.subdtype is not None:
+        raise ColumnarError(f"Unsupported column type {dtype}")
+    return dtype.newbyteorder("<") if dtype.byteorder == ">" else dtype
+
+
+def _fit(name, values, dtype):
+    """values as a contiguous array of dtype; raises ColumnarError if integers would wrap"""
+    values = np.asarray(values)
+    if (dtype.kind in "iu" and values.dtype.kind in "iu" and len(values)
+            and not np.can_cast(values.dtype, dtype)):
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise ColumnarError(f"Column {name!r} has values outside the range of {dtype}")
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def _schema(schema):
+    schema = [(str(name), _file_dtype(dtype)) for name, dtype in schema]
+    if len({name for name, _ in schema}) != len(schema):
+        raise ColumnarError("Column names must be unique")
+    return schema
+
+
+def _layout(schema, rows, meta):
+    """Return (header, directory, directory blob) for a file of rows rows"""
+    columns = []
+    offset = _aligned(_HEADER.size)
+    for name, dtype in schema:
+        columns.append({"name": name, "dtype": dtype.str, "offset": offset})
+        offset = _aligned(offset + rows * dtype.itemsize)
+    directory = {"columns": columns, "meta": meta or {}}
+    blob = json.dumps(directory, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(MAGIC, VERSION, rows, len(columns), offset, len(blob)), directory, blob
+
+
+class ColumnarFile:
+    """Memory-mapped columns of a columnar file
+
+    ``columns`` maps names to NumPy arrays viewing the mapped file directly:
+    read-only for files opened with open_columns, writable for ones made by
+    create (call close, or use the file as a context manager, when done).
+    """
+
+    def __init__(self, path, mapping, rows, directory):
+        self.path = path
+        self._map = mapping
+        self.rows = rows
+        self.meta = directory.get("meta", {})
+        self.columns = {}
+        for column in directory["columns"]:
+            dtype = np.dtype(column["dtype"])
+            offset = column["offset"]
+            self.columns[column["name"]] = mapping[offset:offset + rows * dtype.itemsize].view(dtype)
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def datetimes(self, name, unit="s"):
+        """An integer epoch column viewed as datetime64, without copying"""
+        return self.columns[name].view(f"<M8[{unit}]")
+
+    def labels(self, name):
+        """Decode an integer-coded column with its names from meta["labels"][name]"""
+        return np.asarray(self.meta["labels"][name])[self.columns[name]]
+
+    def flush(self):
+        if self._map is not None and self._map.mode != "r":
+            self._map.flush()
+
+    def close(self):
+        """Flush pending writes and drop this object's views of the file"""
+        self.flush()
+        self.columns = {}
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def create(path, schema, rows, meta=None):
+    """Create a file of rows zeroed rows and return it with writable columns
+
+    schema is a sequence of (name, dtype); meta any JSON-serialisable dict
+    stored in the directory.
+    """
+    header, directory, blob = _layout(_schema(schema), rows, meta)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.seek(_HEADER.unpack(header)[4])
+        f.write(blob)
+    mapping = np.memmap(path, dtype=np.uint8, mode="r+")
+    return ColumnarFile(path, mapping, rows, directory)
+
+
+class ColumnWriter:
+    """Write a columnar file to an open binary file from chunks of rows
+
+    The total row count need not be known: every column is spilled to its own
+    temporary file as chunks arrive and close() writes header, columns and
+    directory to the output in order, so memory stays bounded by one chunk and
+    the output need not be seekable.
+    """
+
+    def __init__(self, f, schema, meta=None):
+        self.f = f
+        self.schema = _schema(schema)
+        self.meta = meta
+        self.rows = 0
+        self._spills = {name: tempfile.TemporaryFile() for name, _ in self.schema}
+
+    def append(self, columns):
+        """Add a chunk given as {name: array} with every schema column
+
+        Raises ColumnarError when integers do not fit their column's type,
+        instead of wrapping them.
+        """
+        lengths = {len(columns[name]) for name, _ in self.schema}
+        if len(lengths) > 1:
+            raise ColumnarError("All columns must have the same length")
+        # Convert every column before writing any, so a bad chunk writes nothing
+        arrays = [(name, _fit(name, columns[name], dtype)) for name, dtype in self.schema]
+        for name, values in arrays:
+            self._spills[name].write(values.tobytes())
+        self.rows += lengths.pop() if lengths else 0
+
+    def close(self):
+        """Write the complete file to the output (which is left open)"""
+        header, directory, blob = _layout(self.schema, self.rows, self.meta)
+        self.f.write(header)
+        written = len(header)
+        for column in directory["columns"]:
+            self.f.write(b"\0" * (column["offset"] - written))
+            spill = self._spills[column["name"]]
+            spill.seek(0)
+            shutil.copyfileobj(spill, self.f)
+            written = column["offset"] + spill.tell()
+            spill.close()
+        self.f.write(b"\0" * (_HEADER.unpack(header)[4] - written))
+        self.f.write(blob)
+        self._spills = {}
+
+
+def write_columns(path, columns, meta=None):
+    """Write a {name: array} dict of equal-length columns to path"""
+    arrays = {name: np.asarray(values) for name, values in columns.items()}
+    lengths = {len(values) for values in arrays.values()}
+    if len(lengths) > 1:
+        raise ColumnarError("All columns must have the same length")
+    rows = lengths.pop() if lengths else 0
+    with create(path, [(name, values.dtype) for name, values in arrays.items()], rows, meta) as out:
+        for name, values in arrays.items():
+            out[name][:] = values
+
+
+def open_columns(path):
+    """Map a columnar file read-only; no column data is read until it is used"""
+    mapping = np.memmap(path, dtype=np.uint8, mode="r")
+    if len(mapping) < _HEADER.size:
+        raise ColumnarError(f"{path}: truncated columnar file")
+    magic, version, rows, _, directory_offset, directory_length = \
+        _HEADER.unpack(bytes(mapping[:_HEADER.size]))
+    if magic != MAGIC or version != VERSION:
+        raise ColumnarError(f"{path}: not a version {VERSION} columnar file")
+    if directory_offset + directory_length > len(mapping):
+        raise ColumnarError(f"{path}: truncated columnar file")
+    directory = json.loads(bytes(mapping[directory_offset:directory_offset + directory_length]))
+    return ColumnarFile(path, mapping, rows, directory)
@@ -0,0 +1,74 @@
+"""Death date calculations shared by the GUI, scripts and batch tools"""
+import math
+from datetime import datetime, timedelta
+
+from .dates import parse_date
+from .expectancy import get_life_expectancy
+from .profiling import stage
+
+DATE_FORMAT = "%d/%m/%Y"
+DISPLAY_DATETIME_FORMAT = "%d/%m/%Y %H:%M:%S"
+DAYS_PER_YEAR = 365.25
+SECONDS_PER_DAY = 24 * 3600
+SECONDS_PER_YEAR = DAYS_PER_YEAR * SECONDS_PER_DAY
+# Custom lifespan errors, shared with the batch error codes
+INVALID_LIFESPAN = "Invalid lifespan value. Please enter a number"
+NONPOSITIVE_LIFESPAN = "Lifespan must be a positive number"
+
+
+@stage("parse")
+def parse_birth_date(birth_date_str):
+    """Parse a DD/MM/YYYY (or ISO 8601) birth date string
+
+    Raises deathclock.dates.DateParseError, a ValueError, when invalid.
+    """
+    return parse_date(birth_date_str)
+
+
+def resolve_lifespan(country, gender, custom_lifespan=None):
+    """Return the lifespan in years, preferring a custom value when given
+
+    Raises ValueError for custom values that are not finite positive numbers.
+    """
+    if custom_lifespan is None:
+        return get_life_expectancy(country, gender)
+    try:
+        lifespan_years = float(custom_lifespan)
+    except (TypeError, ValueError):
+        raise ValueError(INVALID_LIFESPAN) from None
+    if not math.isfinite(lifespan_years) or lifespan_years <= 0:
+        raise ValueError(NONPOSITIVE_LIFESPAN)
+    return lifespan_years
+
+
+@stage("death_date")
+def calculate_death_date(birth_date, lifespan_years):
+    """Return the estimated death date for a birth date and lifespan"""
+    return birth_date + timedelta(days=lifespan_years * DAYS_PER_YEAR)
+
+
+def estimate_death_date(birth_date, country, gender, custom_lifespan=None, actuarial=False, now=None):
+    """Return (death date, lifespan in years) for one person
+
+    birth_date may be a datetime or a DD/MM/YYYY string. With actuarial=True
+    the lifespan is the expected age at death given the age already reached.
+    """
+    if isinstance(birth_date, str):
+        birth_date = parse_birth_date(birth_date)
+    lifespan_years = resolve_lifespan(country, gender, custom_lifespan)
+    if actuarial:
+        from .actuarial import actuarial_death_date
+
+        return actuarial_death_date(birth_date, country, gender,
+                                    lifespan_years if custom_lifespan is not None else None, now)
+    return calculate_death_date(birth_date, lifespan_years), lifespan_years
+
+
+def life_progress(birth_date, lifespan_years, now=None):
+    """Return (percentage of life lived, age in years), or None for future birth dates"""
+    now = now or datetime.now()
+    lived_seconds = (now - birth_date).total_seconds()
+    if lived_seconds < 0:
+        return None
+    total_life_seconds = lifespan_years * SECONDS_PER_YEAR
+    return (lived_seconds / total_life_seconds) * 100, lived_seconds / SECONDS_PER_YEAR
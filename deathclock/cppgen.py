@@ -0,0 +1,62 @@
+"""Generate dethclock_data.h so the C++ port shares the Python tables
+
+Run ``python -m deathclock.cppgen > dethclock_data.h`` after changing the
+expectancy table or the metrics registry.
+"""
+import sys
+
+from .expectancy import COUNTRIES, DEFAULT_CODE, EXPECTANCY
+from .metrics import INSIGHTS, METRICS, UNITS
+
+
+def write_expectancy(out):
+    """Write the index-backed expectancy table"""
+    out.write(f"static const int COUNTRY_COUNT = {len(COUNTRIES)};\n")
+    out.write(f"static const int DEFAULT_COUNTRY_CODE = {DEFAULT_CODE};\n\n")
+    out.write("// Indexed by country code\n")
+    out.write("static const char* const COUNTRIES[COUNTRY_COUNT] = {\n")
+    out.write(",\n".join(f'    "{name}"' for name in COUNTRIES))
+    out.write("\n};\n\n")
+    out.write("// [male, female] per country code\n")
+    out.write("static const double EXPECTANCY[COUNTRY_COUNT][2] = {\n")
+    out.write(",\n".join(f"    {{{EXPECTANCY[code * 2]!r}, {EXPECTANCY[code * 2 + 1]!r}}}"
+                          for code in range(len(COUNTRIES))))
+    out.write("\n};\n")
+
+
+def write_metrics(out):
+    """Write the metrics registry as a table of unit and rate fractions"""
+    out.write("enum MetricUnit {\n")
+    out.write(",\n".join(f"    UNIT_{unit.upper()}" for unit in UNITS))
+    out.write("\n};\n\n")
+    out.write("struct MetricDef {\n"
+              "    const char* name;\n"
+              "    const char* label;\n"
+              "    MetricUnit unit;\n"
+              "    long long numerator;\n"
+              "    long long denominator;\n"
+              "};\n\n")
+    out.write(f"static const int METRIC_COUNT = {len(METRICS)};\n\n")
+    out.write("static const MetricDef METRICS[METRIC_COUNT] = {\n")
+    out.write(",\n".join(
+        f'    {{"{m.name}", "{m.label}", UNIT_{m.unit.upper()}, {m.rate.numerator}, {m.rate.denominator}}}'
+        for m in METRICS.values()))
+    out.write("\n};\n\n")
+    names = list(METRICS)
+    out.write("// Indexes into METRICS of the metrics printed as insights\n")
+    out.write(f"static const int INSIGHT_COUNT = {len(INSIGHTS)};\n")
+    out.write("static const int INSIGHTS[INSIGHT_COUNT] = {"
+              + ", ".join(str(names.index(name)) for name in INSIGHTS) + "};\n")
+
+
+def write_header(out):
+    """Write the complete generated header"""
+    out.write("// Generated by `python -m deathclock.cppgen`; do not edit.\n")
+    out.write("#pragma once\n\n")
+    write_expectancy(out)
+    out.write("\n")
+    write_metrics(out)
+
+
+if __name__ == "__main__":
+    write_header(sys.stdout)
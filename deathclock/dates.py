@@ -0,0 +1,197 @@
+"""Hand-written birth date parsing
+
+Replaces ``datetime.strptime``, which is slow over large inputs and depends
+on the locale. Three layouts are understood:
+
+    dmy  DD/MM/YYYY, day and month may have one digit (the GUI's format)
+    iso  YYYY-MM-DD, optionally followed by an ISO 8601 time
+    mdy  MM/DD/YY as returned by the calendar popup
+
+Errors raise DateParseError, a ValueError carrying the position of the
+offending character. ``parse_column`` parses a whole column into days since
+1970-01-01 in a few array operations, falling back to the scalar parser once
+per distinct irregular value; it needs NumPy, the scalar parser does not.
+"""
+from datetime import date, datetime
+
+DMY = "dmy"
+ISO = "iso"
+MDY = "mdy"
+
+# separator and (field, min digits, max digits) in order of appearance
+_LAYOUTS = {
+    DMY: ("/", (("day", 1, 2), ("month", 1, 2), ("year", 4, 4))),
+    ISO: ("-", (("year", 4, 4), ("month", 2, 2), ("day", 2, 2))),
+    MDY: ("/", (("month", 1, 2), ("day", 1, 2), ("year", 2, 2))),
+}
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class DateParseError(ValueError):
+    """A date string that could not be parsed; position indexes the bad character"""
+
+    def __init__(self, text, position, reason):
+        self.text = text
+        self.position = position
+        self.reason = reason
+        super().__init__(f"{reason} at position {position} in {text!r}")
+
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    return 29 if month == 2 and is_leap_year(year) else _DAYS_IN_MONTH[month - 1]
+
+
+def detect_layout(text):
+    """Return ISO for YYYY-MM-DD strings and DMY otherwise"""
+    text = text.strip()
+    return ISO if len(text) > 4 and text[4] == "-" else DMY
+
+
+def _fields(text, start, stop, layout):
+    """Split text[start:stop] into {field: (value, position)}"""
+    sep, fields = _LAYOUTS[layout]
+    values = {}
+    pos = start
+    for i, (name, low, high) in enumerate(fields):
+        end = text.find(sep, pos, stop) if i < len(fields) - 1 else stop
+        if end == -1:
+            end = pos
+            while end < stop and "0" <= text[end] <= "9":
+                end += 1
+            if end < stop:
+                raise DateParseError(text, end, f"Unexpected character {text[end]!r}")
+            raise DateParseError(text, stop, f"Expected {sep!r}")
+        for j in range(pos, end):
+            if not "0" <= text[j] <= "9":
+                raise DateParseError(text, j, f"Unexpected character {text[j]!r}")
+        if not low <= end - pos <= high:
+            digits = str(low) if low == high else f"{low}-{high}"
+            raise DateParseError(text, pos, f"Expected {digits} digit {name}")
+        values[name] = (int(text[pos:end]), pos)
+        pos = end + 1
+    return values
+
+
+def _two_digit_year(year, pivot_year):
+    """Map YY into the hundred years ending at pivot_year"""
+    full = pivot_year // 100 * 100 + year
+    return full - 100 if full > pivot_year else full
+
+
+def parse_date(text, layout=None, pivot_year=None):
+    """Parse a date string into a datetime at midnight
+
+    layout is DMY, ISO or MDY; None picks ISO or DMY from the text. Two-digit
+    MDY years fall in the hundred years ending at pivot_year (default: this
+    year), so birth dates never land in the future. Surrounding whitespace is
+    ignored; error positions index the original text. ISO times with a UTC
+    offset are converted to naive local time, like datetime.now().
+    """
+    stop = len(text.rstrip())
+    start = len(text) - len(text.lstrip()) if stop else 0
+    if start >= stop:
+        raise DateParseError(text, start, "Empty date")
+    layout = layout or detect_layout(text)
+    if layout not in _LAYOUTS:
+        raise ValueError(f"Unknown date layout: {layout!r}")
+
+    time_start = None
+    if layout == ISO and stop - start > 10 and text[start + 10] in "T ":
+        time_start, stop = start + 10, start + 10
+    fields = _fields(text, start, stop, layout)
+    year, year_pos = fields["year"]
+    month, month_pos = fields["month"]
+    day, day_pos = fields["day"]
+    if layout == MDY:
+        year = _two_digit_year(year, pivot_year or date.today().year)
+    if year < 1:
+        raise DateParseError(text, year_pos, "Year out of range")
+    if not 1 <= month <= 12:
+        raise DateParseError(text, month_pos, "Month out of range")
+    if not 1 <= day <= days_in_month(year, month):
+        raise DateParseError(text, day_pos, "Day out of range")
+
+    if time_start is not None:
+        try:
+            value = datetime.fromisoformat(text.strip())
+        except ValueError:
+            raise DateParseError(text, time_start + 1, "Invalid time") from None
+        if value.tzinfo is not None:
+            try:
+                value = value.astimezone().replace(tzinfo=None)
+            except (OverflowError, OSError, ValueError):
+                raise DateParseError(text, time_start + 1, "Time out of range") from None
+        return value
+    return datetime(year, month, day)
+
+
+def epoch_days(year, month, day):
+    """Days since 1970-01-01 of a proleptic Gregorian date
+
+    Pure integer arithmetic, so it works element-wise on NumPy arrays too.
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_column(values, layout=None):
+    """Parse a column of date strings into (days since 1970-01-01, error positions)
+
+    Both results are int64 arrays; error positions are -1 for parsed rows and
+    index the stripped text otherwise (blank entries fail at position 0).
+    Fixed-width DD/MM/YYYY and YYYY-MM-DD rows are decoded straight from the
+    character buffer; any other row goes through parse_date once per
+    distinct value. Requires NumPy.
+    """
+    import numpy as np
+
+    text = np.char.strip(np.asarray(values).astype(str))
+    n = len(text)
+    days = np.zeros(n, dtype=np.int64)
+    errors = np.full(n, -1, dtype=np.int64)
+    if not n:
+        return days, errors
+
+    # View the UCS-4 buffer as code points; non-ASCII characters fail the digit checks
+    buf = np.ascontiguousarray(text.astype("U10")).view(np.uint32).reshape(n, 10).astype(np.int64)
+    width_ok = np.char.str_len(text) == 10
+    done = np.zeros(n, dtype=bool)
+    for fixed, sep_at, digit_at in ((DMY, (2, 5), (6, 7, 8, 9, 3, 4, 0, 1)),
+                                    (ISO, (4, 7), (0, 1, 2, 3, 5, 6, 8, 9))):
+        if layout not in (None, fixed):
+            continue
+        digits = buf[:, list(digit_at)] - ord("0")
+        rows = width_ok & ~done
+        rows &= (buf[:, sep_at[0]] == ord(_LAYOUTS[fixed][0])) & (buf[:, sep_at[1]] == ord(_LAYOUTS[fixed][0]))
+        rows &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+        month = digits[:, 4] * 10 + digits[:, 5]
+        day = digits[:, 6] * 10 + digits[:, 7]
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_days = np.array(_DAYS_IN_MONTH)[np.clip(month, 1, 12) - 1] + (leap & (month == 2))
+        rows &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+        days[rows] = epoch_days(year[rows], month[rows], day[rows])
+        done |= rows
+
+    retry = ~done
+    if retry.any():
+        unique, inverse = np.unique(text[retry], return_inverse=True)
+        parsed = np.zeros(len(unique), dtype=np.int64)
+        positions = np.full(len(unique), -1, dtype=np.int64)
+        for i, value in enumerate(unique):
+            try:
+                parsed[i] = parse_date(value, layout).toordinal() - _EPOCH_ORDINAL
+            except DateParseError as e:
+                positions[i] = e.position
+        days[retry] = parsed[inverse.reshape(-1)]
+        errors[retry] = positions[inverse.reshape(-1)]
+    return days, errors
@@ -0,0 +1,212 @@
+"""Life expectancy reference data (2023 estimates)
+
+The table is built once at import time and is index-backed: every country has
+a stable integer code (its position in COUNTRIES) and EXPECTANCY is a flat,
+read-only float64 buffer holding [male, female] pairs, so a lookup by code is
+a single index operation. This module is also the single source of the C++
+port's data; see ``deathclock.cppgen``.
+
+Lookups go through the active table, which ``deathclock.lifetable`` can
+replace with figures loaded from external period life tables.
+"""
+import math
+from array import array
+from types import MappingProxyType
+
+from .profiling import stage
+
+DEFAULT_COUNTRY = "Global Average"
+DEFAULT_CODE = 0
+MALE = 0
+FEMALE = 1
+
+# (country, male, female)
+_TABLE = (
+    ("Global Average", 70.8, 75.9),
+    ("Japan", 81.5, 87.6),
+    ("Switzerland", 81.8, 85.5),
+    ("South Korea", 79.3, 85.4),
+    ("Singapore", 81.0, 85.7),
+    ("Spain", 80.7, 86.2),
+    ("Italy", 81.2, 85.6),
+    ("Australia", 81.2, 85.3),
+    ("Iceland", 80.5, 84.8),
+    ("Israel", 79.9, 84.1),
+    ("Sweden", 80.8, 84.7),
+    ("France", 79.8, 85.8),
+    ("Norway", 80.5, 84.4),
+    ("Malta", 79.8, 84.5),
+    ("Netherlands", 80.1, 83.8),
+    ("Austria", 79.0, 84.1),
+    ("Finland", 78.8, 84.5),
+    ("New Zealand", 80.2, 83.5),
+    ("Ireland", 79.9, 83.5),
+    ("United Kingdom", 79.2, 82.9),
+    ("Belgium", 79.2, 84.1),
+    ("Germany", 78.7, 83.4),
+    ("Canada", 80.0, 84.0),
+    ("Luxembourg", 79.8, 84.6),
+    ("Greece", 78.4, 83.8),
+    ("Portugal", 78.9, 84.9),
+    ("Slovenia", 78.3, 84.3),
+    ("Denmark", 78.9, 82.9),
+    ("Cyprus", 79.2, 83.1),
+    ("United States", 76.4, 81.2),
+    ("Czech Republic", 76.1, 82.1),
+    ("Chile", 77.2, 82.4),
+    ("Costa Rica", 77.8, 82.2),
+    ("Poland", 74.0, 81.6),
+    ("Estonia", 74.4, 82.4),
+    ("Panama", 76.2, 81.8),
+    ("Turkey", 76.2, 81.3),
+    ("Albania", 76.9, 80.9),
+    ("Croatia", 75.4, 81.2),
+    ("Uruguay", 74.5, 81.2),
+    ("Cuba", 77.2, 81.9),
+    ("Argentina", 73.0, 79.8),
+    ("Lebanon", 77.4, 81.3),
+    ("China", 75.1, 80.5),
+    ("Brazil", 72.2, 79.4),
+    ("Thailand", 72.6, 80.0),
+    ("Iran", 74.2, 77.6),
+    ("Mexico", 72.1, 77.7),
+    ("Colombia", 73.0, 79.0),
+    ("Algeria", 75.9, 78.3),
+    ("Tunisia", 74.2, 78.7),
+    ("Ecuador", 74.1, 79.5),
+    ("Sri Lanka", 73.1, 79.2),
+    ("Morocco", 74.0, 77.3),
+    ("Peru", 73.7, 79.1),
+    ("Jordan", 72.7, 76.1),
+    ("Armenia", 71.6, 78.9),
+    ("Vietnam", 71.7, 80.9),
+    ("Venezuela", 69.2, 77.2),
+    ("Egypt", 70.2, 74.1),
+    ("Libya", 70.2, 75.9),
+    ("Paraguay", 71.7, 77.2),
+    ("Ukraine", 67.0, 76.9),
+    ("Philippines", 67.5, 75.0),
+    ("El Salvador", 70.4, 78.1),
+    ("Honduras", 72.3, 76.9),
+    ("Guatemala", 71.2, 76.8),
+    ("Bolivia", 67.5, 72.4),
+    ("Nepal", 69.0, 71.9),
+    ("Nicaragua", 72.4, 78.1),
+    ("Bangladesh", 71.2, 74.2),
+    ("Cambodia", 67.1, 71.1),
+    ("India", 68.4, 70.7),
+    ("Pakistan", 66.1, 68.4),
+    ("Myanmar", 64.8, 69.8),
+    ("Kenya", 61.4, 66.2),
+    ("Ghana", 62.4, 64.7),
+    ("Tanzania", 63.1, 67.3),
+    ("Uganda", 61.7, 65.4),
+    ("Rwanda", 67.3, 71.7),
+    ("Ethiopia", 64.9, 68.9),
+    ("Madagascar", 64.5, 67.8),
+    ("Senegal", 66.3, 70.1),
+    ("Mali", 57.3, 59.8),
+    ("Burkina Faso", 59.3, 61.4),
+    ("Niger", 60.4, 62.1),
+    ("Chad", 52.5, 55.4),
+    ("Nigeria", 53.4, 55.7),
+    ("South Africa", 62.3, 68.5),
+    ("Zimbabwe", 59.3, 63.4),
+    ("Botswana", 66.1, 72.4),
+    ("Zambia", 61.2, 65.1),
+    ("Mozambique", 58.8, 64.2),
+    ("Angola", 59.3, 64.4),
+    ("Sierra Leone", 52.2, 55.7),
+    ("Central African Republic", 51.0, 55.7),
+)
+
+class ExpectancyTable:
+    """Immutable country -> code mapping plus flat [male, female] values"""
+
+    __slots__ = ("countries", "codes", "values")
+
+    def __init__(self, countries, values):
+        self.countries = tuple(countries)
+        self.codes = MappingProxyType({name: code for code, name in enumerate(self.countries)})
+        self.values = memoryview(array("d", values)).toreadonly()
+
+    @classmethod
+    def from_buffer(cls, countries, buffer):
+        """Wrap an existing buffer of [male, female] float64 pairs without copying it"""
+        table = cls.__new__(cls)
+        table.countries = tuple(countries)
+        table.codes = MappingProxyType({name: code for code, name in enumerate(table.countries)})
+        table.values = memoryview(buffer).cast("B").cast("d").toreadonly()
+        return table
+
+    def code(self, country):
+        """Return the integer code of a country (the global average if unknown)"""
+        return self.codes.get(country, DEFAULT_CODE)
+
+    def merged(self, countries, values):
+        """Return a table where the given rows override or extend this one
+
+        Non-finite values keep this table's figure for that country and sex,
+        and DEFAULT_COUNTRY always stays at DEFAULT_CODE.
+        """
+        merged = {name: [self.values[code * 2], self.values[code * 2 + 1]]
+                  for code, name in enumerate(self.countries)}
+        for i, name in enumerate(countries):
+            row = merged.setdefault(name, [math.nan, math.nan])
+            for sex in (MALE, FEMALE):
+                value = values[i * 2 + sex]
+                if math.isfinite(value):
+                    row[sex] = value
+        names = [name for name, row in merged.items() if all(map(math.isfinite, row))]
+        names.remove(DEFAULT_COUNTRY)
+        names.insert(DEFAULT_CODE, DEFAULT_COUNTRY)
+        return ExpectancyTable(names, [value for name in names for value in merged[name]])
+
+
+BUILTIN = ExpectancyTable((row[0] for row in _TABLE), (value for row in _TABLE for value in row[1:]))
+del _TABLE
+
+COUNTRIES = BUILTIN.countries
+COUNTRY_CODES = BUILTIN.codes
+EXPECTANCY = BUILTIN.values
+
+# Table used by all lookups; replaced by set_expectancy_table
+_active = BUILTIN
+
+
+def active_table():
+    """Return the expectancy table currently used for lookups"""
+    return _active
+
+
+def set_expectancy_table(table):
+    """Use another ExpectancyTable for all lookups (None restores the built-in data)"""
+    global _active
+    _active = table or BUILTIN
+
+
+def country_code(country):
+    """Return the integer code of a country in the active table"""
+    return _active.codes.get(country, DEFAULT_CODE)
+
+
+def sex_index(gender):
+    """Return MALE for "Male" and FEMALE otherwise, matching get_life_expectancy"""
+    return MALE if gender == "Male" else FEMALE
+
+
+def expectancy_by_code(code, sex):
+    """Get life expectancy by country code and sex index"""
+    return _active.values[code * 2 + sex]
+
+
+def get_country_list():
+    """Return list of countries with life expectancy data"""
+    return list(_active.countries)
+
+
+@stage("expectancy")
+def get_life_expectancy(country, gender):
+    """Get life expectancy based on country and gender"""
+    table = _active
+    return table.values[table.codes.get(country, DEFAULT_CODE) * 2 + (gender != "Male")]
@@ -0,0 +1,246 @@
+"""External period life tables with a memory-mapped binary cache
+
+Life tables are read from CSV with one row per (country, sex, year, age):
+
+    country,sex,year,age,qx[,ex]
+
+where qx is the probability of dying between age and age + 1 and ex the
+optional remaining life expectancy at that age (derived from qx if absent).
+The first load compiles the CSV into a compact binary file next to it; later
+loads memory-map that file, so startup reads a small header and nothing else.
+
+Binary layout (little-endian, sections aligned to 64 bytes):
+
+    header   magic, version, countries, years, ages, first year, offsets
+    names    UTF-8 country names separated by newlines
+    summary  float64 [countries, 2] latest period life expectancy at birth
+    qx       float32 [countries, years, 2, ages]
+    ex       float32 [countries, years, 2, ages]
+
+Missing cells are NaN. Loading a table requires NumPy, which is imported on
+first use, so entry points can call load_configured without paying for it.
+"""
+import csv
+import math
+import os
+import struct
+
+from . import actuarial
+from .expectancy import BUILTIN, FEMALE, MALE, set_expectancy_table
+
+MAGIC = b"DCLT"
+VERSION = 1
+CACHE_SUFFIX = ".dclt"
+ENV_VAR = "DEATHCLOCK_LIFE_TABLE"
+
+_HEADER = struct.Struct("<4sIIIIiQQQQQ")
+_ALIGN = 64
+_SEXES = {"male": MALE, "m": MALE, "female": FEMALE, "f": FEMALE}
+
+
+class LifeTableError(ValueError):
+    """Raised for malformed life table CSV or cache files"""
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def expectancy_from_qx(qx):
+    """Return remaining life expectancy at every age from death probabilities
+
+    Works along the last axis. Deaths are assumed to fall mid-year, so each
+    age contributes l(x) * (1 - q(x) / 2) person-years.
+    """
+    import numpy as np
+
+    qx = np.asarray(qx, dtype=np.float64)
+    survivors = np.cumprod(1.0 - qx, axis=-1)
+    lx = np.concatenate([np.ones(qx.shape[:-1] + (1,)), survivors[..., :-1]], axis=-1)
+    person_years = lx * (1.0 - qx / 2)
+    remaining = np.flip(np.cumsum(np.flip(person_years, axis=-1), axis=-1), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return remaining / lx
+
+
+def _read_csv(csv_path):
+    """Read a life table CSV into index columns and value columns"""
+    import numpy as np
+
+    names = {}
+    country, sex, year, age, qx, ex = [], [], [], [], [], []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = {"country", "sex", "year", "age", "qx"} - set(reader.fieldnames or ())
+        if missing:
+            raise LifeTableError(f"{csv_path}: missing columns {', '.join(sorted(missing))}")
+        has_ex = "ex" in reader.fieldnames
+        for line, row in enumerate(reader, start=2):
+            try:
+                sex.append(_SEXES[row["sex"].strip().lower()])
+                year.append(int(row["year"]))
+                age.append(int(row["age"]))
+                qx.append(float(row["qx"]))
+                ex.append(float(row["ex"]) if has_ex and row["ex"].strip() else math.nan)
+            except (KeyError, ValueError, AttributeError):
+                raise LifeTableError(f"{csv_path}:{line}: invalid row {row!r}") from None
+            country.append(names.setdefault(row["country"].strip(), len(names)))
+    if not names:
+        raise LifeTableError(f"{csv_path}: no rows")
+    return (list(names), np.array(country), np.array(sex), np.array(year), np.array(age),
+            np.array(qx), np.array(ex))
+
+
+def compile_life_table(csv_path, out_path):
+    """Compile a life table CSV into the binary cache format"""
+    import numpy as np
+
+    names, country, sex, year, age, qx_values, ex_values = _read_csv(csv_path)
+    if age.min() < 0:
+        raise LifeTableError(f"{csv_path}: negative age")
+    first_year = int(year.min())
+    shape = (len(names), int(year.max()) - first_year + 1, 2, int(age.max()) + 1)
+
+    qx = np.full(shape, np.nan, dtype=np.float32)
+    ex = np.full(shape, np.nan, dtype=np.float32)
+    index = (country, year - first_year, sex, age)
+    qx[index] = qx_values
+    ex[index] = ex_values
+    derived = expectancy_from_qx(qx)
+    ex = np.where(np.isnan(ex), derived, ex).astype(np.float32)
+
+    # Latest year with a value at birth, per country and sex
+    at_birth = ex[..., 0]
+    has_value = ~np.isnan(at_birth)
+    latest = shape[1] - 1 - np.argmax(has_value[:, ::-1, :], axis=1)
+    summary = np.take_along_axis(at_birth, latest[:, None, :], axis=1)[:, 0, :].astype(np.float64)
+    summary[~has_value.any(axis=1)] = np.nan
+
+    names_blob = "\n".join(names).encode("utf-8")
+    names_offset = _aligned(_HEADER.size)
+    summary_offset = _aligned(names_offset + len(names_blob))
+    qx_offset = _aligned(summary_offset + summary.nbytes)
+    ex_offset = _aligned(qx_offset + qx.nbytes)
+    header = _HEADER.pack(MAGIC, VERSION, shape[0], shape[1], shape[3], first_year,
+                          names_offset, len(names_blob), summary_offset, qx_offset, ex_offset)
+
+    tmp_path = f"{out_path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        for offset, blob in ((0, header), (names_offset, names_blob),
+                             (summary_offset, summary.astype("<f8").tobytes()),
+                             (qx_offset, qx.astype("<f4").tobytes()),
+                             (ex_offset, ex.astype("<f4").tobytes())):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+
+
+class LifeTable:
+    """Read-only, memory-mapped view of a compiled life table"""
+
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(self._map) < _HEADER.size:
+            raise LifeTableError(f"{path}: truncated life table")
+        (magic, version, n_countries, n_years, n_ages, first_year, names_offset, names_length,
+         summary_offset, qx_offset, ex_offset) = _HEADER.unpack(bytes(self._map[:_HEADER.size]))
+        if magic != MAGIC or version != VERSION:
+            raise LifeTableError(f"{path}: not a version {VERSION} life table")
+
+        names = bytes(self._map[names_offset:names_offset + names_length]).decode("utf-8")
+        self.countries = tuple(names.split("\n"))
+        self.codes = {name: code for code, name in enumerate(self.countries)}
+        self.first_year = first_year
+        self.years = range(first_year, first_year + n_years)
+        self.max_age = n_ages - 1
+
+        shape = (n_countries, n_years, 2, n_ages)
+        size = n_countries * n_years * 2 * n_ages * 4
+        self.summary = self._map[summary_offset:summary_offset + n_countries * 16] \
+            .view("<f8").reshape(n_countries, 2)
+        self.qx_table = self._map[qx_offset:qx_offset + size].view("<f4").reshape(shape)
+        self.ex_table = self._map[ex_offset:ex_offset + size].view("<f4").reshape(shape)
+
+    def _index(self, country, sex, year):
+        import numpy as np
+
+        code = self.codes[country]
+        if year is None:
+            # Latest year with data at birth
+            rows = np.flatnonzero(~np.isnan(self.ex_table[code, :, sex, 0]))
+            if not len(rows):
+                raise KeyError(f"no data for {country}")
+            return code, int(rows[-1])
+        if year not in self.years:
+            raise KeyError(f"no data for {country} in {year}")
+        return code, year - self.first_year
+
+    def qx(self, country, sex, year=None):
+        """Return death probabilities by age (latest year if year is None)"""
+        code, year_index = self._index(country, sex, year)
+        return self.qx_table[code, year_index, sex]
+
+    def ex(self, country, sex, year=None):
+        """Return remaining life expectancy by age (latest year if year is None)"""
+        code, year_index = self._index(country, sex, year)
+        return self.ex_table[code, year_index, sex]
+
+    def expectancy_table(self, base=BUILTIN):
+        """Return an ExpectancyTable where this life table overrides base"""
+        return base.merged(self.countries, self.summary.reshape(-1).tolist())
+
+
+def open_life_table(path):
+    """Open a compiled life table, compiling a CSV source on first use
+
+    CSV paths are compiled to ``<path>.dclt`` and recompiled whenever the CSV
+    is newer than its cache.
+    """
+    if not path.endswith(CACHE_SUFFIX):
+        cache_path = path + CACHE_SUFFIX
+        if (not os.path.exists(cache_path)
+                or os.path.getmtime(cache_path) < os.path.getmtime(path)):
+            compile_life_table(path, cache_path)
+        path = cache_path
+    return LifeTable(path)
+
+
+_loaded = None
+
+
+def use_life_table(path):
+    """Load a life table and make get_life_expectancy use it"""
+    global _loaded
+    _loaded = open_life_table(path)
+    set_expectancy_table(_loaded.expectancy_table())
+    actuarial.clear_cache()
+    return _loaded
+
+
+def loaded_life_table():
+    """Return the LifeTable activated by use_life_table, if any"""
+    return _loaded
+
+
+def load_from_environment():
+    """Activate the life table named by $DEATHCLOCK_LIFE_TABLE, if set"""
+    path = os.environ.get(ENV_VAR)
+    return use_life_table(path) if path else None
+
+
+def load_configured(report):
+    """Startup helper: activate $DEATHCLOCK_LIFE_TABLE, reporting failures
+
+    A table that cannot be loaded (or NumPy missing) is passed to
+    report(message) as text and the built-in figures stay in use.
+    """
+    if not os.environ.get(ENV_VAR):
+        return None
+    try:
+        return load_from_environment()
+    except (ImportError, OSError, ValueError) as e:
+        report(f"Could not load life table, using built-in data: {e}")
+        return None
@@ -0,0 +1,143 @@
+"""Registry of the "fun fact" metrics derived from the time left
+
+Every metric is a whole number of some time unit left, times a rate: meals
+are 3 per day left, hours of sleep 1 per 3 hours left, and so on. Rates are
+fractions and the arithmetic is integer floor division, so a metric is exact
+and evaluates the same way on a single ``int`` of seconds (the GUI), on a
+NumPy array of seconds (batch reports) and in the C++ port, which gets the
+registry through ``deathclock.cppgen``.
+"""
+from fractions import Fraction
+
+from .tiers import DAY, HOUR, MINUTE, SECOND
+
+# Time units a metric can count, in order of size
+UNITS = ("second", "minute", "hour", "day", "week", "year")
+
+UNIT_GRANULARITY = {
+    "second": SECOND,
+    "minute": MINUTE,
+    "hour": HOUR,
+    "day": DAY,
+    "week": DAY,
+    "year": DAY,
+}
+
+
+def unit_count(seconds, unit):
+    """Whole units left in seconds; weeks and years are counted in whole days
+
+    A year is 365.25 days, so whole years are floor(4 * days / 1461).
+    """
+    if unit == "second":
+        return seconds // 1
+    if unit == "minute":
+        return seconds // 60
+    if unit == "hour":
+        return seconds // 3600
+    days = seconds // DAY
+    if unit == "day":
+        return days
+    if unit == "week":
+        return days // 7
+    if unit == "year":
+        return days * 4 // 1461
+    raise ValueError(f"Unknown unit: {unit!r}")
+
+
+def format_count(value):
+    """Format a whole count with thousands separators"""
+    return f"{int(value):,}"
+
+
+def format_millions(value):
+    """Format a large count in millions, e.g. 12.3M"""
+    return f"{value / 1_000_000:.1f}M"
+
+
+class Metric:
+    """One metric: rate per unit left, the label it is shown with and its formatter"""
+
+    __slots__ = ("name", "label", "unit", "rate", "granularity", "formatter")
+
+    def __init__(self, name, label, unit, rate, formatter=format_count):
+        if unit not in UNIT_GRANULARITY:
+            raise ValueError(f"Unknown unit: {unit!r}")
+        self.name = name
+        self.label = label
+        self.unit = unit
+        self.rate = Fraction(rate)
+        self.granularity = UNIT_GRANULARITY[unit]
+        self.formatter = formatter
+
+    def value(self, seconds):
+        """Evaluate for a number or an array of seconds left"""
+        count = unit_count(seconds, self.unit)
+        if self.rate.denominator == 1:
+            return count * self.rate.numerator
+        return count * self.rate.numerator // self.rate.denominator
+
+    def format(self, value):
+        return self.formatter(value)
+
+    def __repr__(self):
+        return f"Metric({self.name!r}, {self.unit!r}, {self.rate})"
+
+
+METRICS = {metric.name: metric for metric in (
+    # Vital signs
+    Metric("heartbeats", "heartbeats left", "second", 70),    # Average 70 bpm
+    Metric("breaths", "breaths left", "second", 15),          # Average 15 breaths per minute
+    Metric("blinks", "blinks ahead", "second", Fraction(33, 100)),  # About 20 blinks per minute
+    # Daily life
+    Metric("sleep_hours", "hours of sleep", "hour", Fraction(1, 3)),  # 8 hours sleep per day
+    Metric("awake_hours", "awake hours", "hour", Fraction(2, 3)),
+    Metric("meals", "meals", "day", 3),
+    Metric("weekend_days", "weekend days", "week", 2),
+    Metric("work_hours", "work hours", "day", 8),
+    Metric("vacation_days", "vacation days", "year", 20),
+    Metric("tv_episodes", "TV episodes", "hour", 1),          # 1h episodes
+    Metric("workouts", "workouts", "day", Fraction(1, 2)),    # Every other day
+    # Life quality
+    Metric("books", "books to read", "day", Fraction(1, 7)),  # 1 book per week
+    Metric("movies", "movies to watch", "hour", Fraction(1, 2)),  # 2-hour movies
+    Metric("conversations", "conversations", "day", 5),
+    Metric("steps", "steps to take", "day", 8000),
+    Metric("distance_km", "km to walk", "day", Fraction(32, 5)),  # 8000 steps of 0.8m
+    # Perspective and fun facts
+    Metric("coffee_cups", "coffee moments", "day", 2),
+    Metric("sunrises", "sunrises", "day", 1),
+    Metric("hugs", "hugs", "day", 3),
+    Metric("laughs", "laughs", "day", 15),
+    Metric("photos", "photos", "day", 10),
+    Metric("songs", "songs", "hour", 15),                     # 15 songs per hour awake
+    Metric("words", "words to speak", "day", 16000),
+    Metric("dreams", "dreams to have", "day", 4),
+    Metric("years_in_orbit", "years in orbit", "year", 1),
+)}
+
+# The metrics printed by the command-line ports
+INSIGHTS = ("sleep_hours", "meals", "work_hours", "tv_episodes", "workouts")
+
+
+def granularity(names):
+    """Return the finest granularity among the named metrics"""
+    return min(METRICS[name].granularity for name in names)
+
+
+def evaluate(seconds, names=None):
+    """Return {name: value} for a number or an array of seconds left
+
+    Negative seconds count as none left. Arrays may be floating point, in
+    which case NaN entries stay NaN.
+    """
+    if hasattr(seconds, "clip"):
+        seconds = seconds.clip(min=0)
+    else:
+        seconds = max(int(seconds), 0)
+    return {name: METRICS[name].value(seconds) for name in (names or METRICS)}
+
+
+def format_metrics(seconds, names=None):
+    """Return {name: formatted value} for a single number of seconds left"""
+    return {name: METRICS[name].format(value) for name, value in evaluate(seconds, names).items()}
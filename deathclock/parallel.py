@@ -0,0 +1,230 @@
+"""Multi-core batch calculation over shared memory
+
+BatchPool splits the rows of a batch into one contiguous shard per worker
+process and runs ``calculate_batch`` on every shard in parallel. Shards have
+at least MIN_SHARD_ROWS rows, so a batch needs ``workers * MIN_SHARD_ROWS``
+rows to keep every worker busy (see batch_rows). Nothing is
+pickled per row: the input columns are copied once into shared memory as
+fixed-width arrays, workers read their shard straight from it and write
+their results into shared result arrays at the shard's offset, so results
+come back in input order without a merge step. The active expectancy table is
+shared the same way once per pool, and workers reopen the loaded external
+life table (a memory map) instead of receiving it. ``submit`` returns as soon
+as the shards are queued, so a caller can read the next batch while the
+workers compute this one. Requires NumPy.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import lifetable
+from .batch import BatchResult, calculate_batch
+from .expectancy import ExpectancyTable, active_table, set_expectancy_table
+
+# Below this many rows per worker the pool costs more than it saves
+MIN_SHARD_ROWS = 50_000
+
+_RESULT_DTYPES = (
+    ("death_dates", "M8[us]"),
+    ("lifespan_years", "f8"),
+    ("seconds_remaining", "f8"),
+    ("progress_percentage", "f8"),
+    ("errors", "i1"),
+)
+
+
+def default_workers():
+    """Number of CPUs this process may use"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class _Shared:
+    """A NumPy array in a named shared memory block"""
+
+    def __init__(self, shape, dtype):
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.spec = (self.shm.name, tuple(shape), dtype.str)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+
+    @classmethod
+    def copy_of(cls, values):
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    def release(self):
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _column(values):
+    """Return a column as an array that can live in shared memory (no objects)"""
+    arr = np.asarray(values)
+    if arr.dtype.kind == "O":
+        arr = arr.astype(str)
+    return arr
+
+
+# Worker process state, set by _init_worker
+_worker_table = None
+
+
+def _init_worker(table_spec, countries, life_table_path):
+    global _worker_table
+    if life_table_path is not None:
+        lifetable.use_life_table(life_table_path)
+    name, shape, dtype = table_spec
+    _worker_table = shared_memory.SharedMemory(name=name)
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    set_expectancy_table(ExpectancyTable.from_buffer(countries, _worker_table.buf[:size]))
+
+
+def _attach(specs):
+    return [None if spec is None else shared_memory.SharedMemory(name=spec[0]) for spec in specs]
+
+
+def _views(blocks, specs):
+    return [None if block is None else np.ndarray(spec[1], dtype=spec[2], buffer=block.buf)
+            for block, spec in zip(blocks, specs)]
+
+
+def _compute_shard(blocks, input_specs, output_blocks, output_specs, start, stop, now, actuarial):
+    births, genders, countries, lifespans = (
+        None if column is None else column[start:stop]
+        for column in _views(blocks, input_specs))
+    result = calculate_batch(births, genders, countries, lifespans, now=now, actuarial=actuarial)
+    for (name, _), out in zip(_RESULT_DTYPES, _views(output_blocks, output_specs)):
+        out[start:stop] = getattr(result, name)
+
+
+def _run_shard(input_specs, output_specs, start, stop, now, actuarial):
+    """Compute rows start:stop from the shared inputs into the shared outputs"""
+    blocks = _attach(input_specs)
+    output_blocks = _attach(output_specs)
+    try:
+        # Array views must be gone before the blocks can be closed
+        _compute_shard(blocks, input_specs, output_blocks, output_specs, start, stop, now, actuarial)
+    finally:
+        for block in blocks + output_blocks:
+            if block is not None:
+                block.close()
+    return stop - start
+
+
+class PendingBatch:
+    """A batch being computed by a BatchPool; result() waits for it"""
+
+    def __init__(self, futures=(), shared=(), outputs=(), result=None):
+        self._futures = list(futures)
+        self._shared = list(shared)
+        self._outputs = outputs
+        self._result = result
+
+    def result(self):
+        """Return the BatchResult, waiting for the workers and freeing the shared memory"""
+        if self._result is None:
+            try:
+                for future in self._futures:
+                    future.result()
+                self._result = BatchResult(*(shared.array.copy() for shared in self._outputs))
+            finally:
+                self.release()
+        return self._result
+
+    def release(self):
+        for shared in self._shared:
+            shared.release()
+        self._shared = []
+
+
+class BatchPool:
+    """A process pool for calculate_batch; use as a context manager
+
+    workers defaults to the number of available CPUs. The expectancy table
+    and loaded life table active when the pool is created are the ones the
+    workers use.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = max(int(workers or default_workers()), 1)
+        table = active_table()
+        values = np.frombuffer(table.values, dtype=np.float64)
+        self._table = _Shared.copy_of(values)
+        loaded = lifetable.loaded_life_table()
+        self._executor = ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self._table.spec, table.countries, loaded.path if loaded else None),
+        )
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._table.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def batch_rows(self):
+        """Smallest batch that gives every worker a shard"""
+        return self.workers * MIN_SHARD_ROWS
+
+    def shards(self, n):
+        """Return the (start, stop) row ranges for a batch of n rows"""
+        count = max(min(self.workers, n // MIN_SHARD_ROWS), 1)
+        bounds = np.linspace(0, n, count + 1).astype(np.int64)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def submit(self, birth_dates, genders, countries, lifespans=None, now=None, actuarial=False):
+        """Start calculate_batch on the pool and return its PendingBatch
+
+        Batches too small to shard are computed right away in this process.
+        """
+        now = now or datetime.now()
+        columns = [_column(birth_dates), _column(genders), _column(countries),
+                   None if lifespans is None else _column(lifespans)]
+        n = len(columns[0])
+        if any(column is not None and len(column) != n for column in columns):
+            raise ValueError("All input columns must have the same length")
+        shards = self.shards(n)
+        if len(shards) == 1:
+            return PendingBatch(result=calculate_batch(*columns, now=now, actuarial=actuarial))
+
+        inputs = [None if column is None else _Shared.copy_of(column) for column in columns]
+        outputs = [_Shared((n,), dtype) for _, dtype in _RESULT_DTYPES]
+        shared = [block for block in inputs + outputs if block is not None]
+        try:
+            input_specs = [None if block is None else block.spec for block in inputs]
+            output_specs = [block.spec for block in outputs]
+            futures = [self._executor.submit(_run_shard, input_specs, output_specs,
+                                             start, stop, now, actuarial)
+                       for start, stop in shards]
+        except BaseException:
+            PendingBatch(shared=shared).release()
+            raise
+        return PendingBatch(futures, shared, outputs)
+
+    def calculate(self, birth_dates, genders, countries, lifespans=None, now=None, actuarial=False):
+        """calculate_batch, spread over the pool; takes the same arguments"""
+        return self.submit(birth_dates, genders, countries, lifespans, now, actuarial).result()
+
+
+def calculate_batch_parallel(birth_dates, genders, countries, lifespans=None, now=None,
+                             actuarial=False, workers=None):
+    """calculate_batch on a one-off process pool of the given number of workers"""
+    with BatchPool(workers) as pool:
+        return pool.calculate(birth_dates, genders, countries, lifespans, now, actuarial)
@@ -0,0 +1,157 @@
+"""Opt-in profiling of the calculation and rendering stages
+
+Functions on the clock's main paths are decorated with ``stage(name)``:
+
+    parse        birth date parsing
+    expectancy   life expectancy lookups
+    death_date   death date computation (plain and actuarial)
+    statistics   statistics text generation
+    formatting   countdown formatting
+    widgets      Tk widget updates
+    tick         the whole per-second tick
+    batch        vectorized batch calculation
+
+Profiling is chosen when this module is first imported, from
+DEATHCLOCK_PROFILE, a comma-separated list of modes:
+
+    stages       count and time every stage ("1" means the same)
+    cprofile     run cProfile over the whole process
+    tracemalloc  trace memory allocations
+
+When it is unset, ``stage`` returns the function it decorates unchanged, so
+the hooks cost nothing. On exit a per-stage summary (plus the top cProfile
+and tracemalloc entries) is printed to stderr, or written to the file named by
+DEATHCLOCK_PROFILE_OUT; cProfile data is saved next to it as ``.prof``.
+
+    DEATHCLOCK_PROFILE=stages,cprofile python dethclock.py
+    python dethclock.py --profile=stages,tracemalloc
+"""
+import atexit
+import functools
+import os
+import sys
+import time
+
+ENV_VAR = "DEATHCLOCK_PROFILE"
+OUT_ENV_VAR = "DEATHCLOCK_PROFILE_OUT"
+MODES = ("stages", "cprofile", "tracemalloc")
+TOP_ENTRIES = 15
+
+
+def _modes(value):
+    modes = {mode.strip().lower() for mode in value.split(",") if mode.strip()}
+    if "1" in modes:
+        modes.discard("1")
+        modes.add("stages")
+    unknown = modes - set(MODES)
+    if unknown:
+        print(f"{ENV_VAR}: ignoring unknown modes {', '.join(sorted(unknown))}", file=sys.stderr)
+    return frozenset(modes & set(MODES))
+
+
+ACTIVE_MODES = _modes(os.environ.get(ENV_VAR, ""))
+ENABLED = "stages" in ACTIVE_MODES
+
+# name -> [calls, total ns, max ns]
+_stats = {}
+_started = time.perf_counter_ns()
+_profiler = None
+
+
+def stage(name):
+    """Decorator timing every call of the function as part of stage name
+
+    Stages nest: time spent in an inner stage also counts for the outer one.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        entry = _stats.setdefault(name, [0, 0, 0])
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                entry[0] += 1
+                entry[1] += elapsed
+                if elapsed > entry[2]:
+                    entry[2] = elapsed
+        return timed
+    return decorate
+
+
+def summary():
+    """{stage: {"calls", "total_ms", "mean_us", "max_us", "share"}} of the stages called so far
+
+    share is the stage's fraction of the wall time since profiling started.
+    """
+    wall = max(time.perf_counter_ns() - _started, 1)
+    return {
+        name: {
+            "calls": calls,
+            "total_ms": total / 1e6,
+            "mean_us": total / calls / 1e3,
+            "max_us": longest / 1e3,
+            "share": total / wall,
+        }
+        for name, (calls, total, longest) in sorted(_stats.items(), key=lambda item: -item[1][1])
+        if calls
+    }
+
+
+def format_summary(stats=None):
+    stats = summary() if stats is None else stats
+    lines = [f"{'stage':<12} {'calls':>10} {'total ms':>11} {'mean us':>10} {'max us':>10} {'share':>7}"]
+    for name, row in stats.items():
+        lines.append(f"{name:<12} {row['calls']:>10,} {row['total_ms']:>11.1f} "
+                     f"{row['mean_us']:>10.1f} {row['max_us']:>10.1f} {row['share']:>7.1%}")
+    return "\n".join(lines)
+
+
+def report(out):
+    """Write the summaries of every active mode to an open text file"""
+    if ENABLED:
+        out.write("Stage timings\n" + format_summary() + "\n")
+    if _profiler is not None:
+        import pstats
+
+        _profiler.disable()
+        out.write("\ncProfile, by cumulative time\n")
+        pstats.Stats(_profiler, stream=out).sort_stats("cumulative").print_stats(TOP_ENTRIES)
+    if "tracemalloc" in ACTIVE_MODES:
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            out.write(f"\ntracemalloc: {current / 1e6:.1f} MB current, {peak / 1e6:.1f} MB peak\n")
+            for stat in tracemalloc.take_snapshot().statistics("lineno")[:TOP_ENTRIES]:
+                out.write(f"{stat}\n")
+
+
+def _report_at_exit():
+    path = os.environ.get(OUT_ENV_VAR)
+    if _profiler is not None and path:
+        _profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            report(f)
+    else:
+        report(sys.stderr)
+
+
+if ACTIVE_MODES:
+    if "tracemalloc" in ACTIVE_MODES:
+        import tracemalloc
+
+        tracemalloc.start()
+    if "cprofile" in ACTIVE_MODES:
+        import cProfile
+
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(_report_at_exit)
+
@@ -0,0 +1,165 @@
+"""Server-Sent Events countdowns driven by one shared timer
+
+Every subscribed clock is a (death date, display format) pair. CountdownHub
+runs a single task that wakes on each wall-clock second, formats each
+distinct pair once, whatever the number of subscribers showing it, and
+writes the encoded event to every connection that shows it. Connections
+never get their own loop or timer. A connection that falls behind (its
+transport buffer over ``max_buffer``) just misses ticks; the next one
+carries the current value anyway.
+
+Events look like
+
+    event: countdown
+    data: {"clock":0,"countdown":"⏳ 50y 9m 21d 4h 11min 43s","seconds_remaining":1603339903,"expired":false}
+
+where clock is the index of the clock in the subscription and countdown is
+the GUI's countdown text.
+"""
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+
+from .timefmt import get_formatter
+
+EXPIRED_TEXT = "⚰️ YOUR TIME HAS EXPIRED! LIVE EVERY MOMENT! ⚰️"
+STREAM_HEADERS = (b"HTTP/1.1 200 OK\r\n"
+                  b"Content-Type: text/event-stream; charset=utf-8\r\n"
+                  b"Cache-Control: no-cache\r\n"
+                  b"Connection: keep-alive\r\n\r\n"
+                  b"retry: 1000\n\n")
+DEFAULT_MAX_BUFFER = 64 * 1024
+# Sleep a little past each boundary so an early wake-up cannot tick twice
+_BOUNDARY_SLACK = 0.002
+
+
+def countdown_payload(death_date, fmt, now):
+    """Return the shared tail of a countdown event for one (death date, format)"""
+    seconds_left = max(int((death_date - now).total_seconds()), 0)
+    if seconds_left:
+        text = f"⏳ {get_formatter(fmt)(seconds_left, now)}"
+    else:
+        text = EXPIRED_TEXT
+    tail = json.dumps({"countdown": text, "seconds_remaining": seconds_left,
+                       "expired": not seconds_left}, ensure_ascii=False, separators=(",", ":"))
+    # Drop the opening brace: each subscription prefixes its own clock index
+    return tail[1:].encode() + b"\n\n"
+
+
+class _Subscription:
+    __slots__ = ("writer", "clocks", "pending")
+
+    def __init__(self, writer, clocks):
+        self.writer = writer
+        # (event prefix, (death date, format)) per clock
+        self.clocks = [(f'event: countdown\ndata: {{"clock":{i},'.encode(), key)
+                       for i, key in enumerate(clocks)]
+        self.pending = []
+
+
+class CountdownHub:
+    """Pushes countdown events for all subscribers from one timer task
+
+    interval is the tick period in seconds; ticks fall on whole multiples
+    of it in wall-clock time.
+    """
+
+    def __init__(self, interval=1.0, max_buffer=DEFAULT_MAX_BUFFER):
+        self.interval = interval
+        self.max_buffer = max_buffer
+        # (death date, format) -> (subscription, event prefix) per clock showing it
+        self.groups = {}
+        self.subscriptions = {}
+        self.ticks = self.rendered = self.skipped = 0
+        self._task = None
+
+    def subscribe(self, writer, clocks, now=None):
+        """Start pushing to writer; clocks is a list of (death date, format name)
+
+        The first event for every clock is written right away. The events are
+        built before anything is registered, so a clock that cannot be shown
+        raises here and leaves the hub untouched.
+        """
+        for _, fmt in clocks:
+            get_formatter(fmt)
+        subscription = _Subscription(writer, clocks)
+        now = now or datetime.now()
+        first = [prefix + countdown_payload(death, fmt, now)
+                 for prefix, (death, fmt) in subscription.clocks]
+
+        self.subscriptions[writer] = subscription
+        for prefix, key in subscription.clocks:
+            self.groups.setdefault(key, []).append((subscription, prefix))
+        writer.write(STREAM_HEADERS)
+        writer.writelines(first)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    def unsubscribe(self, writer):
+        subscription = self.subscriptions.pop(writer, None)
+        if subscription is None:
+            return
+        for _, key in subscription.clocks:
+            group = self.groups.get(key)
+            if group is None:
+                continue
+            group[:] = [entry for entry in group if entry[0] is not subscription]
+            if not group:
+                del self.groups[key]
+
+    def _drop(self, writer, error):
+        """Unsubscribe and close a connection its clock or transport failed on"""
+        print(f"Countdown stream dropped: {error!r}", file=sys.stderr)
+        self.unsubscribe(writer)
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+    def tick(self, now=None):
+        """Format every distinct clock once and write the events out
+
+        A clock that fails to format drops only its own subscribers, and a
+        connection that fails to write only itself.
+        """
+        now = now or datetime.now()
+        self.ticks += 1
+        for (death, fmt), group in list(self.groups.items()):
+            try:
+                payload = countdown_payload(death, fmt, now)
+            except Exception as e:
+                for subscription, _ in list(group):
+                    self._drop(subscription.writer, e)
+                continue
+            self.rendered += 1
+            for subscription, prefix in group:
+                subscription.pending.append(prefix + payload)
+
+        for writer, subscription in list(self.subscriptions.items()):
+            try:
+                transport = writer.transport
+                if transport.is_closing():
+                    self.unsubscribe(writer)
+                elif transport.get_write_buffer_size() > self.max_buffer:
+                    self.skipped += 1
+                else:
+                    writer.writelines(subscription.pending)
+            except Exception as e:
+                self._drop(writer, e)
+            subscription.pending.clear()
+
+    async def run(self):
+        """Tick on every interval boundary while anyone is subscribed"""
+        while self.subscriptions:
+            await asyncio.sleep(self.interval - time.time() % self.interval + _BOUNDARY_SLACK)
+            try:
+                self.tick()
+            except Exception as e:
+                # Keep the shared timer alive for everyone else
+                print(f"Countdown tick failed: {e!r}", file=sys.stderr)
+
+    def info(self):
+        return {"subscribers": len(self.subscriptions), "distinct_clocks": len(self.groups),
+                "ticks": self.ticks, "rendered": self.rendered, "skipped": self.skipped}
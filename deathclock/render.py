@@ -0,0 +1,59 @@
+"""Dirty-checking widget updates
+
+Most of the clock's labels change once a day or never, yet the tick loop used
+to push every label's text and colour to Tk each second. WidgetRenderer keeps
+the last options applied to each widget and only calls ``config`` with the
+options whose value actually changed.
+"""
+from .profiling import stage
+
+# (maximum days left, countdown colour), checked in order
+URGENCY_BANDS = (
+    (7, '#ff0000'),    # Less than a week - bright red alert
+    (30, '#ff8800'),   # Less than a month - orange warning
+    (365, '#f1c40f'),  # Less than a year - yellow caution
+)
+NORMAL_COLOR = '#3498db'
+
+_MISSING = object()
+
+
+def urgency_color(days_left):
+    """Return the countdown colour for the number of whole days left"""
+    for max_days, color in URGENCY_BANDS:
+        if days_left <= max_days:
+            return color
+    return NORMAL_COLOR
+
+
+class WidgetRenderer:
+    """Apply widget options, skipping Tk calls for values already shown"""
+
+    def __init__(self):
+        self._state = {}
+        self.applied = 0
+        self.skipped = 0
+
+    @stage("widgets")
+    def set(self, widget, **options):
+        """Configure widget with the options that differ from the last render
+
+        Returns True if Tk was called.
+        """
+        state = self._state.setdefault(widget, {})
+        changed = {key: value for key, value in options.items()
+                   if state.get(key, _MISSING) != value}
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.config(**changed)
+        state.update(changed)
+        self.applied += 1
+        return True
+
+    def forget(self, widget=None):
+        """Drop cached state, e.g. after configuring a widget directly"""
+        if widget is None:
+            self._state.clear()
+        else:
+            self._state.pop(widget, None)
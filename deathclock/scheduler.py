@@ -0,0 +1,95 @@
+"""Once-per-second tick scheduling on a Tk-style event loop
+
+TickScheduler keeps exactly one ``after`` callback outstanding. Each tick is
+aimed just past the next wall-clock second boundary, so the displayed second
+changes together with the system clock instead of drifting by the time the
+previous tick took. When the loop falls behind (slow X server, busy machine)
+the missed boundaries are counted and skipped rather than queued.
+
+Only ``after`` and ``after_cancel`` are used, so any Tk widget (or an object
+offering the same two methods) can drive it; tkinter itself is not imported.
+Pass a deathclock.tickstats.TickMonitor as ``monitor`` to time every tick.
+"""
+import math
+import time
+
+# Aim slightly past the boundary so a timer firing a millisecond early still
+# lands in the new second
+_BOUNDARY_SLACK_MS = 2
+
+
+class TickScheduler:
+    """Call ``callback(timestamp)`` on every wall-clock interval boundary"""
+
+    def __init__(self, widget, callback, interval=1.0, clock=time.time, monitor=None,
+                 timer=time.perf_counter):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self.clock = clock
+        # Optional deathclock.tickstats.TickMonitor; timer measures its durations
+        self.monitor = monitor
+        self.timer = timer
+        self.skipped = 0
+        self._active = False
+        self._after_id = None
+        self._due = None
+        self._requested = None
+
+    @property
+    def running(self):
+        return self._active
+
+    def start(self, immediate=True):
+        """Start ticking; with immediate=True the first tick runs right away"""
+        if self._active:
+            return
+        self._active = True
+        if immediate:
+            self._due = self.clock()
+            self._schedule(0)
+        else:
+            self._due = None
+            self._schedule_next()
+
+    def stop(self):
+        """Cancel the pending tick"""
+        self._active = False
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self, delay_ms):
+        # When the callback should run by the timer, to measure Tk's queue latency
+        self._requested = self.timer() + delay_ms / 1000
+        self._after_id = self.widget.after(delay_ms, self._on_tick)
+
+    def _schedule_next(self):
+        now = self.clock()
+        delay = self.interval - (now % self.interval)
+        due = now + delay
+        if self._due is not None:
+            # Boundaries passed since the last tick (a late tick or a slow
+            # callback) are dropped, not replayed
+            self.skipped += max(round((due - self._due) / self.interval) - 1, 0)
+        self._due = due
+        self._schedule(math.ceil(delay * 1000) + _BOUNDARY_SLACK_MS)
+
+    def _on_tick(self):
+        started = self.timer()
+        self._after_id = None
+        if not self._active:
+            return
+        now = self.clock()
+        late = now - self._due
+        latency = started - self._requested
+        skipped = self.skipped
+        try:
+            self.callback(now)
+        finally:
+            # The callback may have stopped (or restarted) the scheduler
+            if self._active and self._after_id is None:
+                self._schedule_next()
+            if self.monitor is not None:
+                self.monitor.record(now, self.timer() - started, latency, late,
+                                    self.skipped - skipped)
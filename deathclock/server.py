@@ -0,0 +1,454 @@
+"""Asynchronous HTTP/JSON death clock service, standard library only
+
+Takes the GUI form's inputs and returns the death date, the remaining time
+broken down into calendar units, the countdown in a display format and the
+statistics metrics:
+
+    python -m deathclock.server --port 8080
+    curl 'localhost:8080/death-date?birth_date=01/01/1990&gender=Female&country=Japan'
+    curl -d '[{"birth_date": "01/01/1990"}, {"birth_date": "1985-06-30", "lifespan": 90}]' \\
+        localhost:8080/death-date
+
+Endpoints:
+
+    GET  /death-date?birth_date=...   one query from the URL parameters
+    POST /death-date                  a JSON query object, or an array of them
+    GET  /countdown?birth_date=...    Server-Sent Events: the countdown once a second
+    POST /countdown                   the same for a JSON array of queries in one stream
+    GET  /countries, /formats, /metrics, /health, /stats
+
+Query fields are birth_date (DD/MM/YYYY or ISO), gender ("Male"), country,
+lifespan (custom years), format (a timefmt name), actuarial (bool) and
+metrics (names, default all). A batch answers every item in order; items
+that fail hold {"error": ...} instead of failing the whole request.
+
+Connections are HTTP/1.1 keep-alive (pipelining works). Death dates do not
+depend on the current time, so they are cached per (country, gender,
+lifespan, birth date) and a repeated lookup only redoes the per-second part:
+remaining time, countdown and metrics. Countdown streams are pushed by one
+shared deathclock.push.CountdownHub timer rather than a loop per client.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from . import metrics
+from .core import (
+    DATE_FORMAT,
+    DISPLAY_DATETIME_FORMAT,
+    estimate_death_date,
+    life_progress,
+    parse_birth_date,
+)
+from .dates import DateParseError
+from .expectancy import DEFAULT_COUNTRY, get_country_list
+from .lifetable import load_configured
+from .push import CountdownHub
+from .timefmt import DEFAULT_FORMAT, FORMATTERS, decompose, get_formatter
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_SIZE = 65_536
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH = 10_000
+KEEP_ALIVE_TIMEOUT = 30.0
+GENDERS = ("Male", "Female")
+DECOMPOSITION_FIELDS = ("years", "months", "days", "hours", "minutes", "seconds")
+INTERNAL_ERROR = "Internal error while answering the query"
+
+
+class QueryError(ValueError):
+    """A query that cannot be answered; extra holds fields for the error body"""
+
+    def __init__(self, message, **extra):
+        super().__init__(message)
+        self.extra = extra
+
+    def body(self):
+        return {"error": str(self), **self.extra}
+
+
+def _log_error(context, error):
+    """Report an unexpected exception on stderr; the client only gets INTERNAL_ERROR"""
+    print(f"Error in {context}: {error!r}", file=sys.stderr)
+
+
+class EstimateCache:
+    """LRU cache of (birth date, death date, lifespan years, death date text)
+
+    Only successful computations are stored: when compute raises, nothing is.
+    """
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key, compute):
+        entries = self.entries
+        try:
+            value = entries[key]
+        except KeyError:
+            self.misses += 1
+            value = entries[key] = compute()
+            if len(entries) > self.size:
+                entries.popitem(last=False)
+            return value
+        self.hits += 1
+        entries.move_to_end(key)
+        return value
+
+    def info(self):
+        return {"size": len(self.entries), "max_size": self.size,
+                "hits": self.hits, "misses": self.misses}
+
+
+def _text(query, name, default=None):
+    value = query.get(name, default)
+    if value is None or value == "":
+        return default
+    if not isinstance(value, str):
+        raise QueryError(f"{name} must be a string")
+    return value.strip()
+
+
+def _lifespan(query):
+    value = query.get("lifespan")
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise QueryError("lifespan must be a number") from None
+
+
+def _flag(query, name):
+    value = query.get(name, False)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _metric_names(query):
+    names = query.get("metrics")
+    if names is None or names == "":
+        return tuple(metrics.METRICS)
+    if isinstance(names, str):
+        names = [name for name in names.split(",") if name]
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise QueryError("metrics must be a list of names")
+    unknown = sorted(set(names) - set(metrics.METRICS))
+    if unknown:
+        raise QueryError(f"Unknown metrics: {', '.join(unknown)}")
+    return tuple(names)
+
+
+class DeathClockService:
+    """Answers death-date queries; independent of the HTTP layer"""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache = EstimateCache(cache_size)
+
+    def estimate(self, birth_date, gender, country, lifespan, actuarial, now):
+        """Return the cached (birth date, death date, lifespan, death date text)
+
+        Actuarial estimates depend on the age reached, so they are keyed by day too.
+        """
+        key = (country, gender, lifespan, birth_date, now.date() if actuarial else None)
+
+        def compute():
+            try:
+                birth, death, years = self._compute(birth_date, gender, country, lifespan,
+                                                    actuarial, now)
+            except DateParseError as e:
+                raise QueryError(f"Invalid birth date: {e.reason}", position=e.position) from None
+            except OverflowError:
+                raise QueryError("Death date is out of range") from None
+            except ValueError as e:
+                raise QueryError(str(e)) from None
+            return birth, death, years, death.strftime(DISPLAY_DATETIME_FORMAT)
+
+        return self.cache.get(key, compute)
+
+    @staticmethod
+    def _compute(birth_date, gender, country, lifespan, actuarial, now):
+        birth = parse_birth_date(birth_date)
+        death, years = estimate_death_date(birth, country, gender, lifespan, actuarial, now)
+        return birth, death, years
+
+    def resolve(self, query, now):
+        """Validate a query dict and look up its estimate
+
+        Returns (gender, country, format name, (birth date, death date,
+        lifespan, death date text)); raises QueryError.
+        """
+        if not isinstance(query, dict):
+            raise QueryError("Expected a JSON object")
+        birth_date = _text(query, "birth_date")
+        if not birth_date:
+            raise QueryError("birth_date is required")
+        gender = _text(query, "gender", "Male").capitalize()
+        if gender not in GENDERS:
+            raise QueryError("gender must be Male or Female")
+        country = _text(query, "country", DEFAULT_COUNTRY)
+        fmt = _text(query, "format", DEFAULT_FORMAT)
+        try:
+            get_formatter(fmt)
+        except ValueError as e:
+            raise QueryError(str(e)) from None
+        estimate = self.estimate(birth_date, gender, country, _lifespan(query),
+                                 _flag(query, "actuarial"), now)
+        return gender, country, fmt, estimate
+
+    def answer(self, query, now=None):
+        """Answer one query dict; raises QueryError"""
+        now = now or datetime.now()
+        gender, country, fmt, (birth, death, years, death_text) = self.resolve(query, now)
+        names = _metric_names(query)
+        seconds_left = max(int((death - now).total_seconds()), 0)
+        progress = life_progress(birth, years, now)
+        values = metrics.evaluate(seconds_left, names)
+        return {
+            "birth_date": birth.strftime(DATE_FORMAT),
+            "gender": gender,
+            "country": country,
+            "lifespan_years": round(years, 3),
+            "death_date": death_text,
+            "seconds_remaining": seconds_left,
+            "expired": seconds_left == 0,
+            "progress_percentage": round(progress[0], 3) if progress else None,
+            "format": fmt,
+            "countdown": FORMATTERS[fmt](seconds_left, now),
+            "remaining": dict(zip(DECOMPOSITION_FIELDS, decompose(seconds_left, now))),
+            "statistics": {name: int(value) for name, value in values.items()},
+        }
+
+    def answer_batch(self, queries, now=None):
+        """Answer a list of queries at one shared "now"; failed items hold an error"""
+        if len(queries) > MAX_BATCH:
+            raise QueryError(f"At most {MAX_BATCH} queries per batch")
+        now = now or datetime.now()
+        results = []
+        for query in queries:
+            try:
+                results.append(self.answer(query, now))
+            except QueryError as e:
+                results.append(e.body())
+            except Exception as e:
+                _log_error("batch query", e)
+                results.append({"error": INTERNAL_ERROR})
+        return results
+
+    def clocks(self, queries, now=None):
+        """Return the (death date, format name) shown for each query"""
+        if len(queries) > MAX_BATCH:
+            raise QueryError(f"At most {MAX_BATCH} clocks per stream")
+        now = now or datetime.now()
+        clocks = []
+        for i, query in enumerate(queries):
+            try:
+                _, _, fmt, estimate = self.resolve(query, now)
+            except QueryError as e:
+                raise QueryError(str(e), clock=i, **e.extra) from None
+            clocks.append((estimate[1], fmt))
+        return clocks
+
+
+class EventStream:
+    """Handler result: answer with a countdown event stream of these clocks"""
+
+    __slots__ = ("clocks",)
+
+    def __init__(self, clocks):
+        self.clocks = clocks
+
+
+def _json_body(body):
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise QueryError(f"Invalid JSON: {e}") from None
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+class DeathClockServer:
+    """HTTP/1.1 front end of a DeathClockService on asyncio streams"""
+
+    def __init__(self, service=None, hub=None):
+        self.service = service or DeathClockService()
+        self.hub = hub or CountdownHub()
+        self.requests = 0
+        self.connections = 0
+        self.routes = {
+            ("GET", "/death-date"): self._get_death_date,
+            ("POST", "/death-date"): self._post_death_date,
+            ("GET", "/countdown"): self._get_countdown,
+            ("POST", "/countdown"): self._post_countdown,
+            ("GET", "/countries"): lambda query, body: get_country_list(),
+            ("GET", "/formats"): lambda query, body: sorted(FORMATTERS),
+            ("GET", "/metrics"): lambda query, body: {
+                name: metric.label for name, metric in metrics.METRICS.items()},
+            ("GET", "/health"): lambda query, body: {"status": "ok"},
+            ("GET", "/stats"): self._stats,
+        }
+
+    def _get_death_date(self, query, body):
+        return self.service.answer(query)
+
+    def _post_death_date(self, query, body):
+        payload = _json_body(body)
+        if isinstance(payload, list):
+            return self.service.answer_batch(payload)
+        return self.service.answer(payload)
+
+    def _get_countdown(self, query, body):
+        return EventStream(self.service.clocks([query]))
+
+    def _post_countdown(self, query, body):
+        payload = _json_body(body)
+        return EventStream(self.service.clocks(payload if isinstance(payload, list) else [payload]))
+
+    def _stats(self, query, body):
+        return {"requests": self.requests, "connections": self.connections,
+                "cache": self.service.cache.info(), "countdown": self.hub.info()}
+
+    async def _stream(self, reader, writer, clocks):
+        """Hand the connection to the hub until the client goes away"""
+        try:
+            self.hub.subscribe(writer, clocks)
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        except Exception as e:
+            _log_error("countdown stream", e)
+            if writer not in self.hub.subscriptions:
+                # Nothing was sent yet
+                writer.write(_response(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                       {"error": INTERNAL_ERROR}, False))
+        finally:
+            self.hub.unsubscribe(writer)
+
+    def dispatch(self, method, target, body=b""):
+        """Route one request; returns (HTTPStatus, JSON-ready payload)"""
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"}
+            return HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {path}"}
+        try:
+            return HTTPStatus.OK, handler(dict(parse_qsl(url.query)), body)
+        except QueryError as e:
+            return HTTPStatus.BAD_REQUEST, e.body()
+        except Exception as e:
+            _log_error(f"{method} {path}", e)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": INTERNAL_ERROR}
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it closes or idles out"""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                           {"error": "Headers too large"}, False))
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    writer.write(_response(HTTPStatus.BAD_REQUEST,
+                                           {"error": "Malformed request line"}, False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    writer.write(_response(HTTPStatus.LENGTH_REQUIRED,
+                                           {"error": "Send a Content-Length"}, False))
+                    break
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    writer.write(_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                           {"error": f"Body must be at most {MAX_BODY_BYTES} bytes"},
+                                           False))
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                self.requests += 1
+                status, payload = self.dispatch(method, target, body)
+                if isinstance(payload, EventStream):
+                    await self._stream(reader, writer, payload.clocks)
+                    break
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Serve until cancelled; ready, if given, is called with the bound server"""
+        server = await asyncio.start_server(self.handle, host, port, limit=64 * 1024)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m deathclock.server",
+                                     description="Serve death clock estimates over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="death dates kept in the response cache")
+    args = parser.parse_args(argv)
+    load_configured(lambda message: print(message, file=sys.stderr))
+    server = DeathClockServer(DeathClockService(args.cache_size))
+
+    def ready(bound):
+        for sock in bound.sockets:
+            host, port = sock.getsockname()[:2]
+            print(f"Serving on http://{host}:{port}", file=sys.stderr)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Persistent profiles and the last session of the clock
+
+Every profile the GUI calculates is saved in a small SQLite database, keyed on
+its inputs (birth date as typed, gender, country, custom lifespan, actuarial
+mode), together with the display format and the results: the death date, the
+lifespan used and the texts that only depend on the inputs (death date string,
+demographic comparison, status line). On startup the most recently used
+profile is read back and painted straight from these values, so the first
+frame needs no parsing, expectancy lookup or death date calculation.
+
+Saved results are only trusted while the expectancy table they came from is
+still active (see ``table_fingerprint``); after the life table changes the
+GUI recalculates from the saved inputs instead.
+
+The database is ``~/.deathclock/sessions.sqlite3``; set DEATHCLOCK_SESSION_DB
+to use another file, or to an empty string to disable the store.
+"""
+import os
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+
+from .expectancy import active_table
+
+ENV_VAR = "DEATHCLOCK_SESSION_DB"
+DEFAULT_PATH = os.path.join("~", ".deathclock", "sessions.sqlite3")
+
+# Inputs identifying a profile, then everything restored with it
+KEY_FIELDS = ("birth_date", "gender", "country", "lifespan", "actuarial")
+FIELDS = KEY_FIELDS + ("display_format", "birth", "death_date", "lifespan_years",
+                       "death_date_text", "demographic_text", "status_text", "table_key")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    birth_date TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    country TEXT NOT NULL,
+    lifespan TEXT NOT NULL,
+    actuarial INTEGER NOT NULL,
+    display_format TEXT NOT NULL,
+    birth TEXT NOT NULL,
+    death_date TEXT NOT NULL,
+    lifespan_years REAL NOT NULL,
+    death_date_text TEXT NOT NULL,
+    demographic_text TEXT NOT NULL,
+    status_text TEXT NOT NULL,
+    table_key TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (birth_date, gender, country, lifespan, actuarial)
+);
+CREATE INDEX IF NOT EXISTS profiles_last_used ON profiles (last_used);
+"""
+
+
+def table_fingerprint(table=None):
+    """Short checksum of an expectancy table's countries and values"""
+    table = table or active_table()
+    checksum = zlib.crc32("\n".join(table.countries).encode("utf-8"))
+    checksum = zlib.crc32(table.values.cast("B"), checksum)
+    return f"{len(table.countries)}:{checksum:08x}"
+
+
+class Session:
+    """One saved profile: the form inputs plus the precomputed results
+
+    birth and death_date are datetimes; lifespan is the custom lifespan as
+    typed ("" when the demographic expectancy was used).
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, birth_date, gender, country, lifespan, actuarial, display_format,
+                 birth, death_date, lifespan_years, death_date_text, demographic_text,
+                 status_text, table_key=None):
+        self.birth_date = birth_date
+        self.gender = gender
+        self.country = country
+        self.lifespan = lifespan
+        self.actuarial = bool(actuarial)
+        self.display_format = display_format
+        self.birth = birth
+        self.death_date = death_date
+        self.lifespan_years = lifespan_years
+        self.death_date_text = death_date_text
+        self.demographic_text = demographic_text
+        self.status_text = status_text
+        self.table_key = table_key or table_fingerprint()
+
+    @property
+    def current(self):
+        """True when the results came from the expectancy table active now"""
+        return self.table_key == table_fingerprint()
+
+    def _row(self):
+        row = [getattr(self, name) for name in FIELDS]
+        row[FIELDS.index("actuarial")] = int(self.actuarial)
+        row[FIELDS.index("birth")] = self.birth.isoformat()
+        row[FIELDS.index("death_date")] = self.death_date.isoformat()
+        return row
+
+    @classmethod
+    def _from_row(cls, row):
+        values = dict(zip(FIELDS, row))
+        values["birth"] = datetime.fromisoformat(values["birth"])
+        values["death_date"] = datetime.fromisoformat(values["death_date"])
+        return cls(**values)
+
+
+class SessionStore:
+    """SQLite-backed profiles, most recently used first"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    @classmethod
+    def from_environment(cls):
+        """The store named by $DEATHCLOCK_SESSION_DB (or the default), None if disabled
+
+        A database that cannot be opened also gives None, so the clock still
+        starts without it.
+        """
+        path = os.environ.get(ENV_VAR)
+        if path == "":
+            return None
+        path = os.path.expanduser(path or DEFAULT_PATH)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            return cls(path)
+        except (OSError, sqlite3.Error):
+            return None
+
+    def save(self, session):
+        """Insert or replace a profile and mark it as the last used"""
+        columns = ", ".join(FIELDS + ("last_used",))
+        placeholders = ", ".join("?" * (len(FIELDS) + 1))
+        with self.connection:
+            self.connection.execute(f"INSERT OR REPLACE INTO profiles ({columns}) VALUES ({placeholders})",
+                                    session._row() + [time.time()])
+
+    def set_display_format(self, session, display_format):
+        """Remember a new display format for a saved profile"""
+        session.display_format = display_format
+        where = " AND ".join(f"{name} = ?" for name in KEY_FIELDS)
+        with self.connection:
+            self.connection.execute(f"UPDATE profiles SET display_format = ? WHERE {where}",
+                                    [display_format] + session._row()[:len(KEY_FIELDS)])
+
+    def last(self):
+        """The most recently used profile, or None"""
+        profiles = self.profiles(1)
+        return profiles[0] if profiles else None
+
+    def profiles(self, limit=None):
+        """Saved profiles, most recently used first"""
+        query = f"SELECT {', '.join(FIELDS)} FROM profiles ORDER BY last_used DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return [Session._from_row(row) for row in self.connection.execute(query)]
+
+    def clear(self):
+        """Forget every profile"""
+        with self.connection:
+            self.connection.execute("DELETE FROM profiles")
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,117 @@
+"""Monte Carlo distribution of death dates
+
+Lifetimes are sampled by inverting the survival curve of a demographic,
+conditioned on the age already reached, so the spread around the point
+estimate comes straight from the life table. Samples are drawn in fixed-size
+blocks, each with its own child of the seed, so a seeded run gives identical
+results whatever the number of worker processes. Requires NumPy.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .actuarial import survival_curve
+from .core import DAYS_PER_YEAR, SECONDS_PER_YEAR
+
+DEFAULT_SAMPLES = 100_000
+BLOCK_SIZE = 1 << 16
+PERCENTILES = (10, 50, 90)
+
+
+def sample_remaining_years(survivors, age_years, count, rng):
+    """Draw remaining lifetimes (years) for someone alive at age_years
+
+    survivors is l(x) at whole ages, ending in 0. Deaths are uniform within
+    each year of age, so l is linear between whole ages and inverts exactly.
+    """
+    survivors = np.asarray(survivors, dtype=np.float64)
+    x = min(int(age_years), len(survivors) - 2)
+    alive = survivors[x] - (age_years - x) * (survivors[x] - survivors[x + 1])
+    if alive <= 0:
+        return np.zeros(count)
+    target = (1.0 - rng.random(count)) * alive
+    # Last whole age still reaching the target survival level
+    death_x = np.searchsorted(-survivors, -target, side="right") - 1
+    death_age = death_x + (survivors[death_x] - target) / (survivors[death_x] - survivors[death_x + 1])
+    return np.maximum(death_age - age_years, 0.0)
+
+
+def _sample_blocks(survivors, age_years, counts, seeds):
+    return np.concatenate([
+        sample_remaining_years(survivors, age_years, count, np.random.default_rng(seed))
+        for count, seed in zip(counts, seeds)
+    ])
+
+
+def simulate_remaining_years(survivors, age_years, samples=DEFAULT_SAMPLES, seed=None, workers=1):
+    """Sample remaining lifetimes, optionally across a process pool"""
+    counts = [BLOCK_SIZE] * (samples // BLOCK_SIZE)
+    if samples % BLOCK_SIZE:
+        counts.append(samples % BLOCK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    survivors = np.asarray(survivors, dtype=np.float64)
+    if workers <= 1 or len(counts) < 2:
+        return _sample_blocks(survivors, age_years, counts, seeds)
+
+    workers = min(workers, len(counts))
+    shards = [slice(i, len(counts), workers) for i in range(workers)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_sample_blocks, survivors, age_years, counts[shard], seeds[shard])
+                   for shard in shards]
+        parts = [future.result() for future in futures]
+    # Undo the round-robin sharding so block order matches the serial run
+    blocks = [None] * len(counts)
+    for shard, part in zip(shards, parts):
+        offsets = np.cumsum([0] + counts[shard])
+        for i, block in enumerate(range(len(counts))[shard]):
+            blocks[block] = part[offsets[i]:offsets[i + 1]]
+    return np.concatenate(blocks)
+
+
+class SimulationResult:
+    """Sampled death dates with percentile and histogram summaries"""
+
+    def __init__(self, now, remaining_years):
+        self.now = now
+        self.remaining_years = remaining_years
+
+    def __len__(self):
+        return len(self.remaining_years)
+
+    def percentile_years(self, percentiles=PERCENTILES):
+        """Return remaining years at the given percentiles"""
+        return np.percentile(self.remaining_years, percentiles)
+
+    def percentile_dates(self, percentiles=PERCENTILES):
+        """Return death dates at the given percentiles"""
+        return [self.now + timedelta(days=float(years) * DAYS_PER_YEAR)
+                for years in self.percentile_years(percentiles)]
+
+    def histogram(self, bins=10):
+        """Return (counts, bin edges as calendar years) of the death year"""
+        death_years = (self.now.year + (self.now.timetuple().tm_yday - 1) / DAYS_PER_YEAR
+                       + self.remaining_years)
+        return np.histogram(death_years, bins=bins)
+
+
+def simulate_death_dates(birth_date, country, gender, lifespan_years=None, samples=DEFAULT_SAMPLES,
+                         seed=None, workers=1, now=None):
+    """Sample death dates for one person from their demographic's survival curve"""
+    now = now or datetime.now()
+    age_years = max((now - birth_date).total_seconds() / SECONDS_PER_YEAR, 0.0)
+    curve = survival_curve(country, gender, lifespan_years)
+    remaining = simulate_remaining_years(curve.survivors, age_years, samples, seed, workers)
+    if birth_date > now:
+        remaining = remaining + (birth_date - now).total_seconds() / SECONDS_PER_YEAR
+    return SimulationResult(now, remaining)
+
+
+def format_histogram(counts, edges, width=30):
+    """Render a histogram as text bars, one line per bin"""
+    peak = max(int(counts.max()), 1)
+    lines = []
+    for count, start, end in zip(counts, edges[:-1], edges[1:]):
+        bar = "█" * int(round(count / peak * width))
+        lines.append(f"{int(start):>4}-{int(end):<4} {bar} {count / counts.sum():.1%}")
+    return "\n".join(lines)
@@ -0,0 +1,405 @@
+"""Streaming bulk processing of CSV and JSONL files
+
+Rows are read in chunks of ``chunk_size``, each chunk goes through
+``calculate_batch`` in one vectorized pass and its results are written out
+before the next chunk is read, so memory use is bounded by the chunk size no
+matter how large the file is. Rows that cannot be read or computed are written
+to a reject file as JSON lines ({"line", "error", "row"}) instead of aborting
+the run. Requires NumPy.
+
+    python -m deathclock.stream members.csv results.csv --reject rejects.jsonl --metrics meals
+
+Output named ``*.dcol`` is a columnar file (see deathclock.columnar) instead of
+text, with the fixed-width columns in COLUMNAR_SCHEMA plus one int64 column
+per metric. Birth and death dates are int64 epoch seconds, gender is an int8
+code and country an int16 code; their names are listed in the file's
+meta["labels"]. A life table with more than 32,767 countries makes the
+writer raise ColumnarError rather than wrap the codes. ``line`` holds each
+row's input line number.
+Downstream tools map the file and slice it without parsing:
+
+    from deathclock.columnar import open_columns
+    results = open_columns("results.dcol")
+    results["seconds_remaining"][:10], results.datetimes("death_date"), results.labels("country")
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from . import columnar, metrics
+from .batch import ERROR_MESSAGES, GENDERS, calculate_batch, encode_countries
+from .core import SECONDS_PER_YEAR
+from .expectancy import active_table
+
+DEFAULT_CHUNK_SIZE = 100_000
+# Input columns used by the calculation
+BIRTH_DATE, GENDER, COUNTRY, LIFESPAN = "birth_date", "gender", "country", "lifespan"
+OUTPUT_FIELDS = ("death_date", "lifespan_years", "seconds_remaining", "progress_percentage")
+JSONL_SUFFIXES = (".jsonl", ".ndjson", ".json")
+COLUMNAR = "columnar"
+# Columns of columnar output, before the metrics
+COLUMNAR_SCHEMA = (
+    ("line", "<i8"),
+    ("birth_date", "<i8"),
+    ("gender", "<i1"),
+    ("country", "<i2"),
+    ("death_date", "<i8"),
+    ("lifespan_years", "<f4"),
+    ("seconds_remaining", "<i8"),
+    ("progress_percentage", "<f4"),
+)
+
+
+def detect_format(path):
+    """Return "jsonl", "columnar" or "csv" from a file name"""
+    path = path.lower()
+    if path.endswith(columnar.SUFFIX):
+        return COLUMNAR
+    return "jsonl" if path.endswith(JSONL_SUFFIXES) else "csv"
+
+
+class StreamStats:
+    """Row counts and throughput of a streaming run"""
+
+    __slots__ = ("rows", "written", "rejected", "chunks", "started", "elapsed")
+
+    def __init__(self):
+        self.rows = self.written = self.rejected = self.chunks = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def tick(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.rows:,} rows ({self.written:,} written, {self.rejected:,} rejected) "
+                f"in {self.elapsed:.1f}s, {self.rows_per_second:,.0f} rows/s")
+
+
+def reject_writer(reject, stats):
+    """Return write_reject(line, error, row), counting rejected rows in stats
+
+    Rows are written to the open text file reject (if not None) as JSON lines.
+    """
+    def write_reject(line, error, row):
+        stats.rows += 1
+        stats.rejected += 1
+        if reject is not None:
+            reject.write(json.dumps({"line": line, "error": error, "row": row},
+                                    ensure_ascii=False, default=str))
+            reject.write("\n")
+    return write_reject
+
+
+def _csv_records(f):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    for row in reader:
+        line = reader.line_num
+        if not row:
+            continue
+        if len(row) != len(header):
+            yield line, row, f"Expected {len(header)} fields, got {len(row)}"
+        else:
+            yield line, dict(zip(header, row)), None
+
+
+def _jsonl_records(f):
+    for line, text in enumerate(f, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            yield line, text.rstrip("\n"), f"Invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield line, record, None
+        else:
+            yield line, record, "Expected a JSON object"
+
+
+def read_records(f, fmt):
+    """Yield (line number, record, error) for every row of an open file
+
+    record is a dict when error is None, otherwise the raw row.
+    """
+    return _jsonl_records(f) if fmt == "jsonl" else _csv_records(f)
+
+
+def read_chunks(records, chunk_size, reject):
+    """Group valid records into lists of (line, record); pass malformed ones to reject"""
+    chunk = []
+    for line, record, error in records:
+        if error is not None:
+            reject(line, error, record)
+            continue
+        if BIRTH_DATE not in record:
+            reject(line, f"Missing column {BIRTH_DATE!r}", record)
+            continue
+        chunk.append((line, record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def column(records, name, default=""):
+    """One field of a list of (line, record) as strings, with default where it is missing"""
+    values = [record.get(name, default) for _, record in records]
+    return ["" if value is None else str(value) for value in values]
+
+
+def calculate_chunk(chunk, now, actuarial=False, calculate=calculate_batch):
+    """Run a list of (line, record) through calculate_batch (or a BatchPool's calculate or submit)"""
+    return calculate(
+        column(chunk, BIRTH_DATE),
+        column(chunk, GENDER, "Male"),
+        column(chunk, COUNTRY),
+        column(chunk, LIFESPAN),
+        now=now,
+        actuarial=actuarial,
+    )
+
+
+def compute_chunk(chunk, now, actuarial=False, metric_names=(), calculate=calculate_batch):
+    """Run one chunk through calculate_chunk and format its text output columns
+
+    Returns (BatchResult, {output field: column}); error rows hold placeholder
+    values in the columns and are told apart by result.ok.
+    """
+    result = calculate_chunk(chunk, now, actuarial, calculate)
+    return result, output_columns(result, metric_names)
+
+
+def output_columns(result, metric_names=()):
+    """The text output columns (OUTPUT_FIELDS and metrics) of a computed chunk"""
+    ok = result.ok
+    columns = {
+        "death_date": np.datetime_as_string(result.death_dates, unit="s"),
+        "lifespan_years": np.round(result.lifespan_years, 3),
+        "seconds_remaining": _whole(result.seconds_remaining, ok),
+        "progress_percentage": np.round(result.progress_percentage, 3),
+    }
+    if metric_names:
+        columns.update((name, _whole(values, ok))
+                       for name, values in result.metrics(metric_names).items())
+    return columns
+
+
+def _whole(values, ok):
+    """Floor a float column to int64, with 0 on error rows"""
+    return np.floor(np.where(ok, values, 0.0)).astype(np.int64)
+
+
+def columnar_chunk(chunk, result, metric_names=()):
+    """Fixed-width columns (see COLUMNAR_SCHEMA) for the valid rows of a computed chunk"""
+    ok = result.ok
+    valid = [item for item, keep in zip(chunk, ok.tolist()) if keep]
+    death_us = result.death_dates[ok].astype(np.int64)
+    life_us = np.rint(result.lifespan_years[ok] * (SECONDS_PER_YEAR * 1_000_000)).astype(np.int64)
+    columns = {
+        "line": np.array([line for line, _ in valid], dtype=np.int64),
+        "birth_date": (death_us - life_us) // 1_000_000,
+        "gender": np.asarray(column(valid, GENDER, "Male")) == GENDERS[1],
+        "country": encode_countries(column(valid, COUNTRY)) if valid else np.zeros(0, np.int16),
+        "death_date": death_us // 1_000_000,
+        "lifespan_years": result.lifespan_years[ok],
+        "seconds_remaining": np.floor(result.seconds_remaining[ok]),
+        "progress_percentage": result.progress_percentage[ok],
+    }
+    if metric_names:
+        columns.update((name, _whole(values[ok], True))
+                       for name, values in result.metrics(metric_names).items())
+    return columns
+
+
+class _CsvWriter:
+    """Write dict rows as CSV, taking the columns from the first row"""
+
+    def __init__(self, f):
+        self.writer = csv.writer(f, lineterminator="\n")
+        self.fields = None
+
+    def write(self, row):
+        if self.fields is None:
+            self.fields = list(row)
+            self.writer.writerow(self.fields)
+        self.writer.writerow(list(map(row.get, self.fields)))
+
+
+class _JsonlWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, row):
+        self.f.write(json.dumps(row, ensure_ascii=False))
+        self.f.write("\n")
+
+
+def _write_rows(writer, chunk, result, columns, stats, write_reject):
+    ok = result.ok
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    for i, (line, record) in enumerate(chunk):
+        if not ok[i]:
+            write_reject(line, ERROR_MESSAGES[int(result.errors[i])], record)
+            continue
+        stats.rows += 1
+        row = dict(record)
+        for name, column in zip(names, values):
+            row[name] = column[i]
+        writer.write(row)
+        stats.written += 1
+
+
+def _write_columnar_chunk(writer, chunk, result, metric_names, stats, write_reject):
+    for i in np.flatnonzero(~result.ok).tolist():
+        write_reject(chunk[i][0], ERROR_MESSAGES[int(result.errors[i])], chunk[i][1])
+    columns = columnar_chunk(chunk, result, metric_names)
+    writer.append(columns)
+    stats.rows += len(columns["line"])
+    stats.written += len(columns["line"])
+
+
+def process_stream(source, destination, input_format="csv", output_format=None,
+                   reject=None, chunk_size=None, metric_names=(), actuarial=False,
+                   now=None, progress=None, workers=1):
+    """Stream rows from an open source file to an open destination file
+
+    Output rows are the input fields followed by OUTPUT_FIELDS and the
+    requested metrics; for output_format="columnar" destination is a binary
+    file receiving the columns described in the module docstring instead.
+    reject is an open text file for rejected rows (or
+    None to drop them) and progress an optional callback receiving the
+    StreamStats after every chunk. With workers other than 1 every chunk is
+    spread over a deathclock.parallel.BatchPool (0 or None: all CPUs), which
+    computes one chunk while the next is read. chunk_size defaults to
+    DEFAULT_CHUNK_SIZE, or to the pool's batch_rows so that every worker gets
+    a shard. Returns the final StreamStats.
+    """
+    output_format = output_format or input_format
+    metric_names = tuple(metric_names)
+    unknown = set(metric_names) - set(metrics.METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+    now = now or datetime.now()
+    if output_format == COLUMNAR:
+        meta = {"now": now.isoformat(), "time_unit": "epoch seconds", "actuarial": actuarial,
+                "labels": {"gender": list(GENDERS), "country": list(active_table().countries)}}
+        writer = columnar.ColumnWriter(destination, COLUMNAR_SCHEMA + tuple(
+            (name, "<i8") for name in metric_names), meta)
+    elif output_format == "jsonl":
+        writer = _JsonlWriter(destination)
+    else:
+        writer = _CsvWriter(destination)
+    stats = StreamStats()
+    write_reject = reject_writer(reject, stats)
+
+    def finish(chunk, result):
+        if output_format == COLUMNAR:
+            _write_columnar_chunk(writer, chunk, result, metric_names, stats, write_reject)
+        else:
+            _write_rows(writer, chunk, result, output_columns(result, metric_names), stats,
+                        write_reject)
+        stats.chunks += 1
+        stats.tick()
+        if progress is not None:
+            progress(stats)
+
+    pool = None
+    pending = None
+    if workers != 1:
+        from .parallel import BatchPool
+
+        pool = BatchPool(workers)
+    try:
+        chunk_size = chunk_size or (pool.batch_rows if pool is not None else DEFAULT_CHUNK_SIZE)
+        chunks = read_chunks(read_records(source, input_format), chunk_size, write_reject)
+        if pool is None:
+            for chunk in chunks:
+                finish(chunk, calculate_chunk(chunk, now, actuarial))
+        else:
+            # Submit each chunk before writing out the previous one; the newest
+            # is always in pending, so it is released if writing fails
+            for chunk in chunks:
+                previous, pending = pending, (chunk, calculate_chunk(chunk, now, actuarial,
+                                                                     pool.submit))
+                if previous is not None:
+                    finish(previous[0], previous[1].result())
+            if pending is not None:
+                finish(pending[0], pending[1].result())
+        if output_format == COLUMNAR:
+            writer.close()
+    finally:
+        # result() frees a batch's shared memory; release() covers the one still in flight
+        if pending is not None:
+            pending[1].release()
+        if pool is not None:
+            pool.close()
+    stats.tick()
+    return stats
+
+
+def process_file(input_path, output_path, reject_path=None, **options):
+    """Stream input_path to output_path, detecting formats from the file names"""
+    options.setdefault("input_format", detect_format(input_path))
+    options.setdefault("output_format", detect_format(output_path))
+    if options["input_format"] == COLUMNAR:
+        raise ValueError(f"{input_path}: columnar files can only be written")
+    if options["output_format"] == COLUMNAR:
+        output = open(output_path, "wb")
+    else:
+        output = open(output_path, "w", newline="", encoding="utf-8")
+    with open(input_path, newline="", encoding="utf-8") as source, output as destination:
+        if reject_path is None:
+            return process_stream(source, destination, **options)
+        with open(reject_path, "w", encoding="utf-8") as reject:
+            return process_stream(source, destination, reject=reject, **options)
+
+
+def main(argv=None):
+    from .parallel import MIN_SHARD_ROWS
+
+    parser = argparse.ArgumentParser(prog="python -m deathclock.stream",
+                                     description="Compute death dates for a CSV or JSONL file.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--reject", help="JSONL file receiving rows that could not be processed")
+    parser.add_argument("--chunk-size", type=int,
+                        help=f"rows per chunk (default: {DEFAULT_CHUNK_SIZE:,}, or "
+                             f"{MIN_SHARD_ROWS:,} per worker with --workers)")
+    parser.add_argument("--metrics", nargs="+", choices=list(metrics.METRICS), default=(),
+                        metavar="NAME", help="metrics to add to every row")
+    parser.add_argument("--actuarial", action="store_true")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes per chunk (0: all CPUs)")
+    parser.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    def report(stats):
+        print(f"\r{stats}", end="", file=sys.stderr, flush=True)
+
+    stats = process_file(args.input, args.output, args.reject, chunk_size=args.chunk_size,
+                         metric_names=args.metrics, actuarial=args.actuarial, workers=args.workers,
+                         progress=None if args.quiet else report)
+    if not args.quiet:
+        print(f"\r{stats}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
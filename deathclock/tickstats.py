@@ -0,0 +1,96 @@
+"""Per-tick timing of the countdown loop
+
+TickScheduler reports every tick to a TickMonitor:
+
+    compute  how long the tick callback ran
+    latency  how much later than asked the Tk ``after`` callback ran, i.e.
+             the time the event sat in Tk's queue behind other work
+    drift    how far past the wall-clock second boundary the tick ran
+             (includes the scheduler's 2 ms safety margin)
+    skipped  boundaries missed because the loop fell more than a second behind
+
+The last ``window`` ticks are kept for summaries. Set DEATHCLOCK_TICK_LOG to a
+file name to also get one JSON line per tick there, followed by a summary line
+when the clock closes; DEATHCLOCK_TICK_OVERLAY=1 shows the overlay at startup.
+"""
+import json
+import os
+from collections import deque
+
+LOG_ENV_VAR = "DEATHCLOCK_TICK_LOG"
+OVERLAY_ENV_VAR = "DEATHCLOCK_TICK_OVERLAY"
+SAMPLE_FIELDS = ("compute", "latency", "drift")
+DEFAULT_WINDOW = 300
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class TickMonitor:
+    """Records tick timings; listeners are called with the monitor after each tick"""
+
+    def __init__(self, window=DEFAULT_WINDOW, log=None):
+        self.samples = {field: deque(maxlen=window) for field in SAMPLE_FIELDS}
+        self.ticks = 0
+        self.skipped = 0
+        self.last = None
+        self.log = log
+        self.listeners = []
+
+    @classmethod
+    def from_environment(cls, window=DEFAULT_WINDOW):
+        """A monitor logging to the file named by $DEATHCLOCK_TICK_LOG, if set"""
+        path = os.environ.get(LOG_ENV_VAR)
+        return cls(window, open(path, "a", buffering=1, encoding="utf-8") if path else None)
+
+    def record(self, timestamp, compute, latency, drift, skipped=0):
+        """Add one tick; times are in seconds"""
+        self.ticks += 1
+        self.skipped += skipped
+        self.last = {"tick": self.ticks, "timestamp": timestamp, "compute": compute,
+                     "latency": latency, "drift": drift, "skipped": skipped}
+        for field in SAMPLE_FIELDS:
+            self.samples[field].append(self.last[field])
+        if self.log is not None:
+            self.log.write(json.dumps(self.last) + "\n")
+        for listener in self.listeners:
+            listener(self)
+
+    def summary(self):
+        """Tick counts plus last, mean, p95 and max of each timing over the window, in ms"""
+        result = {"ticks": self.ticks, "skipped": self.skipped}
+        for field, values in self.samples.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            result[field] = {
+                "last_ms": values[-1] * 1000,
+                "mean_ms": sum(ordered) / len(ordered) * 1000,
+                "p95_ms": _percentile(ordered, 0.95) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return result
+
+    def overlay_text(self):
+        """Two short lines for the on-screen overlay"""
+        if self.last is None:
+            return "no ticks yet"
+        summary = self.summary()
+        parts = [f"{field} {summary[field]['last_ms']:.1f}/{summary[field]['p95_ms']:.1f}"
+                 for field in SAMPLE_FIELDS]
+        return (f"tick {self.ticks} | skipped {self.skipped}\n"
+                f"{' | '.join(parts)} ms (last/p95)")
+
+    def export(self, path):
+        """Write the summary as JSON to path"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write("\n")
+
+    def close(self):
+        """Append the summary to the tick log and close it"""
+        if self.log is not None:
+            self.log.write(json.dumps({"summary": self.summary()}) + "\n")
+            self.log.close()
+            self.log = None
@@ -0,0 +1,86 @@
+"""Incremental evaluation of values keyed on time granularity
+
+Most of the clock's statistics are derived from whole days or hours left and
+only change when that boundary is crossed, yet the tick loop asks for all of
+them every second. Each value is declared with its granularity; on every tick
+TieredEvaluator only recomputes the tiers whose ``seconds // granularity``
+changed since the previous call and serves the rest from its cache. STATIC
+values depend on the inputs alone and are recomputed after ``invalidate``.
+"""
+from .profiling import stage
+
+STATIC = 0
+SECOND = 1
+MINUTE = 60
+HOUR = 3600
+DAY = 24 * 3600
+
+GRANULARITY_NAMES = {
+    STATIC: "static",
+    SECOND: "second",
+    MINUTE: "minute",
+    HOUR: "hour",
+    DAY: "day",
+}
+
+_UNSET = object()
+
+
+def tier_key(granularity, total_seconds):
+    """Return the value that changes exactly when a granularity boundary is crossed"""
+    return 0 if granularity == STATIC else total_seconds // granularity
+
+
+class TieredEvaluator:
+    """Cache ``func(total_seconds)`` results per granularity tier
+
+    Tiers are evaluated coarsest first (STATIC, DAY, ... SECOND) and the
+    functions of a tier in registration order, so a function may read values
+    of coarser tiers or earlier entries through ``evaluator.values``.
+    """
+
+    def __init__(self):
+        self._tiers = {}
+        self._keys = {}
+        self.values = {}
+        self.computed = 0
+        self.reused = 0
+
+    def add(self, name, granularity, func):
+        """Register func(total_seconds) under name at the given granularity"""
+        if granularity not in GRANULARITY_NAMES:
+            raise ValueError(f"Unknown granularity: {granularity!r}")
+        self._tiers.setdefault(granularity, []).append((name, func))
+        self._keys.pop(granularity, None)
+
+    def invalidate(self):
+        """Forget every cached value, e.g. after the inputs changed"""
+        self._keys.clear()
+        self.values.clear()
+
+    def preload(self, values):
+        """Use already known STATIC values (e.g. restored from a saved session)
+
+        Does nothing unless a value is given for every STATIC entry.
+        """
+        names = [name for name, _ in self._tiers.get(STATIC, ())]
+        if names and all(name in values for name in names):
+            for name in names:
+                self.values[name] = values[name]
+            self._keys[STATIC] = tier_key(STATIC, 0)
+
+    @stage("statistics")
+    def evaluate(self, total_seconds):
+        """Return {name: value} for total_seconds, recomputing only stale tiers"""
+        total_seconds = int(total_seconds)
+        for granularity in sorted(self._tiers, key=lambda g: (g != STATIC, -g)):
+            key = tier_key(granularity, total_seconds)
+            entries = self._tiers[granularity]
+            if self._keys.get(granularity, _UNSET) == key:
+                self.reused += len(entries)
+                continue
+            for name, func in entries:
+                self.values[name] = func(total_seconds)
+            self._keys[granularity] = key
+            self.computed += len(entries)
+        return self.values
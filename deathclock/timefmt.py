@@ -0,0 +1,163 @@
+"""Countdown formatting with integer arithmetic
+
+Each display format is compiled once into a function of (whole seconds left,
+start); ``get_formatter`` resolves a format name to it, so the tick loop does
+a single call instead of walking an if/elif chain. Everything is integer
+division: years and months are calendar-correct when the start datetime is
+known (the GUI passes "now"), and otherwise fixed Julian years of 365.25 days
+and twelfths of them.
+"""
+import calendar
+from datetime import timedelta
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+# 365.25 days, and a twelfth of it, are whole numbers of seconds
+SECONDS_PER_YEAR = 31_557_600
+SECONDS_PER_MONTH = SECONDS_PER_YEAR // 12
+
+DEFAULT_FORMAT = "detailed"
+
+# (label, format name) in the order the GUI offers them
+DISPLAY_FORMATS = (
+    ("Detailed", "detailed"),
+    ("Years & Days", "years_days"),
+    ("Weeks & Days", "weeks_days"),
+    ("Days & Hours", "days_hours"),
+    ("Total Weeks", "total_weeks"),
+    ("Total Days", "total_days"),
+    ("Total Hours", "total_hours"),
+    ("Total Minutes", "total_minutes"),
+    ("Total Seconds", "total_seconds"),
+)
+
+
+def add_months(start, months):
+    """Return start moved by whole calendar months, clamping the day to the month's end"""
+    month_index = start.month - 1 + months
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return start.replace(year=year, month=month, day=day)
+
+
+def calendar_months(start, end):
+    """Return (whole calendar months from start to end, datetime start + those months)"""
+    months = (end.year - start.year) * 12 + end.month - start.month
+    anchor = add_months(start, months)
+    if anchor > end:
+        months -= 1
+        anchor = add_months(start, months)
+    return months, anchor
+
+
+def _calendar_end(total_seconds, start):
+    """Return start + total_seconds, or None if there is no start or it overflows"""
+    if start is None:
+        return None
+    try:
+        return start + timedelta(seconds=total_seconds)
+    except OverflowError:
+        return None
+
+
+def split_years_months(total_seconds, start=None):
+    """Return (years, months, seconds left over) for a duration
+
+    With a start datetime the years and months are whole calendar units
+    counted from it; without one they are Julian years and twelfths of them.
+    """
+    end = _calendar_end(total_seconds, start)
+    if end is None:
+        years, rest = divmod(total_seconds, SECONDS_PER_YEAR)
+        months, rest = divmod(rest, SECONDS_PER_MONTH)
+        return years, months, rest
+    months, anchor = calendar_months(start, end)
+    rest = end - anchor
+    years, months = divmod(months, 12)
+    return years, months, rest.days * SECONDS_PER_DAY + rest.seconds
+
+
+def decompose(total_seconds, start=None):
+    """Return (years, months, days, hours, minutes, seconds) for a duration"""
+    years, months, rest = split_years_months(total_seconds, start)
+    days, rest = divmod(rest, SECONDS_PER_DAY)
+    hours, rest = divmod(rest, SECONDS_PER_HOUR)
+    minutes, seconds = divmod(rest, SECONDS_PER_MINUTE)
+    return years, months, days, hours, minutes, seconds
+
+
+def format_detailed(total_seconds, start=None):
+    years, months, days, hours, minutes, seconds = decompose(total_seconds, start)
+    return f"{years}y {months}m {days}d {hours}h {minutes}min {seconds}s"
+
+
+def format_years_days(total_seconds, start=None):
+    end = _calendar_end(total_seconds, start)
+    if end is None:
+        years, rest = divmod(total_seconds, SECONDS_PER_YEAR)
+        return f"{years} years, {rest // SECONDS_PER_DAY} days"
+    months, _ = calendar_months(start, end)
+    years = months // 12
+    return f"{years} years, {(end - add_months(start, years * 12)).days} days"
+
+
+def format_weeks_days(total_seconds, start=None):
+    weeks, rest = divmod(total_seconds, SECONDS_PER_WEEK)
+    return f"{weeks} weeks, {rest // SECONDS_PER_DAY} days"
+
+
+def format_days_hours(total_seconds, start=None):
+    days, rest = divmod(total_seconds, SECONDS_PER_DAY)
+    return f"{days} days, {rest // SECONDS_PER_HOUR} hours"
+
+
+def format_hours_minutes(total_seconds, start=None):
+    hours, rest = divmod(total_seconds, SECONDS_PER_HOUR)
+    return f"{hours} hours, {rest // SECONDS_PER_MINUTE} minutes"
+
+
+def _total(unit_seconds, unit):
+    def format_total(total_seconds, start=None):
+        return f"{total_seconds // unit_seconds} total {unit}"
+    format_total.__name__ = f"format_total_{unit}"
+    return format_total
+
+
+FORMATTERS = {
+    "detailed": format_detailed,
+    "years_days": format_years_days,
+    "weeks_days": format_weeks_days,
+    "days_hours": format_days_hours,
+    "hours_minutes": format_hours_minutes,
+    "total_weeks": _total(SECONDS_PER_WEEK, "weeks"),
+    "total_days": _total(SECONDS_PER_DAY, "days"),
+    "total_hours": _total(SECONDS_PER_HOUR, "hours"),
+    "total_minutes": _total(SECONDS_PER_MINUTE, "minutes"),
+    "total_seconds": _total(1, "seconds"),
+}
+
+
+def get_formatter(name):
+    """Return the formatter function for a display format name"""
+    try:
+        return FORMATTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown display format: {name!r}") from None
+
+
+def format_duration(total_seconds, name=DEFAULT_FORMAT, start=None):
+    """Format a number of seconds left in the named display format"""
+    return FORMATTERS[name](int(total_seconds), start)
+
+
+def format_durations(values, name=DEFAULT_FORMAT, start=None):
+    """Format a sequence or array of seconds left; NaN and None become ""
+
+    Negative durations are shown as zero.
+    """
+    formatter = get_formatter(name)
+    return ["" if value is None or value != value else formatter(max(int(value), 0), start)
+            for value in values]
@@ -0,0 +1,320 @@
+"""Remaining-life time series from a start date until each death date
+
+A series samples one person's countdown at a fixed resolution: time left,
+percentage of life lived (as in the GUI's progress bar) and any metrics from
+deathclock.metrics, at ``start``, one step later, and so on up to the death
+date. Everyone is sampled on the same grid of times, computed once, so the
+long-format rows of a whole population are gathered from that grid with
+array arithmetic; Python only loops over chunks of rows.
+
+    chunks = population_series(births, deaths, "day", metric_names=["meals"])
+    export("series.dcol", births, deaths, "month")   # or "series.csv"
+
+Columns are ``person`` (index into the inputs, or the ids passed), ``time``,
+``seconds_remaining``, ``progress_percentage`` and the metrics, which are
+floored to whole int64 counts as in deathclock.stream. Columnar files (see
+deathclock.columnar) store time as int64 epoch seconds and progress as
+float32 and are written through a preallocated memory map; CSV costs a
+couple of microseconds per row, so prefer it for smaller exports.
+
+    python -m deathclock.timeseries people.csv series.dcol --resolution day
+
+Requires NumPy.
+"""
+import argparse
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+
+import numpy as np
+
+from . import columnar
+from . import metrics as metric_registry
+from .batch import ERROR_MESSAGES
+from .core import SECONDS_PER_YEAR
+
+# Fixed steps in microseconds; months and years follow the calendar
+_US_PER_SECOND = 1_000_000
+_FIXED_STEPS = {
+    "hour": 3600 * _US_PER_SECOND,
+    "day": 24 * 3600 * _US_PER_SECOND,
+    "week": 7 * 24 * 3600 * _US_PER_SECOND,
+}
+_MONTH_STEPS = {"month": 1, "quarter": 3, "year": 12}
+RESOLUTIONS = tuple(_FIXED_STEPS) + tuple(_MONTH_STEPS)
+DEFAULT_MAX_ROWS = 1 << 20
+CSV_SUFFIX = ".csv"
+
+
+def _as_us(values):
+    """datetime64[us] values as int64 microseconds, with NaT as the minimum int64"""
+    return np.asarray(values, dtype="M8[us]").astype(np.int64)
+
+
+def _add_months(start_us, months):
+    """start plus a number of calendar months, clamping the day to the month's length"""
+    start = np.datetime64(int(start_us), "us")
+    month = start.astype("M8[M]")
+    within = int((start - month.astype("M8[us]")).astype(np.int64))
+    day, time_of_day = divmod(within, _FIXED_STEPS["day"])
+    target = month + np.asarray(months, dtype=np.int64)
+    length = ((target + 1).astype("M8[D]") - target.astype("M8[D]")).astype(np.int64)
+    days = target.astype("M8[D]") + np.minimum(day, length - 1)
+    return days.astype("M8[us]").astype(np.int64) + time_of_day
+
+
+def sample_counts(death_us, start_us, resolution):
+    """Number of samples from start up to and including each death date (0 if past)"""
+    death_us = np.asarray(death_us, dtype=np.int64)
+    after = death_us >= start_us
+    if resolution in _FIXED_STEPS:
+        counts = (death_us - start_us) // _FIXED_STEPS[resolution] + 1
+    else:
+        step = _MONTH_STEPS[resolution]
+        start_month = np.datetime64(int(start_us), "us").astype("M8[M]").astype(np.int64)
+        death_month = np.where(after, death_us, start_us).astype("M8[us]").astype("M8[M]").astype(np.int64)
+        counts = (death_month - start_month) // step + 1
+        # The last candidate may fall later in its month than the death date
+        counts -= _add_months(start_us, (counts - 1) * step) > death_us
+    return np.where(after, counts, 0)
+
+
+def sample_times(start_us, count, resolution):
+    """The first count sample times from start, as int64 microseconds"""
+    k = np.arange(count, dtype=np.int64)
+    if resolution in _FIXED_STEPS:
+        return start_us + k * _FIXED_STEPS[resolution]
+    return _add_months(start_us, k * _MONTH_STEPS[resolution])
+
+
+def _check(resolution, metric_names):
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution!r}")
+    unknown = set(metric_names) - set(metric_registry.METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+
+
+def population_series(birth_dates, death_dates, resolution="day", start=None, metric_names=(),
+                      max_rows=DEFAULT_MAX_ROWS, ids=None):
+    """Yield the long-format series of many people in chunks of about max_rows rows
+
+    birth_dates and death_dates are datetime64 columns (NaT rows are
+    skipped); every chunk is a {column: array} dict with time as
+    datetime64[us]. People are never split across chunks.
+    """
+    metric_names = tuple(metric_names)
+    _check(resolution, metric_names)
+    start_us = int(_as_us(start or datetime.now()))
+    birth_us = _as_us(birth_dates)
+    death_us = _as_us(death_dates)
+    valid = ~(np.isnat(np.asarray(birth_dates, dtype="M8[us]"))
+              | np.isnat(np.asarray(death_dates, dtype="M8[us]")))
+    counts = np.where(valid, sample_counts(death_us, start_us, resolution), 0)
+    ids = np.arange(len(counts)) if ids is None else np.asarray(ids)
+    grid = sample_times(start_us, int(counts.max(initial=0)), resolution)
+    ends = np.cumsum(counts)
+
+    first = 0
+    while first < len(counts):
+        done = ends[first - 1] if first else 0
+        last = max(int(np.searchsorted(ends, done + max_rows, side="right")), first + 1)
+        people = np.arange(first, last)
+        rows = counts[first:last]
+        if rows.sum():
+            yield _chunk(people, rows, grid, birth_us, death_us, ids, metric_names)
+        first = last
+
+
+def _chunk(people, rows, grid, birth_us, death_us, ids, metric_names):
+    person = np.repeat(people, rows)
+    offsets = np.repeat(np.cumsum(rows) - rows, rows)
+    times = grid[np.arange(len(person)) - offsets]
+    death = death_us[person]
+    birth = birth_us[person]
+    seconds = (death - times) // _US_PER_SECOND
+    progress = np.clip((times - birth) / (death - birth) * 100, 0.0, 100.0)
+    columns = {
+        "person": ids[person],
+        "time": times.astype("M8[us]"),
+        "seconds_remaining": seconds,
+        "progress_percentage": progress,
+    }
+    if metric_names:
+        columns.update((name, np.floor(values).astype(np.int64)) for name, values
+                       in metric_registry.evaluate(seconds.astype(np.float64), metric_names).items())
+    return columns
+
+
+def series(birth_date, death_date, resolution="day", start=None, metric_names=()):
+    """One person's series as a {column: array} dict (without the person column)"""
+    metric_names = tuple(metric_names)
+    _check(resolution, metric_names)
+    start_us = int(_as_us(start or datetime.now()))
+    birth_us = _as_us([birth_date])
+    death_us = _as_us([death_date])
+    counts = sample_counts(death_us, start_us, resolution)
+    grid = sample_times(start_us, int(counts[0]), resolution)
+    person = np.zeros(1, dtype=np.int64)
+    columns = _chunk(person, counts, grid, birth_us, death_us, person, metric_names)
+    del columns["person"]
+    return columns
+
+
+def write_csv(f, chunks):
+    """Write chunks from population_series as CSV to an open text file; returns rows written"""
+    rows = 0
+    header = None
+    for columns in chunks:
+        if header is None:
+            header = list(columns)
+            f.write(",".join(header) + "\n")
+        values = []
+        for name in header:
+            column = columns[name]
+            if name == "time":
+                column = np.datetime_as_string(column, unit="s")
+            elif name == "progress_percentage":
+                column = np.round(column, 3)
+            values.append(column.tolist())
+        line = ",".join("%s" for _ in header) + "\n"
+        f.write("".join(map(line.__mod__, zip(*values))))
+        rows += len(values[0])
+    return rows
+
+
+def _columnar_schema(metric_names, id_dtype):
+    return [("person", id_dtype), ("time", "<i8"), ("seconds_remaining", "<i8"),
+            ("progress_percentage", "<f4")] + [(name, "<i8") for name in metric_names]
+
+
+def write_columnar(path, birth_dates, death_dates, resolution="day", start=None, metric_names=(),
+                   max_rows=DEFAULT_MAX_ROWS, ids=None):
+    """Write the population series to a columnar file, filling it chunk by chunk; returns rows"""
+    metric_names = tuple(metric_names)
+    _check(resolution, metric_names)
+    start = start or datetime.now()
+    start_us = int(_as_us(start))
+    valid = ~(np.isnat(np.asarray(birth_dates, dtype="M8[us]"))
+              | np.isnat(np.asarray(death_dates, dtype="M8[us]")))
+    total = int(np.where(valid, sample_counts(_as_us(death_dates), start_us, resolution), 0).sum())
+    id_dtype = np.int64 if ids is None else np.asarray(ids).dtype
+    meta = _columnar_meta(resolution, start)
+    with columnar.create(path, _columnar_schema(metric_names, id_dtype), total, meta) as out:
+        row = 0
+        for columns in population_series(birth_dates, death_dates, resolution, start,
+                                         metric_names, max_rows, ids):
+            n = len(columns["person"])
+            for name, values in _epoch_seconds(columns).items():
+                out[name][row:row + n] = values
+            row += n
+    return total
+
+
+def write_columnar_stream(f, chunks, resolution, start, metric_names=(), id_dtype=np.int64):
+    """Write chunks from population_series to an open binary file as a columnar file
+
+    Unlike write_columnar the row count need not be known up front; columns
+    are spilled as chunks arrive (see deathclock.columnar.ColumnWriter).
+    Returns rows written.
+    """
+    writer = columnar.ColumnWriter(f, _columnar_schema(tuple(metric_names), id_dtype),
+                                   _columnar_meta(resolution, start))
+    for columns in chunks:
+        writer.append(_epoch_seconds(columns))
+    writer.close()
+    return writer.rows
+
+
+def _columnar_meta(resolution, start):
+    return {"resolution": resolution, "start": str(np.datetime64(start, "s")),
+            "time_unit": "epoch seconds"}
+
+
+def _epoch_seconds(columns):
+    columns["time"] = columns["time"].astype("M8[s]").astype(np.int64)
+    return columns
+
+
+def export(path, birth_dates, death_dates, resolution="day", start=None, metric_names=(),
+           max_rows=DEFAULT_MAX_ROWS, ids=None):
+    """Write the population series to CSV (.csv) or a columnar file (any other name)"""
+    if path.lower().endswith(CSV_SUFFIX):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            return write_csv(f, population_series(birth_dates, death_dates, resolution, start,
+                                                  metric_names, max_rows, ids))
+    return write_columnar(path, birth_dates, death_dates, resolution, start, metric_names,
+                          max_rows, ids)
+
+
+def file_series(source, input_format, stats, reject=None, resolution="day", start=None,
+                metric_names=(), actuarial=False, chunk_size=None):
+    """Yield the series of everyone in an open CSV or JSONL file of people, chunk by chunk
+
+    The file is read and calculated in chunks of chunk_size rows, as by
+    deathclock.stream, so memory stays bounded; person is each row's line
+    number. stats is a deathclock.stream.StreamStats counting the people
+    (written) and rejected rows, which also go to the reject file if given.
+    """
+    from . import stream
+
+    start = start or datetime.now()
+    write_reject = stream.reject_writer(reject, stats)
+    records = stream.read_records(source, input_format)
+    for chunk in stream.read_chunks(records, chunk_size or stream.DEFAULT_CHUNK_SIZE,
+                                    write_reject):
+        result = stream.calculate_chunk(chunk, start, actuarial)
+        ok = result.ok
+        for i in np.flatnonzero(~ok).tolist():
+            write_reject(chunk[i][0], ERROR_MESSAGES[int(result.errors[i])], chunk[i][1])
+        valid = int(ok.sum())
+        stats.rows += valid
+        stats.written += valid
+        stats.chunks += 1
+        life_us = np.rint(np.where(ok, result.lifespan_years, 0.0)
+                          * (SECONDS_PER_YEAR * _US_PER_SECOND))
+        births = np.where(ok, result.death_dates.astype(np.int64) - life_us.astype(np.int64),
+                          np.iinfo(np.int64).min).astype("M8[us]")
+        yield from population_series(births, result.death_dates, resolution, start, metric_names,
+                                     ids=np.array([line for line, _ in chunk], dtype=np.int64))
+
+
+def main(argv=None):
+    from . import stream
+
+    parser = argparse.ArgumentParser(prog="python -m deathclock.timeseries",
+                                     description="Export remaining-life time series for a CSV or "
+                                                 "JSONL file of people.")
+    parser.add_argument("input")
+    parser.add_argument("output", help=f"a {CSV_SUFFIX} file, or a columnar file "
+                                       f"(e.g. series{columnar.SUFFIX})")
+    parser.add_argument("--resolution", choices=RESOLUTIONS, default="day")
+    parser.add_argument("--metrics", nargs="+", choices=list(metric_registry.METRICS), default=(),
+                        metavar="NAME", help="metrics to add to every sample")
+    parser.add_argument("--actuarial", action="store_true")
+    parser.add_argument("--reject", help="JSONL file receiving rows that could not be processed")
+    parser.add_argument("--chunk-size", type=int,
+                        help=f"people per chunk (default: {stream.DEFAULT_CHUNK_SIZE:,})")
+    args = parser.parse_args(argv)
+
+    now = datetime.now()
+    stats = stream.StreamStats()
+    with ExitStack() as files:
+        source = files.enter_context(open(args.input, newline="", encoding="utf-8"))
+        reject = (files.enter_context(open(args.reject, "w", encoding="utf-8"))
+                  if args.reject else None)
+        chunks = file_series(source, stream.detect_format(args.input), stats, reject,
+                             args.resolution, now, args.metrics, args.actuarial, args.chunk_size)
+        if args.output.lower().endswith(CSV_SUFFIX):
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                rows = write_csv(f, chunks)
+        else:
+            with open(args.output, "wb") as f:
+                rows = write_columnar_stream(f, chunks, args.resolution, now, args.metrics)
+    print(f"{rows:,} samples for {stats.written:,} people "
+          f"({stats.rejected:,} rows rejected)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
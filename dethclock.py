@@ -1,13 +1,37 @@
-import time
+import os
+import sqlite3
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-import threading
-try:
-    from tkcalendar import Calendar
-    CALENDAR_AVAILABLE = True
-except ImportError:
-    CALENDAR_AVAILABLE = False
+from datetime import datetime
+
+# "--profile[=modes]" turns on deathclock.profiling, which reads its modes on import
+_PROFILE_ARGS = [arg for arg in sys.argv[1:] if arg.partition('=')[0] == '--profile']
+if _PROFILE_ARGS:
+    os.environ['DEATHCLOCK_PROFILE'] = _PROFILE_ARGS[-1].partition('=')[2] or 'stages'
+
+from deathclock import (
+    DISPLAY_DATETIME_FORMAT,
+    calculate_death_date,
+    get_country_list,
+    get_life_expectancy,
+    life_progress,
+    parse_birth_date,
+    resolve_lifespan,
+)
+from deathclock import metrics
+from deathclock.actuarial import actuarial_death_date
+from deathclock.dates import MDY, DateParseError, parse_date
+from deathclock.lifetable import load_configured
+from deathclock.profiling import stage
+from deathclock.render import WidgetRenderer, urgency_color
+from deathclock.scheduler import TickScheduler
+from deathclock.session import Session, SessionStore
+from deathclock.tickstats import OVERLAY_ENV_VAR, TickMonitor
+from deathclock.timefmt import DEFAULT_FORMAT, DISPLAY_FORMATS, get_formatter
+from deathclock.tiers import DAY, SECOND, STATIC, TieredEvaluator
+# Build the panels below the form this long after start even if no frame was drawn
+PANEL_FALLBACK_MS = 500
 
 # Modern color scheme - brighter for better readability
 PRIMARY_BG = '#121417'
@@ -16,6 +40,223 @@ ACCENT_COLOR = '#f25a70'
 PROGRESS_COLOR = '#42b883'
 TEXT_COLOR = '#e1e1e1'
 
+# Metrics shown in each statistics section, see deathclock.metrics
+VITAL_METRICS = ('heartbeats', 'breaths')
+ANALYSIS_METRICS = ('sleep_hours', 'awake_hours', 'meals', 'weekend_days',
+                    'work_hours', 'vacation_days', 'tv_episodes', 'workouts')
+QUALITY_METRICS = ('books', 'movies', 'conversations', 'steps')
+PERSPECTIVE_METRICS = ('coffee_cups', 'sunrises', 'hugs', 'laughs', 'photos', 'songs')
+FUN_FACT_METRICS = ('blinks', 'words', 'dreams', 'years_in_orbit', 'songs', 'distance_km')
+
+# Dashboard table: (column id, heading, width, ProfileBoard sort key)
+DASHBOARD_COLUMNS = (
+    ('name', 'Name', 160, 'name'),
+    ('country', 'Country', 130, 'country'),
+    ('gender', 'Gender', 70, 'gender'),
+    ('death', 'Death date', 150, 'death_date'),
+    ('left', 'Time left', 260, 'death_date'),
+    ('lived', 'Lived', 70, 'progress'),
+)
+DASHBOARD_ROWS = 25
+
+class DashboardWindow:
+    """Countdowns for many people in one table
+
+    All rows are refreshed by one vectorized pass per tick (see
+    deathclock.dashboard.ProfileBoard) and the table is virtual: it holds
+    DASHBOARD_ROWS items that are refilled from the scroll position, so only
+    the rows on screen are ever formatted or sent to Tk.
+    """
+
+    def __init__(self, app, board):
+        self.app = app
+        self.board = board
+        self.offset = 0
+        self.sort_column = None
+        self.shown = [None] * DASHBOARD_ROWS
+        self.slot_rows = [None] * DASHBOARD_ROWS
+        self.time_formatter = get_formatter(DEFAULT_FORMAT)
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Death Clock Dashboard")
+        self.window.configure(bg=PRIMARY_BG)
+        self.window.protocol('WM_DELETE_WINDOW', self.close)
+        self.create_widgets()
+        # One timer for every row in the table
+        self.ticker = TickScheduler(self.window, self.tick)
+        self.render()
+
+    def create_widgets(self):
+        form = tk.Frame(self.window, bg=SECONDARY_BG)
+        form.pack(fill='x', padx=10, pady=8)
+        self.name_var = tk.StringVar()
+        self.birth_var = tk.StringVar()
+        self.gender_var = tk.StringVar(value="Male")
+        self.country_var = tk.StringVar(value="Global Average")
+        self.lifespan_var = tk.StringVar()
+        fields = (
+            ("Name", ttk.Entry(form, textvariable=self.name_var, width=14)),
+            ("Birth date", ttk.Entry(form, textvariable=self.birth_var, width=12)),
+            ("Gender", ttk.Combobox(form, textvariable=self.gender_var, width=7,
+                                    values=("Male", "Female"), state="readonly")),
+            ("Country", ttk.Combobox(form, textvariable=self.country_var, width=16,
+                                     values=get_country_list(), state="readonly")),
+            ("Lifespan", ttk.Entry(form, textvariable=self.lifespan_var, width=6)),
+        )
+        for column, (label, widget) in enumerate(fields):
+            ttk.Label(form, text=label, style='Input.TLabel').grid(row=0, column=column, padx=4, sticky='w')
+            widget.grid(row=1, column=column, padx=4)
+        ttk.Button(form, text="Add", command=self.add_from_form).grid(row=1, column=len(fields), padx=4)
+
+        actions = tk.Frame(self.window, bg=PRIMARY_BG)
+        actions.pack(fill='x', padx=10)
+        ttk.Button(actions, text="Add Current Profile", command=self.add_current).pack(side='left', padx=4)
+        ttk.Button(actions, text="Import CSV/JSONL...", command=self.import_file).pack(side='left', padx=4)
+        ttk.Button(actions, text="Remove Selected", command=self.remove_selected).pack(side='left', padx=4)
+        self.format_var = tk.StringVar(value=DEFAULT_FORMAT)
+        format_combo = ttk.Combobox(actions, textvariable=self.format_var, width=14, state="readonly",
+                                    values=[name for _, name in DISPLAY_FORMATS])
+        format_combo.bind('<<ComboboxSelected>>', lambda event: self.update_display_format())
+        format_combo.pack(side='right', padx=4)
+        self.count_label = ttk.Label(actions, text="", style='Input.TLabel')
+        self.count_label.pack(side='right', padx=12)
+
+        table = tk.Frame(self.window, bg=PRIMARY_BG)
+        table.pack(fill='both', expand=True, padx=10, pady=8)
+        self.tree = ttk.Treeview(table, columns=[column[0] for column in DASHBOARD_COLUMNS],
+                                 show='headings', height=DASHBOARD_ROWS, selectmode='extended')
+        for column, heading, width, key in DASHBOARD_COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda c=column, k=key: self.sort_by(c, k))
+            self.tree.column(column, width=width, anchor='w')
+        for slot in range(DASHBOARD_ROWS):
+            self.tree.insert('', 'end', iid=str(slot), values=())
+        self.scrollbar = ttk.Scrollbar(table, orient='vertical', command=self.on_scroll)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+        self.tree.bind('<Delete>', lambda event: self.remove_selected())
+
+    def add_from_form(self):
+        lifespan = self.lifespan_var.get().strip()
+        try:
+            self.board.add(self.name_var.get().strip() or f"Profile {len(self.board) + 1}",
+                           self.birth_var.get().strip(), self.gender_var.get(), self.country_var.get(),
+                           lifespan or None)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self.window)
+            return
+        self.name_var.set("")
+        self.birth_var.set("")
+        self.profiles_changed()
+
+    def add_current(self):
+        """Add the profile calculated in the main window"""
+        app = self.app
+        if not app.death_date:
+            messagebox.showwarning("Warning", "Please calculate death date first", parent=self.window)
+            return
+        self.board.add(f"Profile {len(self.board) + 1}", app.birth_date.strftime('%Y-%m-%d'),
+                       app.gender, app.country, app.custom_lifespan, actuarial=app.actuarial_var.get())
+        self.profiles_changed()
+
+    def import_file(self):
+        """Add people from a CSV or JSONL file with name, birth_date, gender, country, lifespan"""
+        from tkinter import filedialog
+
+        from deathclock.stream import detect_format, read_records
+
+        path = filedialog.askopenfilename(parent=self.window, filetypes=[
+            ("CSV or JSON lines", "*.csv *.jsonl *.ndjson"), ("All files", "*")])
+        if not path:
+            return
+        with open(path, newline='', encoding='utf-8') as f:
+            records = [record for _, record, error in read_records(f, detect_format(path))
+                       if error is None]
+
+        def column(name, default=''):
+            return [str(record.get(name) or default) for record in records]
+        first = len(self.board) + 1
+        rejected = self.board.add_batch(
+            [record.get('name') or f"Profile {first + i}" for i, record in enumerate(records)],
+            column('birth_date'), column('gender', 'Male'), column('country', 'Global Average'),
+            column('lifespan'))
+        self.profiles_changed()
+        if rejected:
+            messagebox.showwarning("Import", f"{len(rejected):,} rows could not be added", parent=self.window)
+
+    def remove_selected(self):
+        rows = [self.slot_rows[int(slot)] for slot in self.tree.selection()]
+        rows = [row for row in rows if row is not None]
+        if rows:
+            self.board.remove(rows)
+            self.tree.selection_set(())
+            self.profiles_changed()
+
+    def profiles_changed(self):
+        self.offset = max(min(self.offset, len(self.board) - DASHBOARD_ROWS), 0)
+        self.count_label.config(text=f"{len(self.board):,} profiles")
+        self.render()
+        if len(self.board):
+            self.ticker.start(immediate=False)
+        else:
+            self.ticker.stop()
+
+    def sort_by(self, column, key):
+        descending = self.sort_column == column and not self.board.descending
+        self.sort_column = column
+        self.board.sort(key, descending)
+        self.render()
+
+    def scroll_to(self, offset):
+        self.offset = max(min(offset, len(self.board) - DASHBOARD_ROWS), 0)
+        self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.board)))
+        else:
+            self.scroll_to(self.offset + int(amount) * (DASHBOARD_ROWS if unit == 'pages' else 1))
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return 'break'
+
+    def update_display_format(self):
+        self.time_formatter = get_formatter(self.format_var.get())
+        self.render()
+
+    def tick(self, timestamp):
+        now = datetime.fromtimestamp(timestamp)
+        self.board.refresh(now)
+        self.render(now)
+
+    def render(self, now=None):
+        """Fill the table's items with the rows at the scroll position, skipping unchanged ones"""
+        rows = self.board.rows(self.offset, self.offset + DASHBOARD_ROWS, self.time_formatter, now)
+        for slot in range(DASHBOARD_ROWS):
+            if slot < len(rows):
+                self.slot_rows[slot], values = rows[slot][0], rows[slot][1:]
+            else:
+                self.slot_rows[slot], values = None, ()
+            if self.shown[slot] != values:
+                self.tree.item(str(slot), values=values)
+                self.shown[slot] = values
+        total = max(len(self.board), 1)
+        self.scrollbar.set(self.offset / total, min((self.offset + DASHBOARD_ROWS) / total, 1.0))
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        self.ticker.stop()
+        self.window.destroy()
+        self.app.dashboard = None
+
 class DeathClockGUI:
     def __init__(self, root):
         self.root = root
@@ -28,8 +269,19 @@ class DeathClockGUI:
         self.birth_date = None
         self.lifespan_years = None
         self.is_running = False
-        self.update_thread = None
-        self.display_format = tk.StringVar(value="detailed")
+        self.dashboard = None
+        # Widget updates go through the renderer so unchanged values skip Tk
+        self.renderer = WidgetRenderer()
+        # Countdown ticks run on the Tk thread, aligned to wall-clock seconds
+        self.tick_monitor = TickMonitor.from_environment()
+        self.tick_monitor.listeners.append(self.update_tick_overlay)
+        self.ticker = TickScheduler(self.root, self.tick, monitor=self.tick_monitor)
+        # Statistics are cached per time unit and recomputed when it ticks over
+        self.stats = TieredEvaluator()
+        self.register_statistics()
+        self.display_format = tk.StringVar(value=DEFAULT_FORMAT)
+        # Resolved once per format change instead of on every tick
+        self.time_formatter = get_formatter(DEFAULT_FORMAT)
         
         # Animation variables for smooth transitions
         self.last_heartbeats = 0
@@ -40,239 +292,38 @@ class DeathClockGUI:
         # Style configuration
         style = ttk.Style()
         style.theme_use('clam')
-        # Bigger fonts and clearer colors
+        # Bigger fonts and clearer colors; the panels' styles are set up with
+        # the panels in configure_panel_styles
         style.configure('Title.TLabel', font=('Helvetica', 26, 'bold'),
                         background=PRIMARY_BG, foreground=ACCENT_COLOR)
         style.configure('Input.TLabel', font=('Helvetica', 14),
                         background=SECONDARY_BG, foreground=TEXT_COLOR)
-        style.configure('Clock.TLabel', font=('Courier', 28, 'bold'),
-                        background='#000000', foreground='#00ff41')
-        style.configure('Time.TLabel', font=('Helvetica', 22, 'bold'),
-                        background=SECONDARY_BG, foreground=ACCENT_COLOR)
-        style.configure('Stats.TLabel', font=('Helvetica', 14),
-                        background=SECONDARY_BG, foreground=TEXT_COLOR)
-        style.configure('Vital.TLabel', font=('Helvetica', 14),
-                        background=SECONDARY_BG, foreground=ACCENT_COLOR)
-        style.configure('Analysis.TLabel', font=('Helvetica', 14),
-                        background=SECONDARY_BG, foreground=TEXT_COLOR)
         style.configure('Watermark.TLabel', font=('Helvetica', 12),
                         background=PRIMARY_BG, foreground='#95a5a6')
         style.configure('Custom.TButton', font=('Helvetica', 12, 'bold'))
         style.map('Custom.TButton', background=[('active', '#5aa9ff')])
-        style.configure('Life.Horizontal.TProgressbar', troughcolor=SECONDARY_BG,
-                        background=PROGRESS_COLOR)
 
         self.create_widgets()
+        # Saved profiles; the last one is filled in now and its countdown
+        # resumed with the panels, after the first frame
+        self.session_store = SessionStore.from_environment()
+        self.session = None
+        self.pending_session = None
+        self.restore_session()
         
     def get_country_list(self):
         """Return list of countries with life expectancy data"""
-        return [
-            "Global Average",
-            "Japan",
-            "Switzerland", 
-            "South Korea",
-            "Singapore",
-            "Spain",
-            "Italy",
-            "Australia",
-            "Iceland",
-            "Israel",
-            "Sweden",
-            "France",
-            "Norway",
-            "Malta",
-            "Netherlands",
-            "Austria",
-            "Finland",
-            "New Zealand",
-            "Ireland",
-            "United Kingdom",
-            "Belgium",
-            "Germany",
-            "Canada",
-            "Luxembourg",
-            "Greece",
-            "Portugal",
-            "Slovenia",
-            "Denmark",
-            "Cyprus",
-            "United States",
-            "Czech Republic",
-            "Chile",
-            "Costa Rica",
-            "Poland",
-            "Estonia",
-            "Panama",
-            "Turkey",
-            "Albania",
-            "Croatia",
-            "Uruguay",
-            "Cuba",
-            "Argentina",
-            "Lebanon",
-            "China",
-            "Brazil",
-            "Thailand",
-            "Iran",
-            "Mexico",
-            "Colombia",
-            "Algeria",
-            "Tunisia",
-            "Ecuador",
-            "Sri Lanka",
-            "Morocco",
-            "Peru",
-            "Jordan",
-            "Armenia",
-            "Vietnam",
-            "Venezuela",
-            "Egypt",
-            "Libya",
-            "Paraguay",
-            "Ukraine",
-            "Philippines",
-            "El Salvador",
-            "Honduras",
-            "Guatemala",
-            "Bolivia",
-            "Nepal",
-            "Nicaragua",
-            "Bangladesh",
-            "Cambodia",
-            "India",
-            "Pakistan",
-            "Myanmar",
-            "Kenya",
-            "Ghana",
-            "Tanzania",
-            "Uganda",
-            "Rwanda",
-            "Ethiopia",
-            "Madagascar",
-            "Senegal",
-            "Mali",
-            "Burkina Faso",
-            "Niger",
-            "Chad",
-            "Nigeria",
-            "South Africa",
-            "Zimbabwe",
-            "Botswana",
-            "Zambia",
-            "Mozambique",
-            "Angola",
-            "Sierra Leone",
-            "Central African Republic"
-        ]
+        return get_country_list()
     
     def get_life_expectancy(self, country, gender):
         """Get life expectancy based on country and gender"""
-        # Life expectancy data (2023 estimates) - [Male, Female]
-        life_expectancy_data = {
-            "Global Average": [70.8, 75.9],
-            "Japan": [81.5, 87.6],
-            "Switzerland": [81.8, 85.5],
-            "South Korea": [79.3, 85.4],
-            "Singapore": [81.0, 85.7],
-            "Spain": [80.7, 86.2],
-            "Italy": [81.2, 85.6],
-            "Australia": [81.2, 85.3],
-            "Iceland": [80.5, 84.8],
-            "Israel": [79.9, 84.1],
-            "Sweden": [80.8, 84.7],
-            "France": [79.8, 85.8],
-            "Norway": [80.5, 84.4],
-            "Malta": [79.8, 84.5],
-            "Netherlands": [80.1, 83.8],
-            "Austria": [79.0, 84.1],
-            "Finland": [78.8, 84.5],
-            "New Zealand": [80.2, 83.5],
-            "Ireland": [79.9, 83.5],
-            "United Kingdom": [79.2, 82.9],
-            "Belgium": [79.2, 84.1],
-            "Germany": [78.7, 83.4],
-            "Canada": [80.0, 84.0],
-            "Luxembourg": [79.8, 84.6],
-            "Greece": [78.4, 83.8],
-            "Portugal": [78.9, 84.9],
-            "Slovenia": [78.3, 84.3],
-            "Denmark": [78.9, 82.9],
-            "Cyprus": [79.2, 83.1],
-            "United States": [76.4, 81.2],
-            "Czech Republic": [76.1, 82.1],
-            "Chile": [77.2, 82.4],
-            "Costa Rica": [77.8, 82.2],
-            "Poland": [74.0, 81.6],
-            "Estonia": [74.4, 82.4],
-            "Panama": [76.2, 81.8],
-            "Turkey": [76.2, 81.3],
-            "Albania": [76.9, 80.9],
-            "Croatia": [75.4, 81.2],
-            "Uruguay": [74.5, 81.2],
-            "Cuba": [77.2, 81.9],
-            "Argentina": [73.0, 79.8],
-            "Lebanon": [77.4, 81.3],
-            "China": [75.1, 80.5],
-            "Brazil": [72.2, 79.4],
-            "Thailand": [72.6, 80.0],
-            "Iran": [74.2, 77.6],
-            "Mexico": [72.1, 77.7],
-            "Colombia": [73.0, 79.0],
-            "Algeria": [75.9, 78.3],
-            "Tunisia": [74.2, 78.7],
-            "Ecuador": [74.1, 79.5],
-            "Sri Lanka": [73.1, 79.2],
-            "Morocco": [74.0, 77.3],
-            "Peru": [73.7, 79.1],
-            "Jordan": [72.7, 76.1],
-            "Armenia": [71.6, 78.9],
-            "Vietnam": [71.7, 80.9],
-            "Venezuela": [69.2, 77.2],
-            "Egypt": [70.2, 74.1],
-            "Libya": [70.2, 75.9],
-            "Paraguay": [71.7, 77.2],
-            "Ukraine": [67.0, 76.9],
-            "Philippines": [67.5, 75.0],
-            "El Salvador": [70.4, 78.1],
-            "Honduras": [72.3, 76.9],
-            "Guatemala": [71.2, 76.8],
-            "Bolivia": [67.5, 72.4],
-            "Nepal": [69.0, 71.9],
-            "Nicaragua": [72.4, 78.1],
-            "Bangladesh": [71.2, 74.2],
-            "Cambodia": [67.1, 71.1],
-            "India": [68.4, 70.7],
-            "Pakistan": [66.1, 68.4],
-            "Myanmar": [64.8, 69.8],
-            "Kenya": [61.4, 66.2],
-            "Ghana": [62.4, 64.7],
-            "Tanzania": [63.1, 67.3],
-            "Uganda": [61.7, 65.4],
-            "Rwanda": [67.3, 71.7],
-            "Ethiopia": [64.9, 68.9],
-            "Madagascar": [64.5, 67.8],
-            "Senegal": [66.3, 70.1],
-            "Mali": [57.3, 59.8],
-            "Burkina Faso": [59.3, 61.4],
-            "Niger": [60.4, 62.1],
-            "Chad": [52.5, 55.4],
-            "Nigeria": [53.4, 55.7],
-            "South Africa": [62.3, 68.5],
-            "Zimbabwe": [59.3, 63.4],
-            "Botswana": [66.1, 72.4],
-            "Zambia": [61.2, 65.1],
-            "Mozambique": [58.8, 64.2],
-            "Angola": [59.3, 64.4],
-            "Sierra Leone": [52.2, 55.7],
-            "Central African Republic": [51.0, 55.7]
-        }
-        
-        data = life_expectancy_data.get(country, life_expectancy_data["Global Average"])
-        return data[0] if gender == "Male" else data[1]
+        return get_life_expectancy(country, gender)
     
     def open_calendar(self):
         """Open calendar widget for date selection"""
-        if not CALENDAR_AVAILABLE:
+        try:
+            from tkcalendar import Calendar
+        except ImportError:
             messagebox.showwarning("Calendar Not Available", "Please install tkcalendar package")
             return
             
@@ -305,13 +356,13 @@ class DeathClockGUI:
             selected_date = cal.get_date()
             # Convert from MM/DD/YY to DD/MM/YYYY format
             try:
-                date_obj = datetime.strptime(selected_date, "%m/%d/%y")
-                formatted_date = date_obj.strftime("%d/%m/%Y")
-                self.birth_date_entry.delete(0, tk.END)
-                self.birth_date_entry.insert(0, formatted_date)
-                cal_window.destroy()
-            except:
-                messagebox.showerror("Error", "Invalid date selected")
+                date_obj = parse_date(selected_date, MDY)
+            except DateParseError as e:
+                messagebox.showerror("Error", f"Invalid date selected\n{e}")
+                return
+            self.birth_date_entry.delete(0, tk.END)
+            self.birth_date_entry.insert(0, f"{date_obj.day:02d}/{date_obj.month:02d}/{date_obj.year:04d}")
+            cal_window.destroy()
         
         # Buttons
         btn_frame = tk.Frame(cal_window, bg=SECONDARY_BG)
@@ -329,9 +380,19 @@ class DeathClockGUI:
         self.root.config(menu=menu_bar)
 
         file_menu = tk.Menu(menu_bar, tearoff=0)
+        file_menu.add_command(label="Export Tick Metrics...", command=self.export_tick_metrics)
         file_menu.add_command(label="Exit", command=self.root.quit)
         menu_bar.add_cascade(label="File", menu=file_menu)
 
+        # Tick timing overlay, off unless asked for
+        self.tick_overlay_var = tk.BooleanVar(value=os.environ.get(OVERLAY_ENV_VAR) == '1')
+        view_menu = tk.Menu(menu_bar, tearoff=0)
+        view_menu.add_checkbutton(label="Tick Diagnostics", variable=self.tick_overlay_var,
+                                  command=self.toggle_tick_overlay, accelerator="F12")
+        view_menu.add_command(label="Dashboard...", command=self.open_dashboard)
+        menu_bar.add_cascade(label="View", menu=view_menu)
+        self.root.bind('<F12>', self.flip_tick_overlay)
+
         help_menu = tk.Menu(menu_bar, tearoff=0)
         help_menu.add_command(label="About", command=self.show_about)
         menu_bar.add_cascade(label="Help", menu=help_menu)
@@ -362,10 +423,9 @@ class DeathClockGUI:
         self.birth_date_entry = ttk.Entry(date_input_frame, font=('Arial', 13), width=15)
         self.birth_date_entry.pack(side='left', padx=(0, 5))
         
-        # Calendar button
-        if CALENDAR_AVAILABLE:
-            calendar_btn = ttk.Button(date_input_frame, text="📅", width=3, command=self.open_calendar)
-            calendar_btn.pack(side='left')
+        # Calendar button (tkcalendar is only looked for when it is pressed)
+        calendar_btn = ttk.Button(date_input_frame, text="📅", width=3, command=self.open_calendar)
+        calendar_btn.pack(side='left')
             
         # Format hint
         format_hint = ttk.Label(
@@ -395,12 +455,67 @@ class DeathClockGUI:
         self.lifespan_entry = ttk.Entry(input_frame, textvariable=self.lifespan_var, font=('Arial', 13), width=18)
         self.lifespan_entry.grid(row=4, column=1, padx=15, pady=8)
         
+        # Actuarial mode: condition the estimate on the age already reached
+        self.actuarial_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(input_frame, text="Actuarial mode (account for current age)",
+                        variable=self.actuarial_var).grid(row=5, column=0, columnspan=2, padx=15, pady=4, sticky='w')
+        
         # Calculate button
         calculate_btn = ttk.Button(input_frame, text="⚡ CALCULATE & START", command=self.calculate_death_date, style='Custom.TButton')
-        calculate_btn.grid(row=5, column=0, columnspan=2, pady=15)
+        calculate_btn.grid(row=6, column=0, columnspan=2, pady=15)
+        
+        # Placeholder keeping the panels' place in the layout until build_panels
+        self.panels_frame = tk.Frame(self.root, bg=PRIMARY_BG)
+        self.panels_frame.pack(fill='x')
+        
+        # Status label
+        self.status_label = ttk.Label(
+            self.root,
+            text="Ready - Enter your details above",
+            font=('Helvetica', 10, 'italic'),
+            background=PRIMARY_BG,
+            foreground='#95a5a6',
+        )
+        self.status_label.pack(pady=8)
+        
+        # Watermark at the bottom
+        watermark_frame = tk.Frame(self.root, bg=PRIMARY_BG)
+        watermark_frame.pack(side='bottom', fill='x')
+        
+        watermark_label = ttk.Label(watermark_frame, text="Created by Eran", style='Watermark.TLabel')
+        watermark_label.pack(side='bottom', padx=20, pady=5)
+
+        # Tick diagnostics overlay in the top right corner, placed when enabled
+        self.tick_overlay = tk.Label(self.root, text="", font=('Courier', 10), justify='left',
+                                     bg='#000000', fg='#00ff41', padx=6, pady=3)
+        self.toggle_tick_overlay()
+
+        # Everything below the form is built once the form is on screen, or
+        # earlier if something needs it (see build_panels)
+        self.panels_built = False
+        self.status_label.bind('<Expose>', self.schedule_panels)
+        self.root.after(PANEL_FALLBACK_MS, self.build_panels)
+
+    def schedule_panels(self, event=None):
+        """Build the panels in the idle pass after the first frame"""
+        self.status_label.unbind('<Expose>')
+        self.root.after_idle(self.build_panels)
+
+    def build_panels(self):
+        """Build the display format choice, countdown, statistics and control panels
+
+        Deferred so the input form paints first; anything that shows results
+        calls this before touching the panels, so it also runs on demand.
+        A restored session's countdown is resumed once the panels exist.
+        """
+        if self.panels_built:
+            return
+        self.panels_built = True
+        self.configure_panel_styles()
+        parent = self.panels_frame
         
         # Display format selection - more compact
-        format_frame = tk.Frame(self.root, bg=PRIMARY_BG)
+        format_frame = tk.Frame(parent, bg=PRIMARY_BG)
         format_frame.pack(pady=15)
         
         ttk.Label(
@@ -415,28 +530,16 @@ class DeathClockGUI:
         radio_frame = tk.Frame(format_frame, bg=PRIMARY_BG)
         radio_frame.pack(pady=5)
 
-        format_options = [
-            ("Detailed", "detailed"),
-            ("Years & Days", "years_days"),
-            ("Weeks & Days", "weeks_days"),
-            ("Days & Hours", "days_hours"),
-            ("Total Weeks", "total_weeks"),
-            ("Total Days", "total_days"),
-            ("Total Hours", "total_hours"),
-            ("Total Minutes", "total_minutes"),
-            ("Total Seconds", "total_seconds")
-        ]
-        
-        for i, (text, value) in enumerate(format_options):
+        for i, (text, value) in enumerate(DISPLAY_FORMATS):
             ttk.Radiobutton(radio_frame, text=text, variable=self.display_format, value=value,
                            command=self.update_display_format).grid(row=i//3, column=i%3, padx=10, pady=2, sticky='w')
         
         # Death date display
-        self.death_date_label = ttk.Label(self.root, text="", style='Input.TLabel')
+        self.death_date_label = ttk.Label(parent, text="", style='Input.TLabel')
         self.death_date_label.pack(pady=8)
         
         # Main time information frame - enhanced styling
-        time_info_frame = tk.Frame(self.root, bg=SECONDARY_BG, relief='sunken', bd=3)
+        time_info_frame = tk.Frame(parent, bg=SECONDARY_BG, relief='sunken', bd=3)
         time_info_frame.pack(pady=15, padx=20, fill='x')
         
         # Countdown display frame
@@ -468,6 +571,13 @@ class DeathClockGUI:
         # Insights displayed directly under the countdown
         self.insights_label = ttk.Label(countdown_frame, text="", style='Analysis.TLabel')
         self.insights_label.pack(pady=(0, 15))
+
+        # Monte Carlo death date distribution
+        self.simulation_label = ttk.Label(countdown_frame, text="", style='Analysis.TLabel')
+        self.simulation_label.pack()
+        self.histogram_label = ttk.Label(countdown_frame, text="", font=('Courier', 11),
+                                         background=SECONDARY_BG, foreground=TEXT_COLOR)
+        self.histogram_label.pack(pady=(0, 15))
         
         # Statistics and Analysis Section - Enhanced with larger size
         stats_frame = tk.Frame(time_info_frame, bg=SECONDARY_BG, relief='raised', bd=4)
@@ -535,7 +645,7 @@ class DeathClockGUI:
         self.fun_facts_label.pack(pady=(8, 25))
         
         # Control buttons - simplified
-        button_frame = tk.Frame(self.root, bg=PRIMARY_BG)
+        button_frame = tk.Frame(parent, bg=PRIMARY_BG)
         button_frame.pack(pady=20)
         
         self.stop_btn = ttk.Button(button_frame, text="⏸️ PAUSE COUNTDOWN", command=self.stop_countdown, style='Custom.TButton')
@@ -544,28 +654,31 @@ class DeathClockGUI:
         self.restart_btn = ttk.Button(button_frame, text="🔄 RESTART", command=self.restart_countdown, style='Custom.TButton')
         self.restart_btn.pack(side='left', padx=15)
 
+        self.simulate_btn = ttk.Button(button_frame, text="🎲 SIMULATE", command=self.run_simulation, style='Custom.TButton')
+        self.simulate_btn.pack(side='left', padx=15)
+
         self.copy_btn = ttk.Button(button_frame, text="📋 COPY STATS", command=self.copy_stats, style='Custom.TButton')
         self.copy_btn.pack(side='left', padx=15)
 
         self.reset_btn = ttk.Button(button_frame, text="🗑️ RESET", command=self.reset_fields, style='Custom.TButton')
         self.reset_btn.pack(side='left', padx=15)
-        
-        # Status label
-        self.status_label = ttk.Label(
-            self.root,
-            text="Ready - Enter your details above",
-            font=('Helvetica', 10, 'italic'),
-            background=PRIMARY_BG,
-            foreground='#95a5a6',
-        )
-        self.status_label.pack(pady=8)
-        
-        # Watermark at the bottom
-        watermark_frame = tk.Frame(self.root, bg=PRIMARY_BG)
-        watermark_frame.pack(side='bottom', fill='x')
-        
-        watermark_label = ttk.Label(watermark_frame, text="Created by Eran", style='Watermark.TLabel')
-        watermark_label.pack(side='bottom', padx=20, pady=5)
+        self.resume_session()
+
+    def configure_panel_styles(self):
+        """Styles only used by the panels built in build_panels"""
+        style = ttk.Style()
+        style.configure('Clock.TLabel', font=('Courier', 28, 'bold'),
+                        background='#000000', foreground='#00ff41')
+        style.configure('Time.TLabel', font=('Helvetica', 22, 'bold'),
+                        background=SECONDARY_BG, foreground=ACCENT_COLOR)
+        style.configure('Stats.TLabel', font=('Helvetica', 14),
+                        background=SECONDARY_BG, foreground=TEXT_COLOR)
+        style.configure('Vital.TLabel', font=('Helvetica', 14),
+                        background=SECONDARY_BG, foreground=ACCENT_COLOR)
+        style.configure('Analysis.TLabel', font=('Helvetica', 14),
+                        background=SECONDARY_BG, foreground=TEXT_COLOR)
+        style.configure('Life.Horizontal.TProgressbar', troughcolor=SECONDARY_BG,
+                        background=PROGRESS_COLOR)
 
     def show_about(self):
         """Display application information"""
@@ -585,306 +698,363 @@ class DeathClockGUI:
                 messagebox.showerror("Error", "Please enter your date of birth")
                 return
             
-            birth_date = datetime.strptime(birth_date_str, "%d/%m/%Y")
+            birth_date = parse_birth_date(birth_date_str)
             
             # Use custom lifespan if provided, otherwise use demographic data
-            if custom_lifespan_str:
-                lifespan_years = float(custom_lifespan_str)
-                if lifespan_years <= 0:
-                    messagebox.showerror("Error", "Lifespan must be positive")
-                    return
+            lifespan_years = resolve_lifespan(country, gender, custom_lifespan_str or None)
+            custom_lifespan = lifespan_years if custom_lifespan_str else None
+
+            if self.actuarial_var.get():
+                # Expected age at death given the age already reached
+                self.death_date, lifespan_years = actuarial_death_date(
+                    birth_date, country, gender, custom_lifespan)
             else:
-                lifespan_years = self.get_life_expectancy(country, gender)
-                
-            self.birth_date = birth_date
-            self.lifespan_years = lifespan_years
-            self.gender = gender
-            self.country = country
-            self.death_date = birth_date + timedelta(days=lifespan_years * 365.25)
+                self.death_date = calculate_death_date(birth_date, lifespan_years)
             
             # Show demographic info
             demo_info = f"📍 {country} | {gender} | Life expectancy: {lifespan_years:.1f} years"
             if custom_lifespan_str:
                 demo_info += " (Custom)"
+            if self.actuarial_var.get():
+                demo_info += " (Actuarial)"
             
-            self.death_date_label.config(text=f"⚰️ Estimated death date: {self.death_date.strftime('%d/%m/%Y %H:%M:%S')}")
-            self.status_label.config(text=f"✅ {demo_info}")
-
-            # Update life progress info
-            self.update_life_progress()
-            
-            # Show initial countdown and start timer automatically
-            self.update_static_countdown()
-            self.start_countdown_automatically()
+            self.show_estimate(birth_date, lifespan_years, gender, country, custom_lifespan,
+                               self.death_date.strftime(DISPLAY_DATETIME_FORMAT), f"✅ {demo_info}")
+            self.save_session(birth_date_str, custom_lifespan_str, f"✅ {demo_info}")
             
+        except DateParseError as e:
+            messagebox.showerror("Error", f"Invalid date format. Please use DD/MM/YYYY\n{e}")
         except ValueError as e:
-            if "time data" in str(e):
-                messagebox.showerror("Error", "Invalid date format. Please use DD/MM/YYYY")
-            else:
-                messagebox.showerror("Error", "Invalid lifespan value. Please enter a number")
+            messagebox.showerror("Error", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
-    def update_life_progress(self):
+    def show_estimate(self, birth_date, lifespan_years, gender, country, custom_lifespan,
+                      death_date_text, status_text, demographic=None):
+        """Display the death date in self.death_date and start the countdown
+
+        demographic is the already known demographic comparison text, if any.
+        """
+        # A new result replaces a restored session that has not resumed yet
+        self.pending_session = None
+        self.build_panels()
+        self.birth_date = birth_date
+        self.custom_lifespan = custom_lifespan
+        self.lifespan_years = lifespan_years
+        self.gender = gender
+        self.country = country
+        self.stats.invalidate()
+        if demographic is not None:
+            self.stats.preload({'demographic': demographic})
+        
+        self.renderer.set(self.death_date_label, text=f"⚰️ Estimated death date: {death_date_text}")
+        self.renderer.set(self.status_label, text=status_text)
+
+        # Update life progress info
+        self.update_life_progress()
+        
+        # Show initial countdown and start timer automatically
+        self.update_static_countdown()
+        self.start_countdown_automatically()
+    
+    def save_session(self, birth_date_str, custom_lifespan_str, status_text):
+        """Remember the inputs and results just shown as the last session"""
+        if self.session_store is None:
+            return
+        demographic = self.stats.values.get('demographic') or self.demographic_text(0)
+        self.session = Session(
+            birth_date_str, self.gender, self.country, custom_lifespan_str, self.actuarial_var.get(),
+            self.display_format.get(), self.birth_date, self.death_date, self.lifespan_years,
+            self.death_date.strftime(DISPLAY_DATETIME_FORMAT), demographic, status_text)
+        try:
+            self.session_store.save(self.session)
+        except sqlite3.Error:
+            pass
+    
+    def restore_session(self):
+        """Fill in the last saved profile; its countdown resumes with the panels"""
+        if self.session_store is None:
+            return
+        try:
+            session = self.session_store.last()
+        except (sqlite3.Error, ValueError):
+            return
+        if session is None:
+            return
+        self.birth_date_entry.insert(0, session.birth_date)
+        self.lifespan_var.set(session.lifespan)
+        self.gender_var.set(session.gender)
+        self.country_var.set(session.country)
+        self.actuarial_var.set(session.actuarial)
+        try:
+            self.time_formatter = get_formatter(session.display_format)
+            self.display_format.set(session.display_format)
+        except ValueError:
+            pass
+        self.pending_session = session
+
+    def resume_session(self):
+        """Show the countdown of the session filled in by restore_session"""
+        session, self.pending_session = self.pending_session, None
+        if session is None:
+            return
+        if not session.current:
+            # Saved with another life table: recalculate from the inputs
+            self.calculate_death_date()
+            return
+        self.session = session
+        self.death_date = session.death_date
+        self.show_estimate(session.birth, session.lifespan_years, session.gender, session.country,
+                           float(session.lifespan) if session.lifespan else None,
+                           session.death_date_text, session.status_text, session.demographic_text)
+    
+    def update_life_progress(self, now=None):
         if not hasattr(self, 'birth_date') or not hasattr(self, 'lifespan_years'):
             return
             
-        now = datetime.now()
-        total_life_seconds = self.lifespan_years * 365.25 * 24 * 3600
-        lived_seconds = (now - self.birth_date).total_seconds()
+        progress = life_progress(self.birth_date, self.lifespan_years, now)
         
-        if lived_seconds < 0:
-            self.life_progress_label.config(text="⚠️ Birth date is in the future!")
+        if progress is None:
+            self.renderer.set(self.life_progress_label, text="⚠️ Birth date is in the future!")
             return
             
-        progress_percentage = (lived_seconds / total_life_seconds) * 100
-        age_years = lived_seconds / (365.25 * 24 * 3600)
+        progress_percentage, age_years = progress
         
-        self.life_progress_bar['value'] = progress_percentage
-        self.life_progress_label.config(
+        # The bar is 400px wide, so finer steps than 0.1% are invisible
+        self.renderer.set(self.life_progress_bar, value=round(progress_percentage, 1))
+        self.renderer.set(
+            self.life_progress_label,
             text=f"Life Progress: {progress_percentage:.1f}% | Age: {age_years:.1f} years"
         )
     
-    def update_static_countdown(self):
+    def show_expired(self):
+        """Replace the countdown and statistics with the expiry message"""
+        self.renderer.set(self.countdown_label, text="⚰️ YOUR TIME HAS EXPIRED! LIVE EVERY MOMENT! ⚰️")
+        self.renderer.set(self.time_stats_label, text="")
+        self.renderer.set(self.analysis_label, text="")
+        self.renderer.set(self.demographic_label, text="")
+        self.renderer.set(self.milestones_label, text="")
+        self.renderer.set(self.insights_label, text="")
+    
+    def update_static_countdown(self, now=None):
         """Update the countdown display once without starting the timer"""
         if not self.death_date:
             return
             
-        now = datetime.now()
+        now = now or datetime.now()
         time_left = self.death_date - now
         
         if time_left.total_seconds() <= 0:
-            self.countdown_label.config(text="⚰️ YOUR TIME HAS EXPIRED! LIVE EVERY MOMENT! ⚰️")
-            self.time_stats_label.config(text="")
-            self.analysis_label.config(text="")
-            self.demographic_label.config(text="")
-            self.milestones_label.config(text="")
+            self.show_expired()
             return
         
         # Update main countdown
-        formatted_time = self.format_time_display(time_left)
-        self.countdown_label.config(text=formatted_time)
+        formatted_time = self.format_time_display(time_left, now)
+        self.renderer.set(self.countdown_label, text=formatted_time)
         
-        # Add color effects to countdown based on urgency (same as clock)
+        # Add color effects to countdown based on urgency (only re-applied when the band changes)
         total_seconds = int(time_left.total_seconds())
         days = total_seconds // (24 * 3600)
-        
-        if days <= 7:  # Less than a week - bright red alert
-            self.countdown_label.config(foreground='#ff0000')
-        elif days <= 30:  # Less than a month - orange warning
-            self.countdown_label.config(foreground='#ff8800')
-        elif days <= 365:  # Less than a year - yellow caution
-            self.countdown_label.config(foreground='#f1c40f')
-        else:  # Normal blue instead of red
-            self.countdown_label.config(foreground='#3498db')
+        self.renderer.set(self.countdown_label, foreground=urgency_color(days))
         
         # Update statistics and analysis
         self.update_statistics_and_analysis(time_left)
     
     
+    def register_statistics(self):
+        """Declare every statistics section with the granularity it changes at"""
+        self.stats.add('demographic', STATIC, self.demographic_text)
+        self.stats.add('time_stats', DAY, self.time_stats_text)
+        self.stats.add('milestones', DAY, self.milestones_text)
+        self.stats.add('analysis', metrics.granularity(ANALYSIS_METRICS), self.analysis_text)
+        self.stats.add('life_quality', metrics.granularity(QUALITY_METRICS), self.life_quality_text)
+        self.stats.add('perspective', metrics.granularity(PERSPECTIVE_METRICS), self.perspective_text)
+        self.stats.add('vital', SECOND, self.vital_text)
+        self.stats.add('fun_facts', metrics.granularity(FUN_FACT_METRICS), self.fun_facts_text)
+    
     def update_statistics_and_analysis(self, time_left):
-        """Update comprehensive statistics and analysis with smooth animations"""
-        total_seconds = int(time_left.total_seconds())
-        
-        # Basic time statistics
-        total_minutes = total_seconds // 60
-        total_hours = total_seconds // 3600
+        """Update comprehensive statistics, recomputing only sections whose time unit ticked over"""
+        if not hasattr(self, 'lifespan_years'):
+            return
+        values = self.stats.evaluate(time_left.total_seconds())
+        self.renderer.set(self.time_stats_label, text=values['time_stats'])
+        self.renderer.set(self.vital_stats_label, text=values['vital'])
+        self.renderer.set(self.analysis_label, text=values['analysis'])
+        self.renderer.set(self.demographic_label, text=values['demographic'])
+        self.renderer.set(self.milestones_label, text=values['milestones'])
+        self.renderer.set(self.life_quality_label, text=values['life_quality'])
+        self.renderer.set(self.perspective_label, text=values['perspective'])
+        self.renderer.set(self.fun_facts_label, text=values['fun_facts'])
+        # Show combined insights under the countdown
+        self.renderer.set(self.insights_label, text=f"{values['analysis']} | {values['fun_facts']}")
+    
+    def time_stats_text(self, total_seconds):
+        """Basic time statistics; the percentage moves by 0.1% every few weeks"""
         total_days = total_seconds // (24 * 3600)
         total_weeks = total_days // 7
         total_months = total_days // 30.44
         total_years = total_days // 365.25
         
         # Life percentage calculations
-        if hasattr(self, 'lifespan_years'):
-            total_life_seconds = self.lifespan_years * 365.25 * 24 * 3600
-            remaining_percentage = (total_seconds / total_life_seconds) * 100
-            lived_percentage = 100 - remaining_percentage
-            
-            # Current age
-            now = datetime.now()
-            lived_seconds = (now - self.birth_date).total_seconds()
-            current_age = lived_seconds / (365.25 * 24 * 3600)
-            
-            # Basic stats
-            stats_text = (f"⏰ {total_years:.1f} years | {total_months:.0f} months | {total_weeks:.0f} weeks | "
-                         f"{total_days:,} days | {remaining_percentage:.1f}% remaining")
-            self.time_stats_label.config(text=stats_text)
-            
-            # Enhanced vital signs with smooth animation
-            heartbeats_remaining = total_seconds * 70  # Average 70 bpm
-            breaths_remaining = total_seconds * 15     # Average 15 breaths per minute
-            
-            # Smooth transition for vital signs
-            if self.last_heartbeats == 0:
-                self.last_heartbeats = heartbeats_remaining
-                self.last_breaths = breaths_remaining
-            
-            # Animate the transition
-            heartbeat_diff = abs(heartbeats_remaining - self.last_heartbeats)
-            breath_diff = abs(breaths_remaining - self.last_breaths)
-            
-            if heartbeat_diff > 100:  # Smooth large changes
-                self.heartbeat_animation_offset = heartbeat_diff * 0.1
-            if breath_diff > 20:
-                self.breath_animation_offset = breath_diff * 0.1
-            
-            # Apply animation offset for smooth counting
-            display_heartbeats = int(heartbeats_remaining + self.heartbeat_animation_offset)
-            display_breaths = int(breaths_remaining + self.breath_animation_offset)
-            
-            # Gradually reduce animation offset
-            self.heartbeat_animation_offset *= 0.95
-            self.breath_animation_offset *= 0.95
-            
-            # Update last values
+        total_life_seconds = self.lifespan_years * 365.25 * 24 * 3600
+        remaining_percentage = (total_seconds / total_life_seconds) * 100
+        
+        return (f"⏰ {total_years:.1f} years | {total_months:.0f} months | {total_weeks:.0f} weeks | "
+                f"{total_days:,} days | {remaining_percentage:.1f}% remaining")
+    
+    def vital_text(self, total_seconds):
+        """Vital signs with smooth animation, updated every second"""
+        # Current age at the tick's instant: whole lifetime minus the time left
+        lived_seconds = (self.death_date - self.birth_date).total_seconds() - total_seconds
+        current_age = lived_seconds / (365.25 * 24 * 3600)
+        
+        vitals = metrics.evaluate(total_seconds, VITAL_METRICS)
+        heartbeats_remaining = vitals['heartbeats']
+        breaths_remaining = vitals['breaths']
+        
+        # Smooth transition for vital signs
+        if self.last_heartbeats == 0:
             self.last_heartbeats = heartbeats_remaining
             self.last_breaths = breaths_remaining
+        
+        # Animate the transition
+        heartbeat_diff = abs(heartbeats_remaining - self.last_heartbeats)
+        breath_diff = abs(breaths_remaining - self.last_breaths)
+        
+        if heartbeat_diff > 100:  # Smooth large changes
+            self.heartbeat_animation_offset = heartbeat_diff * 0.1
+        if breath_diff > 20:
+            self.breath_animation_offset = breath_diff * 0.1
+        
+        # Apply animation offset for smooth counting
+        display_heartbeats = int(heartbeats_remaining + self.heartbeat_animation_offset)
+        display_breaths = int(breaths_remaining + self.breath_animation_offset)
+        
+        # Gradually reduce animation offset
+        self.heartbeat_animation_offset *= 0.95
+        self.breath_animation_offset *= 0.95
+        
+        # Update last values
+        self.last_heartbeats = heartbeats_remaining
+        self.last_breaths = breaths_remaining
+        
+        # Add heartbeat and breath rhythm indicators
+        rhythm_indicator = "💓" if total_seconds % 2 == 0 else "🖤"
+        breath_indicator = "🫁" if total_seconds % 4 < 2 else "💨"
+        
+        return (f"{rhythm_indicator} ~{display_heartbeats:,} heartbeats left | "
+                f"{breath_indicator} ~{display_breaths:,} breaths left | "
+                f"🎂 Current age: {current_age:.1f} years")
+    
+    def analysis_text(self, total_seconds):
+        """Sleep, meals, work and leisure estimates"""
+        m = metrics.format_metrics(total_seconds, ANALYSIS_METRICS)
+        return (
+            f"😴 ~{m['sleep_hours']} hours of sleep | "
+            f"☀️ ~{m['awake_hours']} awake hours | "
+            f"🍽️ ~{m['meals']} meals | "
+            f"🎉 ~{m['weekend_days']} weekend days | "
+            f"💼 ~{m['work_hours']} work hours | "
+            f"✈️ ~{m['vacation_days']} vacation days | "
+            f"📺 ~{m['tv_episodes']} TV episodes | "
+            f"🏋️ ~{m['workouts']} workouts"
+        )
+    
+    def demographic_text(self, total_seconds):
+        """Demographic comparisons, which only change with the inputs"""
+        global_male = self.get_life_expectancy("Global Average", "Male")
+        global_female = self.get_life_expectancy("Global Average", "Female")
+        global_avg = (global_male + global_female) / 2
+        
+        # Compare to global average
+        vs_global = self.lifespan_years - global_avg
+        vs_global_text = f"+{vs_global:.1f}" if vs_global > 0 else f"{vs_global:.1f}"
+        
+        # Compare to opposite gender in same country
+        opposite_gender = "Female" if self.gender == "Male" else "Male"
+        opposite_expectancy = self.get_life_expectancy(self.country, opposite_gender)
+        vs_opposite = self.lifespan_years - opposite_expectancy
+        vs_opposite_text = f"+{vs_opposite:.1f}" if vs_opposite > 0 else f"{vs_opposite:.1f}"
+        
+        return (f"🌍 vs Global avg: {vs_global_text} years | "
+                f"⚥ vs {opposite_gender} in {self.country}: {vs_opposite_text} years | "
+                f"🏆 Rank: {'Above' if vs_global > 0 else 'Below'} average")
+    
+    def milestones_text(self, total_seconds):
+        """Milestones and insights, updated daily"""
+        total_days = total_seconds // (24 * 3600)
+        total_weeks = total_days // 7
+        years_left = total_days // 365.25
+        milestones = []
+        
+        if years_left >= 10:
+            milestones.append(f"🎯 {int(years_left//10)} more decades")
+        if years_left >= 5:
+            milestones.append(f"🌟 {int(years_left//5)} five-year periods")
+        if years_left >= 1:
+            milestones.append(f"📅 {int(years_left)} more years")
+        
+        # Add perspective comparisons
+        if total_days > 365:
+            milestones.append(f"⭐ {total_days//365} more birthdays")
+        if total_weeks > 52:
+            milestones.append(f"📆 {total_weeks//52} more years of weekends")
             
-            # Add heartbeat and breath rhythm indicators
-            import math
-            rhythm_indicator = "💓" if int(total_seconds) % 2 == 0 else "🖤"
-            breath_indicator = "🫁" if int(total_seconds) % 4 < 2 else "💨"
-            
-            vital_text = (f"{rhythm_indicator} ~{display_heartbeats:,} heartbeats left | "
-                         f"{breath_indicator} ~{display_breaths:,} breaths left | "
-                         f"🎂 Current age: {current_age:.1f} years")
-            self.vital_stats_label.config(text=vital_text)
-            
-            # Enhanced analysis with more insights
-            sleep_hours_remaining = total_hours // 3  # Assuming 8 hours sleep per day
-            awake_hours_remaining = total_hours - sleep_hours_remaining
-            meals_remaining = total_days * 3  # 3 meals per day
-            weekends_remaining = total_weeks * 2  # 2 weekend days per week
-            
-            work_hours_remaining = total_days * 8
-            vacation_days_remaining = int(total_years * 20)
-            tv_episodes_remaining = total_hours  # Assuming 1h episodes
-            workout_sessions = total_days // 2  # Workout every other day
-
-            analysis_text = (
-                f"😴 ~{sleep_hours_remaining:,} hours of sleep | "
-                f"☀️ ~{awake_hours_remaining:,} awake hours | "
-                f"🍽️ ~{meals_remaining:,} meals | "
-                f"🎉 ~{weekends_remaining:,} weekend days | "
-                f"💼 ~{work_hours_remaining:,} work hours | "
-                f"✈️ ~{vacation_days_remaining:,} vacation days | "
-                f"📺 ~{tv_episodes_remaining:,} TV episodes | "
-                f"🏋️ ~{workout_sessions:,} workouts"
-            )
-            self.analysis_label.config(text=analysis_text)
-            
-            # Demographic comparisons
-            if hasattr(self, 'gender') and hasattr(self, 'country'):
-                global_male = self.get_life_expectancy("Global Average", "Male")
-                global_female = self.get_life_expectancy("Global Average", "Female")
-                global_avg = (global_male + global_female) / 2
-                
-                # Compare to global average
-                vs_global = self.lifespan_years - global_avg
-                vs_global_text = f"+{vs_global:.1f}" if vs_global > 0 else f"{vs_global:.1f}"
-                
-                # Compare to opposite gender in same country
-                opposite_gender = "Female" if self.gender == "Male" else "Male"
-                opposite_expectancy = self.get_life_expectancy(self.country, opposite_gender)
-                vs_opposite = self.lifespan_years - opposite_expectancy
-                vs_opposite_text = f"+{vs_opposite:.1f}" if vs_opposite > 0 else f"{vs_opposite:.1f}"
-                
-                demographic_text = (f"🌍 vs Global avg: {vs_global_text} years | "
-                                  f"⚥ vs {opposite_gender} in {self.country}: {vs_opposite_text} years | "
-                                  f"🏆 Rank: {'Above' if vs_global > 0 else 'Below'} average")
-                self.demographic_label.config(text=demographic_text)
-            
-            # Milestones and insights
-            years_left = total_years
-            milestones = []
-            
-            if years_left >= 10:
-                milestones.append(f"🎯 {int(years_left//10)} more decades")
-            if years_left >= 5:
-                milestones.append(f"🌟 {int(years_left//5)} five-year periods")
-            if years_left >= 1:
-                milestones.append(f"📅 {int(years_left)} more years")
-            
-            # Add perspective comparisons
-            if total_days > 365:
-                milestones.append(f"⭐ {total_days//365} more birthdays")
-            if total_weeks > 52:
-                milestones.append(f"📆 {total_weeks//52} more years of weekends")
-                
-            milestone_text = " | ".join(milestones[:3]) if milestones else "⚡ Less than a year remaining"
-            self.milestones_label.config(text=milestone_text)
-            
-            # New life quality metrics
-            books_readable = total_days // 7  # 1 book per week
-            movies_watchable = total_hours // 2  # 2-hour movies
-            conversations = total_days * 5  # 5 meaningful conversations per day
-            steps_remaining = total_days * 8000  # Average 8000 steps per day
-            
-            quality_text = (f"📚 ~{books_readable:,} books to read | "
-                           f"🎬 ~{movies_watchable:,} movies to watch | "
-                           f"💬 ~{conversations:,} conversations | "
-                           f"👟 ~{steps_remaining:,} steps to take")
-            self.life_quality_label.config(text=quality_text)
-            
-            # Enhanced perspective and fascinating facts - optimized for long lifetimes
-            coffee_cups = total_days * 2  # 2 cups per day
-            sunrises = total_days  # One per day
-            hugs_possible = total_days * 3  # 3 hugs per day
-            laughs_remaining = total_days * 15  # 15 laughs per day
-            photos_to_take = total_days * 10  # 10 photos per day
-            songs_to_hear = total_hours * 15  # 15 songs per hour awake
-            
-            # Scale perspective messages for different time ranges
-            if total_years > 50:
-                perspective = (f"🌟 Over {total_years:.0f} years ahead! Epic lifetime for: ☕ {coffee_cups:,} coffee moments, "
-                             f"🌅 {sunrises:,} sunrises, 🤗 {hugs_possible:,} warm hugs, 😂 {laughs_remaining:,} joyful laughs")
-            elif total_years > 25:
-                perspective = (f"🚀 {total_years:.0f} years ahead! Enough time for: 🎵 {songs_to_hear:,} songs, "
-                             f"📸 {photos_to_take:,} precious photos, ☕ {coffee_cups:,} shared coffee moments")
-            elif total_days > 1000:
-                perspective = (f"🌱 Over 1,000 days ahead! Time for: ☕ {coffee_cups:,} coffees, "
-                             f"🌅 {sunrises:,} sunrises, 🤗 {hugs_possible:,} hugs, 😂 {laughs_remaining:,} laughs")
-            elif total_days > 365:
-                perspective = (f"🌱 Multiple seasons ahead! Time for: 🎵 {songs_to_hear:,} songs, "
-                             f"📸 {photos_to_take:,} photos, ☕ {coffee_cups:,} coffee moments")
-            elif total_days > 100:
-                perspective = (f"⚡ Focused time ahead! Potential for: 🤗 {hugs_possible:,} hugs, "
-                             f"😂 {laughs_remaining:,} moments of laughter, 🌅 {sunrises:,} beautiful sunrises")
-            elif total_days > 30:
-                perspective = (f"🔥 Precious weeks ahead! Cherish: ☕ {coffee_cups:,} warm drinks, "
-                             f"🎵 {songs_to_hear:,} amazing songs, 📸 {photos_to_take:,} memories to capture")
-            else:
-                perspective = (f"💎 Every moment is precious! Savor: 🤗 {hugs_possible:,} hugs, "
-                             f"😂 {laughs_remaining:,} laughs, 🌅 {sunrises:,} sunrises - make them count!")
-                
-            self.perspective_label.config(text=perspective)
-            
-            # Additional fun facts and comparisons - enhanced for all lifespans
-            blinks_remaining = total_seconds * 0.33  # About 20 blinks per minute
-            words_to_speak = total_days * 16000  # Average 16,000 words per day
-            dreams_remaining = total_days * 4  # Average 4 dreams per night
-            years_in_space = total_years  # If you were on the International Space Station
-            distance_walked_km = steps_remaining * 0.0008
-
-            # Scale the display based on magnitude
-            if total_years > 20:
-                fun_facts = (f"👁️ ~{blinks_remaining/1000000:.1f}M blinks ahead | "
-                            f"🗣️ ~{words_to_speak/1000000:.1f}M words to speak | "
-                            f"💭 ~{dreams_remaining:,} dreams to have | "
-                            f"🚀 {years_in_space:.1f} years in orbit | "
-                            f"🎧 ~{songs_to_hear:,} songs | "
-                            f"🚶 ~{distance_walked_km:,.0f} km to walk")
-            else:
-                fun_facts = (f"👁️ ~{blinks_remaining:,.0f} blinks ahead | "
-                            f"🗣️ ~{words_to_speak:,} words to speak | "
-                            f"💭 ~{dreams_remaining:,} dreams to have | "
-                            f"🚀 {years_in_space:.1f} years in orbit | "
-                            f"🎧 ~{songs_to_hear:,} songs | "
-                            f"🚶 ~{distance_walked_km:,.0f} km to walk")
-            self.fun_facts_label.config(text=fun_facts)
+        return " | ".join(milestones[:3]) if milestones else "⚡ Less than a year remaining"
+    
+    def life_quality_text(self, total_seconds):
+        """Life quality metrics"""
+        m = metrics.format_metrics(total_seconds, QUALITY_METRICS)
+        return (f"📚 ~{m['books']} books to read | "
+                f"🎬 ~{m['movies']} movies to watch | "
+                f"💬 ~{m['conversations']} conversations | "
+                f"👟 ~{m['steps']} steps to take")
+    
+    def perspective_text(self, total_seconds):
+        """Perspective and fascinating facts, scaled to the time left"""
+        total_days = metrics.unit_count(total_seconds, 'day')
+        total_years = metrics.unit_count(total_seconds, 'year')
+        m = metrics.format_metrics(total_seconds, PERSPECTIVE_METRICS)
+        coffee_cups, sunrises, hugs_possible = m['coffee_cups'], m['sunrises'], m['hugs']
+        laughs_remaining, photos_to_take, songs_to_hear = m['laughs'], m['photos'], m['songs']
+        
+        # Scale perspective messages for different time ranges
+        if total_years > 50:
+            return (f"🌟 Over {total_years} years ahead! Epic lifetime for: ☕ {coffee_cups} coffee moments, "
+                    f"🌅 {sunrises} sunrises, 🤗 {hugs_possible} warm hugs, 😂 {laughs_remaining} joyful laughs")
+        elif total_years > 25:
+            return (f"🚀 {total_years} years ahead! Enough time for: 🎵 {songs_to_hear} songs, "
+                    f"📸 {photos_to_take} precious photos, ☕ {coffee_cups} shared coffee moments")
+        elif total_days > 1000:
+            return (f"🌱 Over 1,000 days ahead! Time for: ☕ {coffee_cups} coffees, "
+                    f"🌅 {sunrises} sunrises, 🤗 {hugs_possible} hugs, 😂 {laughs_remaining} laughs")
+        elif total_days > 365:
+            return (f"🌱 Multiple seasons ahead! Time for: 🎵 {songs_to_hear} songs, "
+                    f"📸 {photos_to_take} photos, ☕ {coffee_cups} coffee moments")
+        elif total_days > 100:
+            return (f"⚡ Focused time ahead! Potential for: 🤗 {hugs_possible} hugs, "
+                    f"😂 {laughs_remaining} moments of laughter, 🌅 {sunrises} beautiful sunrises")
+        elif total_days > 30:
+            return (f"🔥 Precious weeks ahead! Cherish: ☕ {coffee_cups} warm drinks, "
+                    f"🎵 {songs_to_hear} amazing songs, 📸 {photos_to_take} memories to capture")
+        return (f"💎 Every moment is precious! Savor: 🤗 {hugs_possible} hugs, "
+                f"😂 {laughs_remaining} laughs, 🌅 {sunrises} sunrises - make them count!")
+    
+    def fun_facts_text(self, total_seconds):
+        """Additional fun facts, in millions for long lifetimes"""
+        values = metrics.evaluate(total_seconds, FUN_FACT_METRICS)
+        m = {name: metrics.METRICS[name].format(value) for name, value in values.items()}
 
-            # Show combined insights under the countdown
-            self.insights_label.config(text=f"{analysis_text} | {fun_facts}")
+        # Scale the display based on magnitude
+        if values['years_in_orbit'] > 20:
+            m['blinks'] = metrics.format_millions(values['blinks'])
+            m['words'] = metrics.format_millions(values['words'])
+        return (f"👁️ ~{m['blinks']} blinks ahead | "
+                f"🗣️ ~{m['words']} words to speak | "
+                f"💭 ~{m['dreams']} dreams to have | "
+                f"🚀 {values['years_in_orbit']:.1f} years in orbit | "
+                f"🎧 ~{m['songs']} songs | "
+                f"🚶 ~{m['distance_km']} km to walk")
         
     def start_countdown_automatically(self):
         """Start countdown automatically after calculation"""
@@ -895,9 +1065,8 @@ class DeathClockGUI:
             return
             
         self.is_running = True
-        self.status_label.config(text="🔥 Countdown running... Time is ticking!")
-        self.update_thread = threading.Thread(target=self.update_countdown, daemon=True)
-        self.update_thread.start()
+        self.renderer.set(self.status_label, text="🔥 Countdown running... Time is ticking!")
+        self.ticker.start()
     
     def restart_countdown(self):
         """Restart the countdown"""
@@ -917,13 +1086,48 @@ class DeathClockGUI:
             return
             
         self.is_running = True
-        self.status_label.config(text="Countdown running...")
-        self.update_thread = threading.Thread(target=self.update_countdown, daemon=True)
-        self.update_thread.start()
+        self.renderer.set(self.status_label, text="Countdown running...")
+        self.ticker.start()
     
     def stop_countdown(self):
         self.is_running = False
-        self.status_label.config(text="⏸️ Countdown paused")
+        self.ticker.stop()
+        self.renderer.set(self.status_label, text="⏸️ Countdown paused")
+
+    def open_dashboard(self):
+        """Open the multi-profile dashboard, or bring it to the front"""
+        if self.dashboard is not None:
+            self.dashboard.lift()
+            return
+        try:
+            from deathclock.dashboard import ProfileBoard
+        except ImportError:
+            messagebox.showerror("Error", "The dashboard requires the numpy package")
+            return
+        self.dashboard = DashboardWindow(self, ProfileBoard())
+
+    def run_simulation(self):
+        """Sample possible death dates and show their spread"""
+        if not self.death_date:
+            messagebox.showwarning("Warning", "Please calculate death date first")
+            return
+        try:
+            from deathclock.simulation import format_histogram, simulate_death_dates
+        except ImportError:
+            messagebox.showerror("Error", "Simulation requires the numpy package")
+            return
+        try:
+            result = simulate_death_dates(self.birth_date, self.country, self.gender,
+                                          self.custom_lifespan)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        p10, median, p90 = (date.strftime("%d/%m/%Y") for date in result.percentile_dates())
+        self.renderer.set(
+            self.simulation_label,
+            text=f"🎲 {len(result):,} simulated lives | Median: {median} | 10%: {p10} | 90%: {p90}"
+        )
+        self.renderer.set(self.histogram_label, text=format_histogram(*result.histogram()))
 
     def copy_stats(self):
         """Copy current statistics to clipboard"""
@@ -948,11 +1152,15 @@ class DeathClockGUI:
     def reset_fields(self):
         """Reset input fields and clear data"""
         self.stop_countdown()
+        self.session = None
+        self.pending_session = None
+        self.build_panels()
         self.birth_date_entry.delete(0, tk.END)
         self.lifespan_entry.delete(0, tk.END)
         self.gender_var.set("Male")
         self.country_var.set("Global Average")
-        self.death_date_label.config(text="")
+        self.actuarial_var.set(False)
+        self.renderer.set(self.death_date_label, text="")
         for lbl in [
             self.countdown_label,
             self.time_stats_label,
@@ -963,121 +1171,86 @@ class DeathClockGUI:
             self.perspective_label,
             self.fun_facts_label,
             self.insights_label,
+            self.simulation_label,
+            self.histogram_label,
         ]:
-            lbl.config(text="")
-        self.status_label.config(text="Ready - Enter your details above")
-        self.life_progress_label.config(text="")
-        self.life_progress_bar["value"] = 0
-    
-    def update_countdown(self):
-        while self.is_running:
-            try:
-                now = datetime.now()
-                time_left = self.death_date - now
-                
-                if time_left.total_seconds() <= 0:
-                    self.root.after(0, lambda: self.countdown_label.config(text="⚰️ YOUR TIME HAS EXPIRED! LIVE EVERY MOMENT! ⚰️"))
-                    self.root.after(0, lambda: self.time_stats_label.config(text=""))
-                    self.root.after(0, lambda: self.analysis_label.config(text=""))
-                    self.root.after(0, lambda: self.demographic_label.config(text=""))
-                    self.root.after(0, lambda: self.milestones_label.config(text=""))
-                    self.root.after(0, lambda: self.insights_label.config(text=""))
-                    self.is_running = False
-                    self.root.after(0, lambda: self.status_label.config(text="💀 Time expired"))
-                    break
-                
-                # Update main countdown
-                formatted_time = self.format_time_display(time_left)
-                self.root.after(0, lambda ft=formatted_time: self.countdown_label.config(text=ft))
-                
-                # Update countdown color based on urgency
-                total_seconds_live = int(time_left.total_seconds())
-                days_live = total_seconds_live // (24 * 3600)
-                
-                if days_live <= 7:  # Less than a week - red alert
-                    self.root.after(0, lambda: self.countdown_label.config(foreground='#ff0000'))
-                elif days_live <= 30:  # Less than a month - orange warning
-                    self.root.after(0, lambda: self.countdown_label.config(foreground='#ff8800'))
-                elif days_live <= 365:  # Less than a year - yellow caution
-                    self.root.after(0, lambda: self.countdown_label.config(foreground='#f1c40f'))
-                else:  # Normal blue instead of red
-                    self.root.after(0, lambda: self.countdown_label.config(foreground='#3498db'))
-                
-                # Update statistics and analysis
-                self.root.after(0, lambda tl=time_left: self.update_statistics_and_analysis(tl))
-                
-                # Update life progress
-                self.root.after(0, self.update_life_progress)
-                
-                time.sleep(1)
-            except Exception as e:
-                self.root.after(0, lambda: self.status_label.config(text=f"❌ Error: {str(e)}"))
-                break
+            self.renderer.set(lbl, text="")
+        self.renderer.set(self.status_label, text="Ready - Enter your details above")
+        self.renderer.set(self.life_progress_label, text="")
+        self.renderer.set(self.life_progress_bar, value=0)
     
-    def format_time_display(self, time_left):
-        total_seconds = int(time_left.total_seconds())
-        
-        if self.display_format.get() == "detailed":
-            years = total_seconds // (365.25 * 24 * 3600)
-            remaining = total_seconds % (365.25 * 24 * 3600)
-            months = int(remaining // (30.44 * 24 * 3600))  # Average month length
-            remaining = remaining % (30.44 * 24 * 3600)
-            days = int(remaining // (24 * 3600))
-            remaining = remaining % (24 * 3600)
-            hours = remaining // 3600
-            remaining = remaining % 3600
-            minutes = remaining // 60
-            seconds = remaining % 60
-            return f"⏳ {int(years)}y {months}m {days}d {hours}h {minutes}min {seconds}s"
-            
-        elif self.display_format.get() == "years_days":
-            years = total_seconds // (365.25 * 24 * 3600)
-            days = int((total_seconds % (365.25 * 24 * 3600)) // (24 * 3600))
-            return f"⏳ {int(years)} years, {days} days"
-
-        elif self.display_format.get() == "weeks_days":
-            weeks = total_seconds // (7 * 24 * 3600)
-            days = (total_seconds % (7 * 24 * 3600)) // (24 * 3600)
-            return f"⏳ {weeks} weeks, {days} days"
-
-        elif self.display_format.get() == "days_hours":
-            days = total_seconds // (24 * 3600)
-            hours = (total_seconds % (24 * 3600)) // 3600
-            return f"⏳ {days} days, {hours} hours"
-            
-        elif self.display_format.get() == "hours_minutes":
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            return f"⏳ {hours} hours, {minutes} minutes"
+    @stage('tick')
+    def tick(self, timestamp):
+        """Apply every widget update for one second in a single pass on the Tk thread"""
+        try:
+            now = datetime.fromtimestamp(timestamp)
+            if (self.death_date - now).total_seconds() <= 0:
+                self.show_expired()
+                self.is_running = False
+                self.ticker.stop()
+                self.renderer.set(self.status_label, text="💀 Time expired")
+                return
             
-        elif self.display_format.get() == "total_weeks":
-            weeks = total_seconds // (7 * 24 * 3600)
-            return f"⏳ {weeks} total weeks"
+            self.update_static_countdown(now)
+            self.update_life_progress(now)
+        except Exception as e:
+            self.is_running = False
+            self.ticker.stop()
+            self.renderer.set(self.status_label, text=f"❌ Error: {str(e)}")
+    
+    def toggle_tick_overlay(self):
+        """Show or hide the tick diagnostics overlay to match the View menu"""
+        if self.tick_overlay_var.get():
+            self.tick_overlay.place(relx=1.0, rely=0.0, x=-10, y=10, anchor='ne')
+            self.update_tick_overlay(self.tick_monitor)
+        else:
+            self.tick_overlay.place_forget()
 
-        elif self.display_format.get() == "total_days":
-            days = total_seconds // (24 * 3600)
-            return f"⏳ {days} total days"
-            
-        elif self.display_format.get() == "total_hours":
-            hours = total_seconds // 3600
-            return f"⏳ {hours} total hours"
-            
-        elif self.display_format.get() == "total_minutes":
-            minutes = total_seconds // 60
-            return f"⏳ {minutes} total minutes"
-            
-        elif self.display_format.get() == "total_seconds":
-            return f"⏳ {total_seconds} total seconds"
+    def flip_tick_overlay(self, event=None):
+        self.tick_overlay_var.set(not self.tick_overlay_var.get())
+        self.toggle_tick_overlay()
+
+    def update_tick_overlay(self, monitor):
+        """Tick monitor listener: refresh the overlay while it is shown"""
+        if self.tick_overlay_var.get():
+            self.renderer.set(self.tick_overlay, text=monitor.overlay_text())
+
+    def export_tick_metrics(self):
+        """Save the tick timing summary as JSON"""
+        from tkinter import filedialog
+
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            self.tick_monitor.export(path)
+            messagebox.showinfo("Exported", f"Tick metrics saved to {path}")
+
+    @stage('formatting')
+    def format_time_display(self, time_left, now=None):
+        """Format the countdown with the formatter resolved for the selected display format"""
+        return f"⏳ {self.time_formatter(int(time_left.total_seconds()), now)}"
     
     def update_display_format(self):
-        """Refresh countdown when display format changes"""
+        """Resolve the new display format once and refresh the countdown"""
+        self.time_formatter = get_formatter(self.display_format.get())
         if self.death_date:
             self.update_static_countdown()
+        if self.session is not None:
+            try:
+                self.session_store.set_display_format(self.session, self.display_format.get())
+            except sqlite3.Error:
+                pass
 
 def main():
     root = tk.Tk()
+    load_configured(lambda message: messagebox.showerror("Life Table", message, parent=root))
     app = DeathClockGUI(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.tick_monitor.close()
+        if app.session_store is not None:
+            app.session_store.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,256 @@
+// Generated by `python -m deathclock.cppgen`; do not edit.
+#pragma once
+
+static const int COUNTRY_COUNT = 96;
+static const int DEFAULT_COUNTRY_CODE = 0;
+
+// Indexed by country code
+static const char* const COUNTRIES[COUNTRY_COUNT] = {
+    "Global Average",
+    "Japan",
+    "Switzerland",
+    "South Korea",
+    "Singapore",
+    "Spain",
+    "Italy",
+    "Australia",
+    "Iceland",
+    "Israel",
+    "Sweden",
+    "France",
+    "Norway",
+    "Malta",
+    "Netherlands",
+    "Austria",
+    "Finland",
+    "New Zealand",
+    "Ireland",
+    "United Kingdom",
+    "Belgium",
+    "Germany",
+    "Canada",
+    "Luxembourg",
+    "Greece",
+    "Portugal",
+    "Slovenia",
+    "Denmark",
+    "Cyprus",
+    "United States",
+    "Czech Republic",
+    "Chile",
+    "Costa Rica",
+    "Poland",
+    "Estonia",
+    "Panama",
+    "Turkey",
+    "Albania",
+    "Croatia",
+    "Uruguay",
+    "Cuba",
+    "Argentina",
+    "Lebanon",
+    "China",
+    "Brazil",
+    "Thailand",
+    "Iran",
+    "Mexico",
+    "Colombia",
+    "Algeria",
+    "Tunisia",
+    "Ecuador",
+    "Sri Lanka",
+    "Morocco",
+    "Peru",
+    "Jordan",
+    "Armenia",
+    "Vietnam",
+    "Venezuela",
+    "Egypt",
+    "Libya",
+    "Paraguay",
+    "Ukraine",
+    "Philippines",
+    "El Salvador",
+    "Honduras",
+    "Guatemala",
+    "Bolivia",
+    "Nepal",
+    "Nicaragua",
+    "Bangladesh",
+    "Cambodia",
+    "India",
+    "Pakistan",
+    "Myanmar",
+    "Kenya",
+    "Ghana",
+    "Tanzania",
+    "Uganda",
+    "Rwanda",
+    "Ethiopia",
+    "Madagascar",
+    "Senegal",
+    "Mali",
+    "Burkina Faso",
+    "Niger",
+    "Chad",
+    "Nigeria",
+    "South Africa",
+    "Zimbabwe",
+    "Botswana",
+    "Zambia",
+    "Mozambique",
+    "Angola",
+    "Sierra Leone",
+    "Central African Republic"
+};
+
+// [male, female] per country code
+static const double EXPECTANCY[COUNTRY_COUNT][2] = {
+    {70.8, 75.9},
+    {81.5, 87.6},
+    {81.8, 85.5},
+    {79.3, 85.4},
+    {81.0, 85.7},
+    {80.7, 86.2},
+    {81.2, 85.6},
+    {81.2, 85.3},
+    {80.5, 84.8},
+    {79.9, 84.1},
+    {80.8, 84.7},
+    {79.8, 85.8},
+    {80.5, 84.4},
+    {79.8, 84.5},
+    {80.1, 83.8},
+    {79.0, 84.1},
+    {78.8, 84.5},
+    {80.2, 83.5},
+    {79.9, 83.5},
+    {79.2, 82.9},
+    {79.2, 84.1},
+    {78.7, 83.4},
+    {80.0, 84.0},
+    {79.8, 84.6},
+    {78.4, 83.8},
+    {78.9, 84.9},
+    {78.3, 84.3},
+    {78.9, 82.9},
+    {79.2, 83.1},
+    {76.4, 81.2},
+    {76.1, 82.1},
+    {77.2, 82.4},
+    {77.8, 82.2},
+    {74.0, 81.6},
+    {74.4, 82.4},
+    {76.2, 81.8},
+    {76.2, 81.3},
+    {76.9, 80.9},
+    {75.4, 81.2},
+    {74.5, 81.2},
+    {77.2, 81.9},
+    {73.0, 79.8},
+    {77.4, 81.3},
+    {75.1, 80.5},
+    {72.2, 79.4},
+    {72.6, 80.0},
+    {74.2, 77.6},
+    {72.1, 77.7},
+    {73.0, 79.0},
+    {75.9, 78.3},
+    {74.2, 78.7},
+    {74.1, 79.5},
+    {73.1, 79.2},
+    {74.0, 77.3},
+    {73.7, 79.1},
+    {72.7, 76.1},
+    {71.6, 78.9},
+    {71.7, 80.9},
+    {69.2, 77.2},
+    {70.2, 74.1},
+    {70.2, 75.9},
+    {71.7, 77.2},
+    {67.0, 76.9},
+    {67.5, 75.0},
+    {70.4, 78.1},
+    {72.3, 76.9},
+    {71.2, 76.8},
+    {67.5, 72.4},
+    {69.0, 71.9},
+    {72.4, 78.1},
+    {71.2, 74.2},
+    {67.1, 71.1},
+    {68.4, 70.7},
+    {66.1, 68.4},
+    {64.8, 69.8},
+    {61.4, 66.2},
+    {62.4, 64.7},
+    {63.1, 67.3},
+    {61.7, 65.4},
+    {67.3, 71.7},
+    {64.9, 68.9},
+    {64.5, 67.8},
+    {66.3, 70.1},
+    {57.3, 59.8},
+    {59.3, 61.4},
+    {60.4, 62.1},
+    {52.5, 55.4},
+    {53.4, 55.7},
+    {62.3, 68.5},
+    {59.3, 63.4},
+    {66.1, 72.4},
+    {61.2, 65.1},
+    {58.8, 64.2},
+    {59.3, 64.4},
+    {52.2, 55.7},
+    {51.0, 55.7}
+};
+
+enum MetricUnit {
+    UNIT_SECOND,
+    UNIT_MINUTE,
+    UNIT_HOUR,
+    UNIT_DAY,
+    UNIT_WEEK,
+    UNIT_YEAR
+};
+
+struct MetricDef {
+    const char* name;
+    const char* label;
+    MetricUnit unit;
+    long long numerator;
+    long long denominator;
+};
+
+static const int METRIC_COUNT = 25;
+
+static const MetricDef METRICS[METRIC_COUNT] = {
+    {"heartbeats", "heartbeats left", UNIT_SECOND, 70, 1},
+    {"breaths", "breaths left", UNIT_SECOND, 15, 1},
+    {"blinks", "blinks ahead", UNIT_SECOND, 33, 100},
+    {"sleep_hours", "hours of sleep", UNIT_HOUR, 1, 3},
+    {"awake_hours", "awake hours", UNIT_HOUR, 2, 3},
+    {"meals", "meals", UNIT_DAY, 3, 1},
+    {"weekend_days", "weekend days", UNIT_WEEK, 2, 1},
+    {"work_hours", "work hours", UNIT_DAY, 8, 1},
+    {"vacation_days", "vacation days", UNIT_YEAR, 20, 1},
+    {"tv_episodes", "TV episodes", UNIT_HOUR, 1, 1},
+    {"workouts", "workouts", UNIT_DAY, 1, 2},
+    {"books", "books to read", UNIT_DAY, 1, 7},
+    {"movies", "movies to watch", UNIT_HOUR, 1, 2},
+    {"conversations", "conversations", UNIT_DAY, 5, 1},
+    {"steps", "steps to take", UNIT_DAY, 8000, 1},
+    {"distance_km", "km to walk", UNIT_DAY, 32, 5},
+    {"coffee_cups", "coffee moments", UNIT_DAY, 2, 1},
+    {"sunrises", "sunrises", UNIT_DAY, 1, 1},
+    {"hugs", "hugs", UNIT_DAY, 3, 1},
+    {"laughs", "laughs", UNIT_DAY, 15, 1},
+    {"photos", "photos", UNIT_DAY, 10, 1},
+    {"songs", "songs", UNIT_HOUR, 15, 1},
+    {"words", "words to speak", UNIT_DAY, 16000, 1},
+    {"dreams", "dreams to have", UNIT_DAY, 4, 1},
+    {"years_in_orbit", "years in orbit", UNIT_YEAR, 1, 1}
+};
+
+// Indexes into METRICS of the metrics printed as insights
+static const int INSIGHT_COUNT = 5;
+static const int INSIGHTS[INSIGHT_COUNT] = {3, 5, 7, 9, 10};
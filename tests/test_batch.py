@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+
+from deathclock.batch import ERROR_MESSAGES, ERR_OK, calculate_batch
+from deathclock.core import resolve_lifespan
+
+
+class CustomLifespanErrorTest(unittest.TestCase):
+    def assert_same_error(self, value):
+        with self.assertRaises(ValueError) as raised:
+            resolve_lifespan("Japan", "Male", value)
+        result = calculate_batch(["01/01/1990"], ["Male"], ["Japan"], [value])
+        self.assertEqual(ERROR_MESSAGES[int(result.errors[0])], str(raised.exception))
+
+    def test_scalar_and_batch_messages_match(self):
+        for value in ("abc", "0", "-5", "inf", "-inf", "1e999"):
+            with self.subTest(value=value):
+                self.assert_same_error(value)
+
+    def test_infinite_numeric_column_is_rejected(self):
+        result = calculate_batch(["01/01/1990"] * 3, ["Male"] * 3, ["Japan"] * 3,
+                                 np.array([np.inf, np.nan, 80.0]))
+        self.assertEqual(ERROR_MESSAGES[int(result.errors[0])], "Lifespan must be a positive number")
+        # NaN means no custom lifespan, as a blank entry does
+        self.assertEqual(result.errors[1:].tolist(), [ERR_OK, ERR_OK])
+
+
+if __name__ == "__main__":
+    unittest.main()
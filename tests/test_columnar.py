@@ -0,0 +1,29 @@
+import io
+import unittest
+
+import numpy as np
+
+from deathclock.columnar import ColumnarError, ColumnWriter
+from deathclock.stream import COLUMNAR_SCHEMA
+
+
+class ColumnWriterRangeTest(unittest.TestCase):
+    def chunk(self, country):
+        columns = {name: np.zeros(1, dtype=dtype) for name, dtype in COLUMNAR_SCHEMA}
+        columns["country"] = np.array([country], dtype=np.int32)
+        return columns
+
+    def test_codes_that_fit_are_written(self):
+        writer = ColumnWriter(io.BytesIO(), COLUMNAR_SCHEMA)
+        writer.append(self.chunk(32767))
+        self.assertEqual(writer.rows, 1)
+
+    def test_out_of_range_code_raises_instead_of_wrapping(self):
+        writer = ColumnWriter(io.BytesIO(), COLUMNAR_SCHEMA)
+        with self.assertRaises(ColumnarError):
+            writer.append(self.chunk(32768))
+        self.assertEqual(writer.rows, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+from datetime import datetime
+
+from deathclock.dashboard import ProfileBoard
+
+NOW = datetime(2026, 1, 1)
+
+
+class ProfileBoardSortTest(unittest.TestCase):
+    def test_added_rows_are_sorted_by_progress(self):
+        board = ProfileBoard()
+        board.sort("progress")
+        board.add("middle", "01/01/1980", "Male", "Japan", now=NOW)
+        board.add_batch(["old", "young"], ["01/01/1940", "01/01/2010"], ["Male", "Male"],
+                        ["Japan", "Japan"], now=NOW)
+        names = [row[1] for row in board.rows(0, len(board), lambda left, now: str(left), now=NOW)]
+        self.assertEqual(names, ["young", "middle", "old"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from deathclock import estimate_death_date
+from deathclock.dates import MDY, DateParseError, parse_column, parse_date
+
+# Every day of a common, a leap and two century years, plus the extremes
+SAMPLE_DATES = [date(year, 1, 1) + timedelta(days=i)
+                for year in (1900, 2000, 2023, 2024) for i in range(366)
+                if (date(year, 1, 1) + timedelta(days=i)).year == year]
+SAMPLE_DATES += [date(1, 1, 1), date(9999, 12, 31)]
+
+# (text, layout, error position, reason)
+INVALID = [
+    ("31/04/2023", None, 0, "Day out of range"),
+    ("29/02/2023", None, 0, "Day out of range"),
+    ("29/02/1900", None, 0, "Day out of range"),
+    ("00/01/2020", None, 0, "Day out of range"),
+    ("01/13/2020", None, 3, "Month out of range"),
+    ("01/00/2020", None, 3, "Month out of range"),
+    ("1/1/20", None, 4, "Expected 4 digit year"),
+    ("1990/01/01", None, 0, "Expected 1-2 digit day"),
+    ("01-01-2020", None, 2, "Unexpected character '-'"),
+    ("01/0x/2020", None, 4, "Unexpected character 'x'"),
+    ("  01/0x/2020", None, 6, "Unexpected character 'x'"),
+    ("01/01/199a", None, 9, "Unexpected character 'a'"),
+    ("01/01/2020/", None, 10, "Unexpected character '/'"),
+    ("01/01", None, 5, "Expected '/'"),
+    ("", None, 0, "Empty date"),
+    ("   ", None, 0, "Empty date"),
+    ("2020-1-01", None, 5, "Expected 2 digit month"),
+    ("2020-02-30", None, 8, "Day out of range"),
+    ("2023-02-29", None, 8, "Day out of range"),
+    ("0000-01-01", None, 0, "Year out of range"),
+    ("2020-01-01T25:00", None, 11, "Invalid time"),
+    ("13/01/85", MDY, 0, "Month out of range"),
+    ("02/30/85", MDY, 3, "Day out of range"),
+    ("01/01/1985", MDY, 6, "Expected 2 digit year"),
+]
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_dmy_matches_strptime(self):
+        for day in SAMPLE_DATES:
+            for text in (day.strftime("%d/%m/") + f"{day.year:04d}",
+                         f"{day.day}/{day.month}/{day.year:04d}"):
+                with self.subTest(text=text):
+                    self.assertEqual(parse_date(text), datetime.strptime(text, "%d/%m/%Y"))
+
+    def test_iso_matches_strptime(self):
+        for day in SAMPLE_DATES:
+            text = f"{day.year:04d}-{day.month:02d}-{day.day:02d}"
+            with self.subTest(text=text):
+                self.assertEqual(parse_date(text), datetime.strptime(text, "%Y-%m-%d"))
+
+    def test_iso_time(self):
+        self.assertEqual(parse_date("1990-05-17T08:30:15"), datetime(1990, 5, 17, 8, 30, 15))
+        self.assertEqual(parse_date("1990-05-17 08:30"), datetime(1990, 5, 17, 8, 30))
+
+    def test_mdy_matches_strptime_within_the_pivot_century(self):
+        for day in SAMPLE_DATES:
+            if not 2000 <= day.year <= 2026:
+                continue
+            text = day.strftime("%m/%d/%y")
+            with self.subTest(text=text):
+                self.assertEqual(parse_date(text, MDY, pivot_year=2026),
+                                 datetime.strptime(text, "%m/%d/%y"))
+
+    def test_mdy_years_never_land_after_the_pivot(self):
+        self.assertEqual(parse_date("1/2/26", MDY, pivot_year=2026), datetime(2026, 1, 2))
+        self.assertEqual(parse_date("1/2/27", MDY, pivot_year=2026), datetime(1927, 1, 2))
+
+    def test_surrounding_whitespace_is_ignored(self):
+        self.assertEqual(parse_date(" 01/02/2003\n"), datetime(2003, 2, 1))
+
+    def test_invalid_inputs_raise_with_position(self):
+        for text, layout, position, reason in INVALID:
+            with self.subTest(text=text):
+                with self.assertRaises(DateParseError) as raised:
+                    parse_date(text, layout)
+                self.assertEqual((raised.exception.position, raised.exception.reason),
+                                 (position, reason))
+
+    def test_unknown_layout(self):
+        with self.assertRaises(ValueError):
+            parse_date("01/01/2000", "ymd")
+
+
+class ParseColumnTest(unittest.TestCase):
+    def expected(self, texts, layout=None):
+        days, errors = [], []
+        for text in texts:
+            try:
+                days.append((parse_date(text.strip(), layout).date() - date(1970, 1, 1)).days)
+                errors.append(-1)
+            except DateParseError as e:
+                days.append(0)
+                errors.append(e.position)
+        return days, errors
+
+    def assert_matches_parse_date(self, texts, layout=None):
+        days, errors = parse_column(texts, layout)
+        self.assertEqual((days.tolist(), errors.tolist()), self.expected(texts, layout))
+
+    def test_fixed_width_rows(self):
+        texts = [day.strftime("%d/%m/") + f"{day.year:04d}" for day in SAMPLE_DATES]
+        texts += [f"{day.year:04d}-{day.month:02d}-{day.day:02d}" for day in SAMPLE_DATES]
+        self.assert_matches_parse_date(texts)
+
+    def test_irregular_and_invalid_rows(self):
+        texts = ["1/2/2003", " 01/02/2003 ", "1990-05-17T08:30"]
+        texts += [text.strip() for text, layout, _, _ in INVALID if layout is None]
+        self.assert_matches_parse_date(texts)
+
+    def test_layout_restricts_the_fast_path(self):
+        self.assert_matches_parse_date(["01/02/2003", "2003-02-01"], "iso")
+        self.assert_matches_parse_date(["01/02/03", "12/31/99"], MDY)
+
+    def test_empty_column(self):
+        days, errors = parse_column(np.array([], dtype=str))
+        self.assertEqual((len(days), len(errors)), (0, 0))
+
+
+
+class TimezoneAwareIsoTest(unittest.TestCase):
+    def setUp(self):
+        self._tz = os.environ.get("TZ")
+        os.environ["TZ"] = "UTC"
+        time.tzset()
+
+    def tearDown(self):
+        if self._tz is None:
+            del os.environ["TZ"]
+        else:
+            os.environ["TZ"] = self._tz
+        time.tzset()
+
+    def test_offset_is_converted_to_naive_local_time(self):
+        parsed = parse_date("2000-01-01T00:00+05:00")
+        self.assertIsNone(parsed.tzinfo)
+        self.assertEqual(parsed, datetime(1999, 12, 31, 19, 0))
+
+    def test_utc_designator(self):
+        self.assertEqual(parse_date("2000-01-01T12:30Z"), datetime(2000, 1, 1, 12, 30))
+
+    def test_aware_input_can_be_compared_with_now(self):
+        death, _ = estimate_death_date("2000-01-01T00:00+05:00", "Japan", "Male")
+        self.assertGreater(death - datetime.now(), timedelta(0))
+
+    def test_matches_the_same_instant_given_in_utc(self):
+        aware = datetime(2000, 1, 1, tzinfo=timezone(timedelta(hours=-3)))
+        self.assertEqual(parse_date(aware.isoformat()), parse_date("2000-01-01T03:00:00"))
+
+    def test_unrepresentable_local_time_is_a_parse_error(self):
+        with self.assertRaises(DateParseError):
+            parse_date("0001-01-01T00:00+05:00")
+
+
+if __name__ == "__main__":
+    unittest.main()